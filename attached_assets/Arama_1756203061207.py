@@ -1,7 +1,6 @@
 
 import wx
 import wx.adv
-import pandas as pd
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
@@ -14,28 +13,74 @@ import logging
 from threading import Lock
 import sys
 import concurrent.futures
+import multiprocessing
 
 # Ensure project root is on sys.path for 'src' imports
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if PROJECT_ROOT not in sys.path:
     sys.path.insert(0, PROJECT_ROOT)
 
-from src.webdriver.pool import DriverPool
-from src.scrapers.registry import ScraperRegistry
-from src.services.isbn_search_service import ISBNSearchService
-from src.scrapers.sites.babil import BabilScraper
-from src.scrapers.sites.dr import DRScraper
-from src.scrapers.sites.kitapsec import KitapsecScraper
-from src.scrapers.sites.bkmkitap import BKMKitapScraper
-from src.config_loader import load_config
-from src.utils.memory import (
-    LRUCache,
-    chunked_excel_reader,
-    memory_profiler_decorator,
-    memory_monitor,
-    optimize_dataframe_memory
+from src.services.factory import CATALOG_MAX_AGE, DRIVER_POOL_SIZE, build_search_stack, load_app_config
+from src.services.multi_site_search import SearchMode
+from src.services.bulk_search import BulkSearchEngine
+from src.utils.memory import memory_monitor
+from src.services.bulk_pipeline import BulkPipeline
+from src.services.job_journal import JobJournal
+from src.services.process_pool import ProcessSearchPool
+from src.utils.result_writer import RESULT_COLUMNS, ExcelResultWriter, TeeResultWriter, unique_output_path
+from src.utils.result_store import ResultStore
+from src.utils.ui_feed import UiFeed
+from src.utils.isbn import canonicalize_isbn, clean_isbn, validate_isbn
+from src.utils.paths import get_data_path
+from src.utils.profiling import profiled
+from src.utils.telemetry import telemetry
+
+# Arama modu seçenekleri: (etiket, mod)
+SEARCH_MODE_CHOICES = [
+    ("Sırayla", SearchMode.SEQUENTIAL),
+    ("Yarış (paralel)", SearchMode.RACE),
+]
+
+# Toplu arama için kabul edilen dosyalar
+INPUT_FILE_WILDCARD = (
+    "Desteklenen dosyalar (*.xlsx;*.xlsm;*.csv;*.tsv;*.txt;*.parquet)|*.xlsx;*.xlsm;*.csv;*.tsv;*.txt;*.parquet|"
+    "Excel (*.xlsx;*.xlsm)|*.xlsx;*.xlsm|CSV (*.csv;*.tsv;*.txt)|*.csv;*.tsv;*.txt|Parquet (*.parquet)|*.parquet"
 )
 
+# Toplu arama sırasında arayüz en fazla bu aralıkla (ms) güncellenir
+UI_FRAME_MS = 100
+RESULT_LIST_COLUMN_WIDTHS = [120, 220, 150, 150, 200, 120, 70, 120]
+
+
+class ResultListCtrl(wx.ListCtrl):
+    """Toplu arama sonuçlarını yalnızca görünen satırları çizerek gösteren sanal liste."""
+
+    def __init__(self, parent, store):
+        super().__init__(parent, style=wx.LC_REPORT | wx.LC_VIRTUAL | wx.LC_HRULES | wx.LC_VRULES)
+        self.store = store
+        for col, (title, width) in enumerate(zip(RESULT_COLUMNS, RESULT_LIST_COLUMN_WIDTHS)):
+            self.InsertColumn(col, title, width=width)
+        self.not_found_attr = wx.ItemAttr()
+        self.not_found_attr.SetBackgroundColour(wx.Colour(255, 199, 206))
+        self.not_found_attr.SetTextColour(wx.Colour(156, 0, 6))
+
+    def OnGetItemText(self, item, column):
+        return self.store.row(item)[column]
+
+    def OnGetItemAttr(self, item):
+        return None if self.store.is_found(item) else self.not_found_attr
+
+    def refresh_rows(self):
+        """Satır sayısını depoyla eşitler; liste en alttaysa yeni satırları takip eder."""
+        old_count = self.GetItemCount()
+        new_count = len(self.store)
+        if new_count == old_count:
+            return
+        at_bottom = old_count == 0 or self.GetTopItem() + self.GetCountPerPage() >= old_count
+        self.SetItemCount(new_count)
+        if at_bottom and new_count:
+            self.EnsureVisible(new_count - 1)
+
 
 class ModernISBNApp(wx.Frame):
     """Modern ISBN Arama Uygulaması'nın ana sınıfı."""
@@ -46,38 +91,34 @@ class ModernISBNApp(wx.Frame):
         # Ana panel
         self.panel = wx.Panel(self)
         
-        # Load configuration
-        try:
-            self.config = load_config()
-        except Exception:
-            # Fallback to default config if loading fails
-            from src.config_model import AppConfig
-            self.config = AppConfig()
+        # Load configuration (falls back to defaults if loading fails)
+        self.config = load_app_config()
         
         # Thread güvenliği için
         self.lock = Lock()
-        # Replace simple cache with LRU cache
-        self.cache = LRUCache(
-            maxsize=self.config.cache.max_cache_size,
-            ttl=self.config.cache.cache_ttl,
-            cleanup_interval=self.config.memory.cache_cleanup_interval
-        )
         self.start_time = None
+        self.bulk_engine = None
         
-        # WebDriver havuzu ve Scraper servisi
-        self.driver_pool = DriverPool(maxsize=2, headless=True)
-        self.registry = ScraperRegistry()
-        self.registry.register("Babil", BabilScraper)
-        self.registry.register("D&R", DRScraper)
-        self.registry.register("Kitapsec", KitapsecScraper)
-        self.registry.register("BKM Kitap", BKMKitapScraper)
-        self.search_service = ISBNSearchService(self.registry, self.driver_pool)
+        # Önbellek, WebDriver havuzu ve Scraper servisi (komut satırı ile ortak)
+        self.search_stack = build_search_stack(self.config)
+        self.cache = self.search_stack.cache
+        self.driver_pool = self.search_stack.driver_pool
+        self.search_service = self.search_stack.search_service
+        self.bulk_search_mode = SearchMode.SEQUENTIAL
+        # Toplu arama isteğe bağlı olarak kendi tarayıcılarını yöneten ayrı süreçlerde çalışır
+        self.bulk_use_processes = False
+        
+        # İş parçacıklarından gelen güncellemeler zamanlayıcıyla toplu olarak ekrana aktarılır
+        self.ui_feed = UiFeed()
+        self.result_store = ResultStore()
         
         # Excel dosyası yolu
         self.excel_path = None
         
         # Arayüzü oluştur
         self.init_ui()
+        self.ui_timer = wx.Timer(self)
+        self.Bind(wx.EVT_TIMER, self.on_ui_timer, self.ui_timer)
         
         # Pencereyi merkeze konumlandır
         self.Centre()
@@ -130,11 +171,23 @@ class ModernISBNApp(wx.Frame):
         isbn_label = wx.StaticText(middle_panel, label="🔍 ISBN Numarası:")
         isbn_label.SetFont(wx.Font(11, wx.FONTFAMILY_DEFAULT, wx.FONTSTYLE_NORMAL, wx.FONTWEIGHT_BOLD))
         self.isbn_input = wx.TextCtrl(middle_panel, size=(200, 30))
-        self.isbn_input.SetHint("10-13 haneli ISBN giriniz")
+        self.isbn_input.SetHint("ISBN ya da kitap/yazar adı giriniz")
         
         isbn_sizer.Add(isbn_label, 0, wx.ALIGN_CENTER_VERTICAL | wx.ALL, 10)
         isbn_sizer.Add(self.isbn_input, 1, wx.ALL | wx.EXPAND, 10)
         
+        # Arama modu seçimi
+        self.search_mode_box = wx.RadioBox(
+            middle_panel, label="Arama Modu",
+            choices=[label for label, _ in SEARCH_MODE_CHOICES],
+            style=wx.RA_SPECIFY_COLS
+        )
+        
+        self.process_mode_check = wx.CheckBox(middle_panel, label="⚙️ Toplu aramayı ayrı süreçlerde çalıştır")
+        self.process_mode_check.SetToolTip(
+            "Her çekirdek için kendi tarayıcılarıyla bir arama süreci başlatır; çöken süreç yeniden başlatılır"
+        )
+        
         # Buton paneli
         button_sizer = wx.BoxSizer(wx.HORIZONTAL)
         
@@ -156,9 +209,17 @@ class ModernISBNApp(wx.Frame):
         self.bulk_search_button.SetForegroundColour(wx.Colour(255, 255, 255))
         self.Bind(wx.EVT_BUTTON, self.on_bulk_search, self.bulk_search_button)
         
+        # Toplu aramayı durdurma butonu
+        self.stop_button = wx.Button(middle_panel, label="⏹ Durdur", size=(120, 35))
+        self.stop_button.SetBackgroundColour(wx.Colour(231, 76, 60))  # Kırmızı
+        self.stop_button.SetForegroundColour(wx.Colour(255, 255, 255))
+        self.stop_button.Disable()
+        self.Bind(wx.EVT_BUTTON, self.on_stop_bulk_search, self.stop_button)
+        
         button_sizer.Add(self.excel_button, 0, wx.ALL, 5)
         button_sizer.Add(self.search_button, 0, wx.ALL, 5)
         button_sizer.Add(self.bulk_search_button, 0, wx.ALL, 5)
+        button_sizer.Add(self.stop_button, 0, wx.ALL, 5)
         
         # Excel dosya yolu etiketi
         self.excel_path_label = wx.StaticText(middle_panel, label="📄 Seçilen dosya: Yok")
@@ -166,6 +227,8 @@ class ModernISBNApp(wx.Frame):
         
         # Orta panel düzeni
         middle_sizer.Add(isbn_sizer, 0, wx.ALL | wx.EXPAND, 10)
+        middle_sizer.Add(self.search_mode_box, 0, wx.ALIGN_CENTER | wx.ALL, 5)
+        middle_sizer.Add(self.process_mode_check, 0, wx.ALIGN_CENTER | wx.ALL, 5)
         middle_sizer.Add(button_sizer, 0, wx.ALIGN_CENTER | wx.ALL, 10)
         middle_sizer.Add(self.excel_path_label, 0, wx.ALIGN_CENTER | wx.ALL, 5)
         middle_panel.SetSizer(middle_sizer)
@@ -178,8 +241,11 @@ class ModernISBNApp(wx.Frame):
         results_label = wx.StaticText(bottom_panel, label="📋 Arama Sonuçları")
         results_label.SetFont(wx.Font(12, wx.FONTFAMILY_DEFAULT, wx.FONTSTYLE_NORMAL, wx.FONTWEIGHT_BOLD))
         
+        # Toplu arama sonuç listesi
+        self.result_list = ResultListCtrl(bottom_panel, self.result_store)
+        
         # Sonuçlar metin alanı
-        self.result_label = wx.TextCtrl(bottom_panel, size=(-1, 200), 
+        self.result_label = wx.TextCtrl(bottom_panel, size=(-1, 120), 
                                        style=wx.TE_MULTILINE | wx.TE_READONLY | wx.HSCROLL)
         self.result_label.SetBackgroundColour(wx.Colour(255, 255, 255))
         self.result_label.SetFont(wx.Font(10, wx.FONTFAMILY_DEFAULT, wx.FONTSTYLE_NORMAL, wx.FONTWEIGHT_NORMAL))
@@ -211,6 +277,7 @@ class ModernISBNApp(wx.Frame):
         
         # Alt panel düzeni
         bottom_sizer.Add(results_label, 0, wx.ALL, 5)
+        bottom_sizer.Add(self.result_list, 2, wx.ALL | wx.EXPAND, 5)
         bottom_sizer.Add(self.result_label, 1, wx.ALL | wx.EXPAND, 5)
         bottom_sizer.Add(status_panel, 0, wx.ALL | wx.EXPAND, 5)
         bottom_panel.SetSizer(bottom_sizer)
@@ -224,7 +291,7 @@ class ModernISBNApp(wx.Frame):
 
     def on_excel_load(self, event):
         """Excel dosyası yükleme işlemi."""
-        with wx.FileDialog(self, "Excel Dosyası Seç", wildcard="Excel files (*.xlsx)|*.xlsx",
+        with wx.FileDialog(self, "Excel Dosyası Seç", wildcard=INPUT_FILE_WILDCARD,
                            style=wx.FD_OPEN | wx.FD_FILE_MUST_EXIST) as file_dialog:
 
             if file_dialog.ShowModal() == wx.ID_CANCEL:
@@ -234,41 +301,55 @@ class ModernISBNApp(wx.Frame):
             self.excel_path_label.SetLabel(f"📄 Seçilen dosya: {os.path.basename(self.excel_path)}")
             self.result_label.AppendText(f"✅ Excel dosyası yüklendi: {os.path.basename(self.excel_path)}\n")
 
+    def get_search_mode(self):
+        """Arayüzde seçili arama modunu döndürür."""
+        return SEARCH_MODE_CHOICES[self.search_mode_box.GetSelection()][1]
+
     def clean_isbn(self, isbn):
         """ISBN'deki tire ve boşlukları temizler."""
-        return isbn.replace("-", "").replace(" ", "")
+        return clean_isbn(isbn)
 
     def validate_isbn(self, isbn):
-        """ISBN numarasını doğrular."""
-        cleaned_isbn = self.clean_isbn(isbn)
-        if len(cleaned_isbn) not in [10, 13]:
-            return False, "ISBN 10 veya 13 haneli olmalıdır."
-        if not cleaned_isbn.isdigit():
-            return False, "ISBN yalnızca rakamlardan oluşmalıdır."
-        return True, ""
+        """ISBN numarasını kontrol hanesiyle birlikte doğrular (ISBN-10 'X' ile bitebilir)."""
+        return validate_isbn(isbn)
 
     def on_search(self, event):
         """Tek ISBN arama işlemi."""
         isbn_value = self.isbn_input.GetValue()
         is_valid, message = self.validate_isbn(isbn_value)
         if not is_valid:
-            self.result_label.SetValue(f"❌ Geçersiz ISBN: {message}")
+            if any(char.isalpha() for char in isbn_value.upper().replace("X", "")):
+                # Words instead of an ISBN: search the books found so far, offline
+                self.show_catalog_matches(isbn_value)
+            else:
+                self.result_label.SetValue(f"❌ Geçersiz ISBN: {message}")
             return
 
         self.result_label.SetValue("")
         self.loading_text.SetLabel("🔍 Arama yapılıyor...")
         self.search_button.Disable()
 
-        threading.Thread(target=self.perform_search, args=(isbn_value,), daemon=True).start()
+        threading.Thread(
+            target=self.perform_search,
+            args=(canonicalize_isbn(isbn_value), self.get_search_mode()),
+            daemon=True
+        ).start()
+
+    def show_catalog_matches(self, query):
+        """Daha önce bulunan kitaplarda başlık/yazar/yayınevi araması yapar (çevrimdışı)."""
+        matches = self.search_stack.catalog.search(query)
+        if not matches:
+            self.result_label.SetValue(f"📚 Katalogda eşleşen kitap yok: {query}")
+            return
+        lines = [f"📖 Katalogda bulunanlar ({len(matches)}):"]
+        for match in matches:
+            lines.append(f"• {match.isbn} | {match.title} | {match.author} | {match.publisher} ({match.site})")
+        self.result_label.SetValue("\n".join(lines))
 
-    def perform_search(self, isbn):
+    def perform_search(self, isbn, mode=None):
         """Tekli arama işlemini gerçekleştirir."""
-        ok, site_name, message = self.search_service.search_first(isbn)
-        if ok:
-            result_text = f"✅ {site_name} Sonuç:\n{message}"
-        else:
-            result_text = f"❌ {message}"
-        wx.CallAfter(self.update_results, result_text)
+        result = self.search_service.search_first(isbn, mode=mode)
+        wx.CallAfter(self.update_results, result.format_message())
 
     def update_results(self, message):
         """Arama sonuçlarını ekrana günceller."""
@@ -283,203 +364,251 @@ class ModernISBNApp(wx.Frame):
             return
 
         self.result_label.SetValue("")
+        self.ui_feed.clear()
+        self.result_store.clear()
+        self.result_list.SetItemCount(0)
         self.loading_text.SetLabel("📊 Excel dosyası analiz ediliyor...")
         self.bulk_search_button.Disable()
+        self.bulk_search_mode = self.get_search_mode()
+        self.bulk_use_processes = self.process_mode_check.GetValue()
+        self.ui_timer.Start(UI_FRAME_MS)
         
         threading.Thread(target=self.process_excel_chunked, daemon=True).start()
 
+    @profiled("bulk_search")
     def process_excel_chunked(self):
-        """Process Excel file in chunks for memory optimization."""
+        """Excel dosyasını parça parça okuyup doğrudan aramaya ve çıktıya aktarır.
+
+        ISBN_SEARCH_PROFILE=1 ile çalıştırıldığında cProfile/tracemalloc raporu veri klasörüne yazılır.
+        """
         try:
-            valid_isbns = []
-            invalid_isbns = []
-            total_rows_processed = 0
-            chunk_size = self.config.memory.excel_chunk_size
-            
             # Log memory usage before processing
             initial_memory = memory_monitor.get_memory_usage()
-            wx.CallAfter(
-                self.result_label.AppendText, 
+            self.ui_feed.post_log(
                 f"🧠 Başlangıç bellek kullanımı: {initial_memory['current_mb']:.1f} MB\n"
             )
             
-            # Process Excel file in chunks
-            for chunk_idx, chunk in enumerate(chunked_excel_reader(
-                file_path=self.excel_path,
-                chunk_size=chunk_size,
-                header=None
-            ), 1):
-                # Optimize chunk memory
-                chunk = optimize_dataframe_memory(chunk)
-                
-                # Extract ISBN from first column
-                isbn_series = chunk.iloc[:, 0].dropna().astype(str)
-                total_rows_processed += len(isbn_series)
-                
-                # Validate ISBNs in this chunk
-                for isbn in isbn_series:
-                    if self.validate_isbn(isbn)[0]:
-                        valid_isbns.append(isbn)
-                    else:
-                        invalid_isbns.append(isbn)
-                
-                # Update progress
-                wx.CallAfter(
-                    self.result_label.AppendText,
-                    f"📄 Chunk {chunk_idx} işlendi: {len(isbn_series)} satır\n"
-                )
-                
-                # Check memory usage
-                current_memory = memory_monitor.get_memory_usage()
-                if self.config.memory.memory_limit_mb:
-                    if not memory_monitor.check_memory_limit(self.config.memory.memory_limit_mb):
-                        wx.CallAfter(
-                            self.result_label.AppendText,
-                            f"⚠️ Bellek limiti aşıldı ({current_memory['current_mb']:.1f} MB), işlem durduruluyor\n"
-                        )
-                        break
-                
-                # Force garbage collection after processing chunks
-                if chunk_idx % 5 == 0:  # Every 5 chunks
-                    memory_monitor.force_garbage_collection()
-            
-            # Report validation results
-            if invalid_isbns:
-                invalid_sample = invalid_isbns[:10]  # Show first 10 invalid ISBNs
-                wx.CallAfter(
-                    self.result_label.AppendText, 
-                    f"⚠️ {len(invalid_isbns)} geçersiz ISBN bulundu (örnek: {', '.join(invalid_sample)})\n"
-                )
-
-            if not valid_isbns:
-                wx.CallAfter(
-                    self.result_label.AppendText, 
-                    "❌ Excel dosyasında geçerli ISBN numarası bulunamadı.\n"
-                )
-                wx.CallAfter(self.finish_bulk_search)
-                return
-                
-            # Report processing statistics
-            final_memory = memory_monitor.get_memory_usage()
-            wx.CallAfter(
-                self.result_label.AppendText,
-                f"✅ Excel analizi tamamlandı:\n"
-                f"📊 Toplam satır: {total_rows_processed}\n"
-                f"✅ Geçerli ISBN: {len(valid_isbns)}\n"
-                f"❌ Geçersiz ISBN: {len(invalid_isbns)}\n"
-                f"🧠 Bellek kullanımı: {final_memory['current_mb']:.1f} MB\n\n"
-            )
-            
             # Start search process
-            wx.CallAfter(self.progress.SetRange, len(valid_isbns))
             wx.CallAfter(self.progress.Show)
             wx.CallAfter(self.progress_label.Show)
             wx.CallAfter(self.loading_text.SetLabel, "🔍 Arama başlıyor...")
             
-            self.bulk_search_parallel(valid_isbns)
+            self.bulk_search_parallel(self.excel_path)
             
         except Exception as e:
+            self.bulk_engine = None
             error_msg = f"❌ Excel dosyası işlenirken hata oluştu: {str(e)}\n"
-            wx.CallAfter(self.result_label.AppendText, error_msg)
+            self.ui_feed.post_log(error_msg)
             wx.CallAfter(self.finish_bulk_search)
 
-    def bulk_search_parallel(self, isbn_list):
-        """Toplu ISBN arama işlemi."""
+    def bulk_search_parallel(self, file_path):
+        """Toplu ISBN arama işlemi - okuma, arama ve yazma akış halinde ilerler."""
         start_time = time.time()
-        results = []
-        success_count = 0
-        fail_count = 0
-
-        for idx, isbn in enumerate(isbn_list, start=1):
-            ok, site_name, message = self.search_service.search_first(isbn)
-            if ok:
-                results.append(message)
-                success_count += 1
-            else:
-                results.append(f"❌ {message}")
-                fail_count += 1
+        mode = self.bulk_search_mode
+        telemetry.reset()
+        process_pool = None
+        search_service, max_workers = self.search_service, DRIVER_POOL_SIZE
+        if self.bulk_use_processes:
+            process_pool = ProcessSearchPool(mode=mode, site_ranker=self.search_stack.site_ranker)
+            search_service, max_workers = process_pool, process_pool.capacity
+            self.ui_feed.post_log(
+                f"⚙️ {process_pool.processes} arama süreci başlatıldı ({max_workers} eş zamanlı arama)\n"
+            )
+        output_path = unique_output_path(os.path.dirname(file_path))
+        writer = TeeResultWriter(
+            ExcelResultWriter(output_path, site_lookups=search_service.site_lookup_counts),
+            self.result_store,
+        )
+        journal = JobJournal.for_input(file_path)
+        if journal.completed:
+            self.ui_feed.post_log(
+                f"♻️ Yarım kalan iş bulundu: {journal.completed} ISBN tekrar aranmayacak\n"
+            )
 
-            wx.CallAfter(self.progress.SetValue, idx)
-            wx.CallAfter(self.progress_label.SetLabel, f"📊 {idx}/{len(isbn_list)} ISBN tamamlandı")
+        self.bulk_engine = BulkSearchEngine(
+            lambda isbn: search_service.search_first(isbn, mode=mode, wait_for_sites=True),
+            max_workers=max_workers,
+            progress_callback=self.ui_feed.post_progress,
+        )
+        pipeline = BulkPipeline(
+            self.bulk_engine,
+            writer,
+            chunk_size=self.config.memory.excel_chunk_size,
+            memory_limit_mb=self.config.memory.memory_limit_mb,
+            on_log=self.ui_feed.post_log,
+            journal=journal,
+            catalog=self.search_stack.catalog,
+            catalog_max_age=CATALOG_MAX_AGE,
+        )
+        wx.CallAfter(self.stop_button.Enable)
+
+        try:
+            stats = pipeline.run(file_path)
+        finally:
+            if process_pool is not None:
+                # Süreçlerin son site sayaçları özet sayfasına yetişsin diye yazıcıdan önce kapatılır
+                process_pool.close()
+            writer.close()
+            journal.close()
+        cancelled = self.bulk_engine.cancelled
+        self.bulk_engine = None
+
+        # İş tamamlandıysa günlüğe gerek kalmaz; durdurulduysa sonraki çalıştırmada kaldığı yerden devam eder
+        if cancelled or stats.stopped_for_memory:
+            self.ui_feed.post_log(
+                "♻️ Aynı dosyayla tekrar başlatıldığında arama kaldığı yerden devam edecek\n"
+            )
+        else:
+            journal.discard()
+
+        # Report validation results
+        if stats.invalid:
+            self.ui_feed.post_log(
+                f"⚠️ {stats.invalid} geçersiz ISBN bulundu (örnek: {', '.join(stats.invalid_samples)})\n"
+            )
+
+        if not stats.valid:
+            os.remove(output_path)
+            self.ui_feed.post_log(
+                "❌ Excel dosyasında geçerli ISBN numarası bulunamadı.\n"
+            )
+            wx.CallAfter(self.finish_bulk_search)
+            return
 
-        self.save_results_to_excel(results)
+        self.ui_feed.post_log(f"💾 Sonuçlar başarıyla kaydedildi: {output_path}\n")
 
         end_time = time.time()
         total_time = end_time - start_time
         minutes = int(total_time // 60)
         seconds = int(total_time % 60)
+        final_memory = memory_monitor.get_memory_usage()
 
         result_message = (
-            f"✅ Toplu arama tamamlandı!\n"
-            f"📊 Toplam ISBN Sayısı: {len(isbn_list)}\n"
-            f"✅ Başarılı Sonuçlar: {success_count}\n"
-            f"❌ Başarısız Sonuçlar: {fail_count}\n"
+            f"{'⏹ Toplu arama durduruldu!' if cancelled else '✅ Toplu arama tamamlandı!'}\n"
+            f"📊 Toplam satır: {stats.rows_read}\n"
+            f"✅ Geçerli ISBN: {stats.valid}\n"
+            f"❌ Geçersiz ISBN: {stats.invalid}\n"
+            f"🔁 Tekrarlanan ISBN: {stats.duplicates} (yalnızca {stats.looked_up} farklı kitap arandı)\n"
+            f"📚 Katalogdan: {stats.from_catalog} ({stats.refreshed} eski kayıt yeniden arandı)\n"
+            f"🔄 İşlenen ISBN Sayısı: {stats.searched} ({stats.resumed} önceki çalıştırmadan)\n"
+            f"✅ Başarılı Sonuçlar: {stats.succeeded}\n"
+            f"❌ Başarısız Sonuçlar: {stats.failed}\n"
             f"⏱️ Toplam Süre: {minutes} dakika {seconds} saniye\n"
+            f"🧠 Bellek kullanımı: {final_memory['current_mb']:.1f} MB\n"
         )
-        wx.CallAfter(self.result_label.AppendText, result_message)
+        self.ui_feed.post_log(result_message)
+        if process_pool is not None:
+            self.ui_feed.post_log(
+                f"⚙️ {process_pool.processes} arama süreci, {process_pool.restarts} kez yeniden başlatıldı\n"
+            )
+        else:
+            # Süreç modunda bu sayaçlar ana süreçte tutulmaz
+            self.ui_feed.post_log(self.format_fetch_tier_stats())
+            self.ui_feed.post_log(self.format_site_ranking())
+            self.ui_feed.post_log(self.format_driver_pool_stats())
+        self.ui_feed.post_log(self.format_stage_timings())
         wx.CallAfter(self.finish_bulk_search)
 
+    def format_fetch_tier_stats(self):
+        """Site bazında hızlı (HTTP) yol kullanımını özetler."""
+        lines = ["⚡ Hızlı yol (tarayıcısız) kullanımı:"]
+        for site_name, stats in self.search_service.fetch_tier_stats().items():
+            lines.append(
+                f"   {site_name}: %{stats['fast_path_ratio'] * 100:.0f} "
+                f"({stats['static_hits']}/{stats['lookups']} arama, {stats['browser_lookups']} tarayıcı)"
+            )
+        for site_name, health in self.search_service.site_health().items():
+            if health["circuit_opens"]:
+                lines.append(
+                    f"   ⛔ {site_name}: {health['circuit_opens']} kez geçici olarak devre dışı kaldı "
+                    f"(durum: {health['state']})"
+                )
+        return "\n".join(lines) + "\n"
+
+    def format_site_ranking(self):
+        """Geçmiş aramalardan öğrenilen site sırasını özetler."""
+        if self.search_stack.site_ranker is None:
+            return ""
+        lines = ["🧭 Öğrenilen site sırası (beklenen bulma süresine göre):"]
+        for site_name, stats in self.search_stack.site_ranker.snapshot().items():
+            lines.append(
+                f"   {site_name}: ~{stats['expected_time_to_hit_s']:.1f} sn "
+                f"(bulma %{stats['hit_rate'] * 100:.0f}, hata %{stats['error_rate'] * 100:.0f}, "
+                f"medyan {stats['latency_p50_s']:.1f} sn)"
+            )
+        return "\n".join(lines) + "\n"
+
+    def format_driver_pool_stats(self):
+        """Tarayıcı havuzu istatistiklerini özetler."""
+        stats = self.driver_pool.stats()
+        return (
+            f"🌐 Tarayıcı havuzu: {stats['size']} açık, {stats['created']} başlatıldı, "
+            f"{stats['recycled']} yenilendi, {stats['health_check_failures']} sağlıksız\n"
+            f"   Ortalama bekleme: {stats['avg_wait_s']:.2f} sn (en fazla {stats['max_wait_s']:.2f} sn), "
+            f"ortalama ömür: {stats['avg_retired_lifetime_s']:.0f} sn\n"
+        )
+
+    def format_stage_timings(self):
+        """Aşama sürelerini özetler ve ayrıntılı ölçümleri veri klasörüne yazar."""
+        metrics_path = get_data_path("metrics.json")
+        telemetry.export(metrics_path)
+        telemetry.export(get_data_path("metrics.prom"))
+        lines = ["⏱️ Aşama süreleri (p50 / p95):"]
+        for stage, histogram in sorted(telemetry.stage_totals().items()):
+            lines.append(
+                f"   {stage}: {histogram.quantile(0.5) * 1000:.0f} / {histogram.quantile(0.95) * 1000:.0f} ms "
+                f"({histogram.count} ölçüm)"
+            )
+        lines.append(f"   Ayrıntılar: {metrics_path}")
+        return "\n".join(lines) + "\n"
+
+    def on_ui_timer(self, event):
+        """Biriken ilerleme, günlük ve sonuç satırlarını tek seferde ekrana yansıtır."""
+        frame = self.ui_feed.drain()
+        if frame.progress is not None:
+            self.update_bulk_progress(frame.progress)
+        if frame.log_text is not None:
+            self.result_label.ChangeValue(frame.log_text)
+            self.result_label.ShowPosition(self.result_label.GetLastPosition())
+        self.result_list.refresh_rows()
+
+    def update_bulk_progress(self, progress):
+        """Toplu arama ilerlemesini toplu olarak günceller."""
+        # Toplam satır sayısı dosya okunurken belli olduğundan ilerleme çubuğu belirsiz modda çalışır
+        self.progress.Pulse()
+        self.progress_label.SetLabel(f"📊 {progress.completed} ISBN tamamlandı")
+
+    def on_stop_bulk_search(self, event):
+        """Devam eden toplu aramayı durdurur."""
+        if self.bulk_engine:
+            self.bulk_engine.cancel()
+            self.loading_text.SetLabel("⏹ Durduruluyor...")
+        self.stop_button.Disable()
+
     def finish_bulk_search(self):
         """Toplu arama tamamlandığında çalışır."""
+        self.ui_timer.Stop()
+        self.on_ui_timer(None)
         self.loading_text.SetLabel("✅ Hazır")
         self.bulk_search_button.Enable()
+        self.stop_button.Disable()
         self.progress.Hide()
         self.progress_label.Hide()
 
-    def save_results_to_excel(self, results):
-        """Sonuçları Excel'e kaydeder."""
-        try:
-            data = []
-            for result in results:
-                if "Sonuç:" in result:
-                    lines = result.split("\n")
-                    isbn = lines[1].split(": ")[1].strip() if len(lines) > 1 else "ISBN bulunamadı"
-                    title = lines[2].split(": ")[1].strip() if len(lines) > 2 else "Kitap adı bulunamadı"
-                    author = lines[3].split(": ")[1].strip() if len(lines) > 3 else "Yazar bulunamadı"
-                    publisher = lines[4].split(": ")[1].strip() if len(lines) > 4 else "Yayınevi bulunamadı"
-                    source = lines[5].split(": ")[1].strip() if len(lines) > 5 else "Web adresi bulunamadı"
-                    data.append([isbn, title, author, publisher, source])
-                else:
-                    data.append([result, "Bulunamadı", "Bulunamadı", "Bulunamadı", "Bulunamadı"])
-
-            output_df = pd.DataFrame(data, columns=["ISBN", "Kitap Adı", "Yazar", "Yayınevi", "Web Adresi"])
-
-            base_path = os.path.dirname(self.excel_path)
-            base_filename = "Arama_Sonuclari"
-            output_path = os.path.join(base_path, f"{base_filename}.xlsx")
-
-            counter = 1
-            while os.path.exists(output_path):
-                output_path = os.path.join(base_path, f"{base_filename}_{counter}.xlsx")
-                counter += 1
-
-            with pd.ExcelWriter(output_path, engine="xlsxwriter") as writer:
-                output_df.to_excel(writer, index=False, sheet_name="Sonuçlar", startrow=1)
-                worksheet = writer.sheets["Sonuçlar"]
-                worksheet.set_column(0, 0, 20)
-                worksheet.set_column(1, 1, 40)
-                worksheet.set_column(2, 2, 30)
-                worksheet.set_column(3, 3, 30)
-                worksheet.set_column(4, 4, 40)
-
-                red_format = writer.book.add_format({"bg_color": "#FFC7CE", "font_color": "#9C0006"})
-                worksheet.conditional_format(
-                    "B2:E1000",
-                    {"type": "text", "criteria": "containing", "value": "Bulunamadı", "format": red_format}
-                )
-
-            wx.CallAfter(self.result_label.AppendText, f"💾 Sonuçlar başarıyla kaydedildi: {output_path}\n")
-        except Exception as e:
-            wx.CallAfter(self.result_label.AppendText, f"❌ Sonuçlar Excel'e kaydedilirken hata oluştu: {str(e)}\n")
-
     def on_close(self, event):
         """Pencere kapatıldığında tarayıcıyı kapat."""
-        if hasattr(self, 'driver_pool'):
-            self.driver_pool.close()
+        if self.bulk_engine:
+            self.bulk_engine.cancel()
+        self.ui_timer.Stop()
+        if hasattr(self, 'search_stack'):
+            self.search_stack.close()
+        self.result_store.discard()
         event.Skip()
 
 
 if __name__ == "__main__":
+    # Paketlenmiş (frozen) uygulamada arama süreçlerinin başlatılabilmesi için
+    multiprocessing.freeze_support()
     app = wx.App(False)
     frame = ModernISBNApp(None, "📚 APSORT")
     app.MainLoop()
\ No newline at end of file
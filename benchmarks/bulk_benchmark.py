@@ -0,0 +1,355 @@
+"""Offline throughput benchmark for bulk ISBN search.
+
+Serves the four book sites from localhost (see ``mock_sites``), writes a
+synthetic input workbook and runs it through ``BulkPipeline`` like the app
+does: static HTTP scrapers first, then the browser tier through an
+``ElasticDriverPool`` of mock drivers, with results streamed to an .xlsx
+file. The site pages are synthetic fixtures and the browser tier is mocked
+(no Chrome or Selenium scrapers are involved), so the numbers are for
+comparing builds of the pipeline, not for predicting live throughput.
+Needs nothing beyond this tree's own dependencies. Every requested search mode is run against the same input. With
+``--processes N`` the lookups run in N worker processes
+(``ProcessSearchPool``), each with its own ``--drivers``-sized pool.
+
+    python -m benchmarks.bulk_benchmark --isbns 500 --mode sequential race \\
+        --latency-ms 40 --jitter-ms 60 --failure-rate 0.02 --output report.json
+
+The report (JSON on stdout, or ``--output``) has ISBNs/s, p50/p95/p99
+lookup latency, peak RSS and driver utilization per mode. With
+``--baseline`` a previous report is compared against and the exit status
+is 1 when throughput, p95 latency or peak RSS regressed by more than
+``--tolerance``.
+"""
+
+import argparse
+import functools
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from typing import List, Optional
+
+from benchmarks.mock_sites import MockSearchStack, MockSites
+
+try:
+    import psutil
+except ImportError:  # Peak RSS falls back to getrusage (Unix only) without psutil
+    psutil = None
+
+SAMPLE_INTERVAL = 0.05
+# Report keys checked by --baseline, and whether a larger value is better
+REGRESSION_METRICS = {
+    "isbns_per_sec": True,
+    "latency_p95_ms": False,
+    "peak_rss_mb": False,
+}
+
+
+def isbn13_check_digit(first12: str) -> str:
+    total = sum(int(d) * (1 if i % 2 == 0 else 3) for i, d in enumerate(first12))
+    return str((10 - total % 10) % 10)
+
+
+def isbn10_of(isbn13: str) -> str:
+    body = isbn13[3:12]
+    check = (11 - sum((10 - i) * int(d) for i, d in enumerate(body)) % 11) % 11
+    return body + ("X" if check == 10 else str(check))
+
+
+def synthetic_isbns(count: int, duplicate_ratio: float, invalid_ratio: float, seed: int) -> List[str]:
+    """Input rows: valid Turkish ISBN-13s, some repeated as ISBN-10, some garbage."""
+    rng = random.Random(seed)
+    rows = []
+    for _ in range(count):
+        roll = rng.random()
+        if rows and roll < duplicate_ratio:
+            isbn = rng.choice(rows)
+            if len(isbn) == 13 and rng.random() < 0.5:
+                isbn = isbn10_of(isbn)
+            rows.append(isbn)
+        elif roll < duplicate_ratio + invalid_ratio:
+            rows.append(f"97860{rng.randrange(10 ** 7):07d}0")
+        else:
+            first12 = f"978605{rng.randrange(10 ** 6):06d}"
+            rows.append(first12 + isbn13_check_digit(first12))
+    return rows
+
+
+def write_input_workbook(path: str, isbns: List[str]):
+    import xlsxwriter
+
+    workbook = xlsxwriter.Workbook(path, {"constant_memory": True})
+    worksheet = workbook.add_worksheet()
+    for row, isbn in enumerate(isbns):
+        worksheet.write_string(row, 0, isbn)
+    workbook.close()
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted list (0 for an empty one)."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, min(len(sorted_values), round(q / 100 * len(sorted_values) + 0.5)))
+    return sorted_values[rank - 1]
+
+
+def _rss_mb(children: bool = False) -> float:
+    """RSS of this process, plus its child processes when ``children`` is set."""
+    if psutil is not None:
+        process = psutil.Process()
+        processes = [process] + (process.children(recursive=True) if children else [])
+        total = 0
+        for member in processes:
+            try:
+                total += member.memory_info().rss
+            except psutil.Error:  # Exited since it was listed
+                pass
+        return total / (1024 * 1024)
+    import resource
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if children:
+        peak += resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+class _Sampler:
+    """Samples RSS and driver pool occupancy on a background thread.
+
+    Without a ``driver_pool`` (process mode) only RSS is sampled, summed over
+    the worker processes.
+    """
+
+    def __init__(self, driver_pool):
+        self.driver_pool = driver_pool
+        self.peak_rss_mb = _rss_mb(children=driver_pool is None)
+        self.samples = 0
+        self.in_use_total = 0
+        self.size_total = 0
+        self.peak_size = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="benchmark-sampler", daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(SAMPLE_INTERVAL):
+            self.samples += 1
+            if self.driver_pool is not None:
+                stats = self.driver_pool.stats()
+                self.in_use_total += stats["in_use"]
+                self.size_total += stats["size"]
+                self.peak_size = max(self.peak_size, stats["size"])
+            self.peak_rss_mb = max(self.peak_rss_mb, _rss_mb(children=self.driver_pool is None))
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._stop.set()
+        self._thread.join()
+        self.peak_rss_mb = max(self.peak_rss_mb, _rss_mb(children=self.driver_pool is None))
+
+
+def run_scenario(args, sites: MockSites, input_path: str, output_dir: str, mode: str) -> dict:
+    from src.services.bulk_pipeline import BulkPipeline
+    from src.scrapers.static_sites import STATIC_SCRAPERS
+    from src.services.bulk_search import BulkSearchEngine
+    from src.services.factory import DRIVER_POOL_SIZE
+    from src.services.process_pool import ProcessSearchPool
+    from src.services.site_ranking import SiteRanker
+    from src.utils.result_writer import ExcelResultWriter
+
+    sites.reset_counters()
+    pool_size = args.drivers or DRIVER_POOL_SIZE
+    make_stack = functools.partial(
+        MockSearchStack, sites.base_urls,
+        render_ms=args.render_ms, timeout=args.timeout, rate_limits=args.rate_limits, adaptive=args.adaptive,
+    )
+    site_ranker = None
+    if args.processes:
+        stack = None
+        driver_pool = None
+        site_ranker = SiteRanker(STATIC_SCRAPERS) if args.adaptive else None
+        search_service = ProcessSearchPool(
+            args.processes, threads=pool_size, stack_factory=make_stack, mode=mode, site_ranker=site_ranker
+        )
+        capacity = search_service.capacity
+    else:
+        stack = make_stack(pool_size, concurrent_searches=args.workers or pool_size)
+        driver_pool = stack.driver_pool
+        search_service = stack.search_service
+        site_ranker = stack.site_ranker
+        capacity = pool_size
+
+    latencies = []
+
+    def search(isbn):
+        result = search_service.search_first(isbn, mode=mode, wait_for_sites=True)
+        latencies.append(result.elapsed)
+        return result
+
+    engine = BulkSearchEngine(search, max_workers=args.workers or capacity)
+    writer = ExcelResultWriter(
+        os.path.join(output_dir, f"results_{mode}.xlsx"), site_lookups=search_service.site_lookup_counts
+    )
+    pipeline = BulkPipeline(engine, writer, chunk_size=args.chunk_size)
+
+    started = time.perf_counter()
+    try:
+        with _Sampler(driver_pool) as sampler:
+            stats = pipeline.run(input_path)
+    finally:
+        if stack is None:
+            search_service.close()
+        writer.close()
+        if stack is not None:
+            pool_stats = stack.driver_pool.stats()
+            stack.close()
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    samples = max(sampler.samples, 1)
+    report = {
+        "mode": mode,
+        "processes": args.processes or 0,
+        "rows": stats.rows_read,
+        "looked_up": stats.looked_up,
+        "found": stats.succeeded,
+        "not_found": stats.failed,
+        "duplicates": stats.duplicates,
+        "invalid": stats.invalid,
+        "seconds": round(elapsed, 3),
+        "isbns_per_sec": round(stats.looked_up / elapsed, 2) if elapsed else 0.0,
+        "rows_per_sec": round(stats.searched / elapsed, 2) if elapsed else 0.0,
+        "latency_p50_ms": round(percentile(latencies, 50) * 1000, 1),
+        "latency_p95_ms": round(percentile(latencies, 95) * 1000, 1),
+        "latency_p99_ms": round(percentile(latencies, 99) * 1000, 1),
+        "latency_max_ms": round(latencies[-1] * 1000, 1) if latencies else 0.0,
+        "peak_rss_mb": round(sampler.peak_rss_mb, 1),
+        "site_requests": sites.request_counts(),
+    }
+    if site_ranker is not None:
+        report["site_ranking"] = site_ranker.snapshot()
+    if stack is None:
+        report["worker_restarts"] = search_service.restarts
+        return report
+    report.update({
+        # Share of the pool's capacity that was busy, and of the drivers actually started
+        "driver_utilization": round(sampler.in_use_total / (samples * pool_size), 3),
+        "live_driver_utilization": round(sampler.in_use_total / sampler.size_total, 3) if sampler.size_total else 0.0,
+        "drivers_peak": sampler.peak_size,
+        "driver_pool": pool_stats,
+        "fetch_tiers": search_service.fetch_tier_stats(),
+        "site_health": search_service.site_health(),
+    })
+    return report
+
+
+def find_regressions(report: dict, baseline: dict, tolerance: float) -> List[str]:
+    """Lists the metrics of ``report`` that are worse than ``baseline`` by more than ``tolerance``."""
+    baseline_runs = {run["mode"]: run for run in baseline.get("runs", [])}
+    regressions = []
+    for run in report["runs"]:
+        previous = baseline_runs.get(run["mode"])
+        if previous is None:
+            continue
+        for metric, higher_is_better in REGRESSION_METRICS.items():
+            old, new = previous.get(metric), run.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            if (-change if higher_is_better else change) > tolerance:
+                regressions.append(f"{run['mode']} {metric}: {old} -> {new} ({change:+.1%})")
+    return regressions
+
+
+def run_benchmark(args) -> dict:
+    isbns = synthetic_isbns(args.isbns, args.duplicate_ratio, args.invalid_ratio, args.seed)
+    with tempfile.TemporaryDirectory(prefix="isbn-bench-") as work_dir:
+        # Keep the real cache and job journals out of the measurement
+        os.environ["ISBN_SEARCH_DATA_DIR"] = work_dir
+        input_path = os.path.join(work_dir, "input.xlsx")
+        write_input_workbook(input_path, isbns)
+        with MockSites(
+            hit_rate=args.hit_rate,
+            latency_ms=args.latency_ms,
+            jitter_ms=args.jitter_ms,
+            failure_rate=args.failure_rate,
+            failure_status=args.failure_status,
+        ) as sites:
+            runs = [run_scenario(args, sites, input_path, work_dir, mode) for mode in args.mode]
+    return {
+        "settings": {
+            key: getattr(args, key)
+            for key in ("isbns", "duplicate_ratio", "invalid_ratio", "hit_rate", "latency_ms", "jitter_ms",
+                        "failure_rate", "failure_status", "render_ms", "workers", "drivers", "processes", "chunk_size",
+                        "rate_limits", "adaptive", "seed")
+        },
+        "runs": runs,
+    }
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="bulk_benchmark", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--isbns", type=int, default=300, help="input rows")
+    parser.add_argument("--mode", nargs="+", choices=("sequential", "race"), default=["sequential", "race"])
+    parser.add_argument("--duplicate-ratio", type=float, default=0.1, help="share of rows repeating an earlier ISBN")
+    parser.add_argument("--invalid-ratio", type=float, default=0.02, help="share of rows with a bad checksum")
+    parser.add_argument(
+        "--hit-rate", type=float, nargs="+", default=[0.5],
+        help="chance that a site carries a given book; one value, or one per site (Babil, D&R, Kitapsec, BKM Kitap)",
+    )
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="fixed server latency per request")
+    parser.add_argument("--jitter-ms", type=float, default=30.0, help="extra uniform random latency")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="share of requests answered with an error")
+    parser.add_argument("--failure-status", type=int, default=503, help="HTTP status of injected failures")
+    parser.add_argument("--render-ms", type=float, default=150.0, help="extra time a mock browser spends per page")
+    parser.add_argument("--workers", type=int, help="concurrent lookups (default: driver pool size)")
+    parser.add_argument("--drivers", type=int, help="driver pool size (default: the app's), per process with --processes")
+    parser.add_argument("--processes", type=int, metavar="N", help="run lookups in N worker processes")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="rows read per Excel chunk")
+    parser.add_argument("--timeout", type=float, default=10.0, help="HTTP timeout in seconds")
+    parser.add_argument("--rate-limits", action="store_true", help="pace sites with the app's rate limits")
+    parser.add_argument("--adaptive", action="store_true", help="order sites by learned expected time-to-hit")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", metavar="PATH", help="write the report here instead of stdout")
+    parser.add_argument("--baseline", metavar="PATH", help="previous report to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="allowed relative regression")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    report = run_benchmark(args)
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    for run in report["runs"]:
+        print(
+            f"{run['mode']:>10}: {run['isbns_per_sec']:.1f} ISBN/s, "
+            f"p50 {run['latency_p50_ms']:.0f} ms, p95 {run['latency_p95_ms']:.0f} ms, "
+            f"p99 {run['latency_p99_ms']:.0f} ms, RSS {run['peak_rss_mb']:.0f} MB, "
+            + (f"{run['processes']} processes, {run['worker_restarts']} restarts" if run["processes"]
+               else f"drivers {run['driver_utilization']:.0%} busy"),
+            file=sys.stderr,
+        )
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = find_regressions(report, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,346 @@
+"""Local stand-ins for the book sites, used by the benchmarks.
+
+Each ``MockSite`` serves the pages of one site from ``fixtures/`` on its own
+localhost port. The fixtures are synthetic: hand-written templates with the
+markup the static scrapers look for, not pages recorded from the real
+sites, so they show how the pipeline scales but not whether the scrapers
+still match the live markup. Search URLs are the real sites', so the
+static scrapers only need their ``base_url`` overridden. Whether a site
+carries a book is a stable hash of (site, ISBN), so every run sees the
+same catalog.
+Latency (a fixed part plus uniform jitter) and failures (HTTP errors at a
+given rate) are injected per request.
+
+The browser tier is mocked too: ``MockDriver`` and ``MockBrowserService``
+stand in for Chrome and the Selenium scrapers (plugged in through
+``service_factory`` instead of ``ISBNSearchService``). The driver "renders"
+a page by fetching it and sleeping ``render_ms``, and the service borrows
+drivers from a real ``ElasticDriverPool``, parses the page with the static
+scraper and answers with the ``(ok, site, message)`` tuple
+``ISBNSearchService`` returns. Browser-tier timings therefore model pool
+contention and render time, not real page loads.
+``MockSearchStack`` wires them into a ``MultiSiteSearchService``; it only
+needs the sites' URLs, so worker processes can build their own.
+"""
+
+import hashlib
+import os
+import random
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from string import Template
+from typing import Dict, Optional
+from urllib.parse import parse_qs, urlsplit
+
+import requests
+
+from src.scrapers.http_fetch import HttpFetchError
+from src.scrapers.static_sites import STATIC_SCRAPERS
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# Fixture file prefix of every site, and whether an exact ISBN match redirects to the product page
+SITE_FIXTURES = {
+    "Babil": ("babil", True),
+    "D&R": ("dr", True),
+    "Kitapsec": ("kitapsec", False),
+    "BKM Kitap": ("bkmkitap", False),
+}
+
+PRODUCT_PATH = "/kitap/{isbn}"
+
+
+def _load_template(name: str) -> Template:
+    with open(os.path.join(FIXTURES_DIR, name), encoding="utf-8") as f:
+        return Template(f.read())
+
+
+class MockSite:
+    """One fake book site; ``start`` serves it, ``base_url`` points the scrapers at it."""
+
+    def __init__(
+        self,
+        site_name: str,
+        hit_rate: float = 0.5,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        failure_rate: float = 0.0,
+        failure_status: int = 503,
+        seed: int = 0,
+    ):
+        prefix, self.redirect = SITE_FIXTURES[site_name]
+        self.site_name = site_name
+        self.hit_rate = hit_rate
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.failure_rate = failure_rate
+        self.failure_status = failure_status
+        self.search_page = _load_template(f"{prefix}_search.html")
+        self.product_page = _load_template(f"{prefix}_product.html")
+        self.no_results_page = _load_template("no_results.html")
+
+        search = urlsplit(STATIC_SCRAPERS[site_name].search_path)
+        self.search_route = search.path
+        self.query_key = next(iter(parse_qs(search.query, keep_blank_values=True)))
+
+        self.requests = Counter()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def has_book(self, isbn: str) -> bool:
+        digest = hashlib.sha1(f"{self.site_name}:{isbn}".encode()).digest()
+        return int.from_bytes(digest[:4], "big") / 2 ** 32 < self.hit_rate
+
+    def book(self, isbn: str) -> Dict[str, str]:
+        return {
+            "isbn": isbn,
+            "title": f"Deneme Kitabı {isbn[-5:]}",
+            "author": f"Yazar {int(isbn[-3:]) % 97}",
+            "publisher": f"Yayınevi {int(isbn[-2:]) % 13}",
+            "product_path": PRODUCT_PATH.format(isbn=isbn),
+        }
+
+    def reset_counters(self):
+        with self._lock:
+            self.requests.clear()
+
+    def _inject(self) -> Optional[int]:
+        """Sleeps for the simulated latency; returns an error status to send, if any."""
+        with self._lock:
+            delay = self.latency_ms + self._random.uniform(0, self.jitter_ms)
+            fail = self._random.random() < self.failure_rate
+        if delay:
+            time.sleep(delay / 1000)
+        return self.failure_status if fail else None
+
+    def handle(self, path: str):
+        """Returns ``(status, headers, body)`` for a GET of ``path``."""
+        url = urlsplit(path)
+        status = self._inject()
+        if status is not None:
+            kind = "failed"
+        elif url.path == self.search_route:
+            isbn = parse_qs(url.query).get(self.query_key, [""])[0]
+            if not self.has_book(isbn):
+                kind, status, body = "search_miss", 200, self.no_results_page.substitute(isbn=isbn)
+            elif self.redirect:
+                kind, status = "redirect", 302
+                return self._count(kind, status, {"Location": PRODUCT_PATH.format(isbn=isbn)}, "")
+            else:
+                kind, status, body = "search_hit", 200, self.search_page.substitute(self.book(isbn))
+        elif url.path.startswith(PRODUCT_PATH.format(isbn="")):
+            isbn = url.path.rsplit("/", 1)[-1]
+            if self.has_book(isbn):
+                kind, status, body = "product", 200, self.product_page.substitute(self.book(isbn))
+            else:
+                kind, status, body = "not_found", 404, self.no_results_page.substitute(isbn=isbn)
+        else:
+            kind, status, body = "not_found", 404, self.no_results_page.substitute(isbn="")
+        headers = {"Content-Type": "text/html; charset=utf-8"}
+        if kind == "failed":
+            body = "<html><body>Service Unavailable</body></html>"
+            if status == 429:
+                headers["Retry-After"] = "1"
+        return self._count(kind, status, headers, body)
+
+    def _count(self, kind: str, status: int, headers: Dict[str, str], body: str):
+        with self._lock:
+            self.requests[kind] += 1
+        return status, headers, body.encode("utf-8")
+
+    def start(self):
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                status, headers, body = site.handle(self.path)
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name=f"mock-{self.site_name}", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+class MockSites:
+    """Starts one ``MockSite`` per known site with the same injection settings.
+
+    ``hit_rate`` may also be a list with one rate per site (in
+    ``SITE_FIXTURES`` order, the last one repeating) so sites differ in stock.
+    """
+
+    def __init__(self, hit_rate=0.5, **site_options):
+        hit_rates = list(hit_rate) if isinstance(hit_rate, (list, tuple)) else [hit_rate]
+        self.sites = {
+            site_name: MockSite(
+                site_name, hit_rate=hit_rates[min(index, len(hit_rates) - 1)], seed=index, **site_options
+            )
+            for index, site_name in enumerate(SITE_FIXTURES)
+        }
+
+    @property
+    def base_urls(self) -> Dict[str, str]:
+        return {site_name: site.base_url for site_name, site in self.sites.items()}
+
+    def request_counts(self) -> Dict[str, Dict[str, int]]:
+        return {site_name: dict(site.requests) for site_name, site in self.sites.items()}
+
+    def reset_counters(self):
+        for site in self.sites.values():
+            site.reset_counters()
+
+    def __enter__(self):
+        for site in self.sites.values():
+            site.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        for site in self.sites.values():
+            site.stop()
+
+
+class MockDriver:
+    """Just enough of a WebDriver for ``ElasticDriverPool`` and ``MockBrowserService``."""
+
+    def __init__(self, render_ms: float = 0.0, timeout: float = 10.0):
+        self.render_ms = render_ms
+        self.timeout = timeout
+        self.current_url = ""
+        self.page_source = ""
+        self._session = requests.Session()
+
+    def get(self, url: str):
+        try:
+            response = self._session.get(url, timeout=self.timeout)
+        except requests.RequestException as e:
+            raise HttpFetchError(f"{url}: {e}") from e
+        if response.status_code >= 400:
+            raise HttpFetchError(
+                f"{url}: HTTP {response.status_code}",
+                status=response.status_code,
+                retry_after=response.headers.get("Retry-After"),
+            )
+        if self.render_ms:
+            time.sleep(self.render_ms / 1000)
+        self.current_url = response.url
+        self.page_source = response.text
+
+    def execute_script(self, script: str):
+        return 1
+
+    def quit(self):
+        self._session.close()
+
+
+class _DriverFetcher:
+    """Adapts a driver to the ``HttpFetcher.get_page`` interface the static scrapers use."""
+
+    def __init__(self, driver: MockDriver):
+        self.driver = driver
+
+    def get_page(self, url: str):
+        self.driver.get(url)
+        return self.driver.current_url, self.driver.page_source
+
+
+class MockBrowserService:
+    """Browser-tier lookup of one mock site through the driver pool."""
+
+    def __init__(self, site_name: str, base_url: str, driver_pool):
+        self.site_name = site_name
+        self.base_url = base_url
+        self.driver_pool = driver_pool
+
+    def search_first(self, isbn: str):
+        with self.driver_pool.driver() as driver:
+            scraper = STATIC_SCRAPERS[self.site_name](_DriverFetcher(driver), base_url=self.base_url)
+            result = scraper.search(isbn)
+        if result is None:
+            return False, None, "Bulunamadı"
+        message = "\n".join([
+            f"ISBN: {result.isbn}",
+            f"Kitap Adı: {result.title}",
+            f"Yazar: {result.author}",
+            f"Yayınevi: {result.publisher}",
+            f"Web Adresi: {result.url}",
+        ])
+        return True, self.site_name, message
+
+
+class MockSearchStack:
+    """``MultiSiteSearchService`` over the mock sites, with a pool of ``pool_size`` mock drivers.
+
+    Has the ``search_service``/``close`` shape of ``SearchStack``, so
+    ``functools.partial(MockSearchStack, base_urls, ...)`` can serve as the
+    ``stack_factory`` of a ``ProcessSearchPool``, which passes ``processes``
+    like it does to ``build_worker_stack``. ``adaptive`` orders the sites
+    with an in-memory ``SiteRanker``.
+    """
+
+    def __init__(
+        self,
+        base_urls: Dict[str, str],
+        pool_size: int,
+        processes: Optional[int] = None,
+        render_ms: float = 0.0,
+        timeout: float = 10.0,
+        rate_limits: bool = False,
+        adaptive: bool = False,
+        concurrent_searches: Optional[int] = None,
+    ):
+        from src.scrapers.http_fetch import HttpFetcher
+        from src.scrapers.static_sites import build_static_scrapers
+        from src.services.factory import SITE_RATE_LIMITS
+        from src.services.multi_site_search import MultiSiteSearchService
+        from src.services.rate_limit import build_site_governors
+        from src.services.site_ranking import SiteRanker
+        from src.webdriver.elastic_pool import ElasticDriverPool
+
+        self.driver_pool = ElasticDriverPool(
+            min_size=1,
+            max_size=pool_size,
+            max_rss_mb=None,
+            driver_factory=lambda: MockDriver(render_ms=render_ms),
+        )
+        self.site_ranker = SiteRanker(STATIC_SCRAPERS, forward=processes is not None) if adaptive else None
+        self.search_service = MultiSiteSearchService(
+            STATIC_SCRAPERS.items(),
+            self.driver_pool,
+            concurrent_searches=concurrent_searches or pool_size,
+            static_scrapers=build_static_scrapers(HttpFetcher(timeout=timeout), base_urls),
+            governors=build_site_governors(STATIC_SCRAPERS, SITE_RATE_LIMITS, processes or 1) if rate_limits else None,
+            service_factory=lambda site_name, _, pool: MockBrowserService(site_name, base_urls[site_name], pool),
+            ranker=self.site_ranker,
+        )
+
+    def close(self):
+        self.search_service.close()
+        self.driver_pool.close()
@@ -0,0 +1,267 @@
+"""Command-line entry point: ``python -m src.cli single|bulk|catalog ...``.
+
+Runs the same search stack as the desktop app without importing wx. Heavy
+modules (pandas, selenium, xlsxwriter) are only imported by the command
+that needs them, so ``--help`` and argument errors return immediately.
+There is no installed console script; run it from the project root.
+"""
+
+import argparse
+import functools
+import json
+import os
+import sys
+import time
+
+OUTPUT_FORMATS = ("json", "csv")
+
+
+def _log(message: str):
+    print(message, file=sys.stderr, flush=True)
+
+
+def _make_writer(output_format: str, output_path, site_lookups=None):
+    from src.utils.result_writer import CsvResultWriter, JsonLinesResultWriter, open_result_writer
+
+    if output_path:
+        return open_result_writer(output_path, site_lookups=site_lookups)
+    if output_format == "csv":
+        return CsvResultWriter(sys.stdout)
+    return JsonLinesResultWriter(sys.stdout)
+
+
+def _export_metrics(path):
+    if path:
+        from src.utils.telemetry import telemetry
+
+        telemetry.export(path)
+        _log(f"Aşama ölçümleri yazıldı: {path}")
+
+
+def _trace_drivers(args):
+    """Times browser page loads only for runs that report metrics or a profile; None leaves it to the env."""
+    if args.metrics or getattr(args, "profile", None) is not None:
+        return True
+    return None
+
+
+def cmd_single(args) -> int:
+    from src.services.factory import build_search_stack
+    from src.utils.isbn import canonicalize_isbn, validate_isbn
+
+    is_valid, message = validate_isbn(args.isbn)
+    if not is_valid:
+        _log(f"Geçersiz ISBN: {message}")
+        return 2
+
+    stack = build_search_stack(
+        warm_up=False, adaptive_order=not args.fixed_order, trace_drivers=_trace_drivers(args)
+    )
+    try:
+        result = stack.search_service.search_first(canonicalize_isbn(args.isbn), mode=args.mode)
+    finally:
+        stack.close()
+
+    writer = _make_writer(args.format, None)
+    writer.write_result(result)
+    writer.close()
+    _export_metrics(args.metrics)
+    return 0 if result.found else 1
+
+
+def cmd_bulk(args) -> int:
+    from src.services.bulk_pipeline import BulkPipeline
+    from src.services.bulk_search import BulkSearchEngine
+    from src.services.factory import CATALOG_MAX_AGE, DRIVER_POOL_SIZE, build_search_stack
+    from src.services.job_journal import JobJournal
+    from src.services.process_pool import ProcessSearchPool, build_worker_stack
+    from src.utils.profiling import profile_session
+
+    # In process mode the workers own the drivers; the parent only needs the config and catalog
+    stack = build_search_stack(
+        warm_up=args.processes is None,
+        adaptive_order=not args.fixed_order,
+        concurrent_searches=args.workers or DRIVER_POOL_SIZE,
+        trace_drivers=_trace_drivers(args),
+    )
+    if args.processes is None:
+        process_pool = None
+        search_service = stack.search_service
+        workers = args.workers or DRIVER_POOL_SIZE
+    else:
+        process_pool = ProcessSearchPool(
+            args.processes or None,
+            stack_factory=functools.partial(
+                build_worker_stack, adaptive_order=not args.fixed_order, trace_drivers=_trace_drivers(args)
+            ),
+            mode=args.mode,
+            site_ranker=stack.site_ranker,
+        )
+        search_service = process_pool
+        workers = args.workers or process_pool.capacity
+        _log(f"{process_pool.processes} arama süreci başlatıldı ({process_pool.capacity} eş zamanlı arama)")
+    journal = None if args.no_resume else JobJournal.for_input(args.file)
+    if journal is not None and journal.completed:
+        _log(f"Yarım kalan iş bulundu: {journal.completed} satır önceki çalıştırmadan alınacak")
+
+    engine = BulkSearchEngine(
+        lambda isbn: search_service.search_first(isbn, mode=args.mode, wait_for_sites=True),
+        max_workers=workers,
+        progress_callback=lambda progress: _log(
+            f"{progress.completed} ISBN tamamlandı ({progress.succeeded} bulundu, {progress.failed} bulunamadı)"
+        ),
+        progress_interval=5.0,
+    )
+    writer = _make_writer(args.format, args.output, search_service.site_lookup_counts)
+    pipeline = BulkPipeline(
+        engine,
+        writer,
+        chunk_size=stack.config.memory.excel_chunk_size,
+        memory_limit_mb=stack.config.memory.memory_limit_mb,
+        on_log=lambda message: _log(message.rstrip()) if args.verbose else None,
+        journal=journal,
+        isbn_column=args.column - 1 if args.column else None,
+        catalog=stack.catalog,
+        catalog_max_age=CATALOG_MAX_AGE if args.catalog_max_age is None else args.catalog_max_age * 24 * 3600,
+    )
+
+    start_time = time.time()
+    try:
+        # Without --profile, ISBN_SEARCH_PROFILE decides
+        profile = True if args.profile is not None else None
+        with profile_session("bulk_search", enabled=profile, output_dir=args.profile or None):
+            stats = pipeline.run(args.file)
+    except KeyboardInterrupt:
+        engine.cancel()
+        _log("Durduruldu; aynı dosyayla tekrar çalıştırıldığında kaldığı yerden devam eder")
+        return 130
+    finally:
+        if process_pool is not None:
+            # Before the writer, so the summary sheet sees the workers' final lookup counts
+            process_pool.close()
+        writer.close()
+        if journal is not None:
+            journal.close()
+        stack.close()
+        _export_metrics(args.metrics)
+
+    if journal is not None and not stats.stopped_for_memory:
+        journal.discard()
+    _log(json.dumps({
+        "rows": stats.rows_read,
+        "valid": stats.valid,
+        "invalid": stats.invalid,
+        "duplicates": stats.duplicates,
+        "looked_up": stats.looked_up,
+        "from_catalog": stats.from_catalog,
+        "refreshed": stats.refreshed,
+        "resumed": stats.resumed,
+        "worker_restarts": process_pool.restarts if process_pool is not None else 0,
+        # Best first, by expected time to a hit
+        "site_order": list(stack.site_ranker.snapshot()) if stack.site_ranker else None,
+        "found": stats.succeeded,
+        "not_found": stats.failed,
+        "seconds": round(time.time() - start_time, 1),
+    }, ensure_ascii=False))
+    return 0
+
+
+def cmd_catalog(args) -> int:
+    from src.utils.catalog import BookCatalog
+    from src.utils.paths import get_data_path
+
+    catalog = BookCatalog(get_data_path("catalog.sqlite3"))
+    try:
+        results = catalog.search(args.query, field=args.field, limit=args.limit)
+    finally:
+        catalog.close()
+
+    writer = _make_writer(args.format, None)
+    for result in results:
+        writer.write_result(result)
+    writer.close()
+    return 0 if results else 1
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m src.cli", description="Türk kitap sitelerinde ISBN arama")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    def add_common(subparser):
+        subparser.add_argument(
+            "--mode", choices=("sequential", "race"), default="sequential",
+            help="sites in order (sequential) or all at once (race)",
+        )
+        subparser.add_argument("--format", choices=OUTPUT_FORMATS, default="json", help="stdout format")
+        subparser.add_argument(
+            "--fixed-order", action="store_true",
+            help="try sites in registration order instead of the order learned from past lookups",
+        )
+        subparser.add_argument(
+            "--metrics", metavar="PATH",
+            help="write per-stage timings (Prometheus text for .prom/.txt, JSON otherwise); "
+            "also times browser page loads",
+        )
+
+    single = subparsers.add_parser("single", help="look up one ISBN")
+    single.add_argument("isbn")
+    add_common(single)
+    single.set_defaults(func=cmd_single)
+
+    bulk = subparsers.add_parser("bulk", help="look up every ISBN in an .xlsx, CSV or Parquet file")
+    bulk.add_argument("file")
+    bulk.add_argument("--column", type=int, metavar="N", help="1-based ISBN column (default: detected by content)")
+    add_common(bulk)
+    bulk.add_argument(
+        "--output", "--xlsx", metavar="PATH",
+        help="write to a file instead of stdout: .xlsx (with a summary sheet), .csv, .parquet or .jsonl",
+    )
+    bulk.add_argument("--workers", type=int, help="concurrent lookups (default: driver pool size)")
+    bulk.add_argument(
+        "--processes", type=int, metavar="N", nargs="?", const=0,
+        help="search in N worker processes with their own browsers (default N: one per core)",
+    )
+    bulk.add_argument("--no-resume", action="store_true", help="ignore and do not write a job journal")
+    bulk.add_argument(
+        "--catalog-max-age", type=float, metavar="DAYS",
+        help="search catalogued books again once older than this (default: 90, 0: always)",
+    )
+    bulk.add_argument(
+        "--profile", metavar="DIR", nargs="?", const="",
+        help="write cProfile and tracemalloc reports (default DIR: data dir/profiles)",
+    )
+    bulk.add_argument("-v", "--verbose", action="store_true", help="log chunk progress to stderr")
+    bulk.set_defaults(func=cmd_bulk)
+
+    catalog = subparsers.add_parser("catalog", help="search previously found books offline by title/author")
+    catalog.add_argument("query", help="words to match; accents are ignored and words match as prefixes")
+    catalog.add_argument("--field", choices=("title", "author", "publisher"), help="match one field only")
+    catalog.add_argument("--limit", type=int, default=20)
+    catalog.add_argument("--format", choices=OUTPUT_FORMATS, default="json", help="stdout format")
+    catalog.set_defaults(func=cmd_catalog)
+    return parser
+
+
+def _check_input_file(parser: argparse.ArgumentParser, path: str):
+    """Rejects a missing or unreadable input file before any browser or journal is set up."""
+    from src.utils.ingest import SUPPORTED_EXTENSIONS
+
+    if not os.path.isfile(path):
+        parser.error(f"Dosya bulunamadı: {path}")
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in SUPPORTED_EXTENSIONS:
+        parser.error(
+            f"Desteklenmeyen dosya türü: {extension or path} (desteklenenler: {', '.join(SUPPORTED_EXTENSIONS)})"
+        )
+
+
+def main(argv=None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command == "bulk":
+        _check_input_file(parser, args.file)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
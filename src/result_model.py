@@ -0,0 +1,84 @@
+"""Typed result records passed between the scrapers, services and writers."""
+
+from dataclasses import asdict, dataclass
+from typing import Optional
+
+NOT_FOUND = "Bulunamadı"
+
+# Labels the Selenium scrapers use in their formatted messages
+_MESSAGE_FIELDS = {
+    "ISBN": "isbn",
+    "Kitap Adı": "title",
+    "Yazar": "author",
+    "Yayınevi": "publisher",
+    "Web Adresi": "url",
+}
+
+
+@dataclass(slots=True)
+class SearchResult:
+    """Outcome of looking one ISBN up.
+
+    ``site`` is the site that found the book; when ``found`` is false,
+    ``error`` says why. ``elapsed`` is the lookup's wall-clock time in
+    seconds and ``cached`` tells whether it was answered without a lookup
+    of its own: from the cache or the catalog, or, in a bulk job, from an
+    earlier row with the same ISBN or the journal of a resumed run.
+    ``isbn`` is the canonical ISBN-13 that was searched; bulk rows also
+    carry the value as written in the input file in ``input_isbn``.
+    """
+
+    isbn: str
+    found: bool
+    site: Optional[str] = None
+    title: str = ""
+    author: str = ""
+    publisher: str = ""
+    url: str = ""
+    error: str = ""
+    elapsed: float = 0.0
+    cached: bool = False
+    input_isbn: str = ""
+
+    @classmethod
+    def not_found(cls, isbn: str, error: str, elapsed: float = 0.0) -> "SearchResult":
+        return cls(isbn=isbn, found=False, error=error, elapsed=elapsed)
+
+    @classmethod
+    def from_message(cls, isbn: str, ok: bool, site: Optional[str], message: str) -> "SearchResult":
+        """Adapts the ``(ok, site, message)`` tuple returned by ``ISBNSearchService``.
+
+        This is the only place the scrapers' formatted text is parsed; fields
+        are matched by label, so a missing line leaves that field empty
+        instead of shifting the others.
+        """
+        if not ok:
+            return cls.not_found(isbn, message)
+        fields = {}
+        for line in message.split("\n"):
+            label, sep, value = line.partition(": ")
+            key = _MESSAGE_FIELDS.get(label.strip())
+            if sep and key:
+                fields[key] = value.strip()
+        fields.setdefault("isbn", isbn)
+        return cls(found=True, site=site, **fields)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "SearchResult":
+        return cls(**{key: data[key] for key in cls.__dataclass_fields__ if key in data})
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    def format_message(self) -> str:
+        """Human readable text for the result panel."""
+        if not self.found:
+            return f"❌ {self.error}"
+        return (
+            f"✅ {self.site} Sonuç:\n"
+            f"ISBN: {self.isbn}\n"
+            f"Kitap Adı: {self.title}\n"
+            f"Yazar: {self.author}\n"
+            f"Yayınevi: {self.publisher}\n"
+            f"Web Adresi: {self.url}"
+        )
@@ -0,0 +1,79 @@
+"""Pooled HTTP client for scrapers that do not need a browser."""
+
+import threading
+from typing import Dict, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+    ),
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "tr-TR,tr;q=0.9,en;q=0.8",
+}
+
+
+class HttpFetchError(Exception):
+    """Raised when a page cannot be fetched; ``status`` is the HTTP status if any.
+
+    ``retry_after`` is the response's ``Retry-After`` header, if it sent one.
+    """
+
+    def __init__(self, message: str, status: Optional[int] = None, retry_after: Optional[str] = None):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+
+    @property
+    def throttled(self) -> bool:
+        """True when the site explicitly asked the client to slow down."""
+        return self.status == 429 or self.retry_after is not None
+
+
+class HttpFetcher:
+    """Fetches pages over pooled keep-alive connections.
+
+    Each thread keeps its own ``requests.Session`` (sessions are not fully
+    thread-safe), so repeated requests to a site reuse TCP/TLS connections
+    instead of opening a new one per lookup.
+    """
+
+    def __init__(self, timeout: float = 10.0, pool_size: int = 8, headers: Optional[Dict[str, str]] = None):
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self.headers = dict(DEFAULT_HEADERS, **(headers or {}))
+        self._local = threading.local()
+
+    def _session(self) -> requests.Session:
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers.update(self.headers)
+            self._local.session = session
+        return session
+
+    def get(self, url: str, params: Optional[Dict[str, str]] = None) -> str:
+        """Returns the decoded body of ``url`` or raises ``HttpFetchError``."""
+        return self.get_page(url, params)[1]
+
+    def get_page(self, url: str, params: Optional[Dict[str, str]] = None) -> Tuple[str, str]:
+        """Like ``get``, but returns ``(final_url, body)``; ``final_url`` is where redirects ended."""
+        try:
+            response = self._session().get(url, params=params, timeout=self.timeout)
+        except requests.RequestException as e:
+            raise HttpFetchError(f"{url}: {e}") from e
+        if response.status_code >= 400:
+            raise HttpFetchError(
+                f"{url}: HTTP {response.status_code}",
+                status=response.status_code,
+                retry_after=response.headers.get("Retry-After"),
+            )
+        if not response.encoding or response.encoding.lower() == "iso-8859-1":
+            response.encoding = response.apparent_encoding
+        return response.url, response.text
@@ -0,0 +1,204 @@
+"""Browser-free scrapers that parse server-rendered pages with BeautifulSoup."""
+
+import json
+from typing import Dict, Iterable, Optional, Tuple
+from urllib.parse import urljoin, urlsplit
+
+from bs4 import BeautifulSoup
+
+from src.result_model import SearchResult
+from src.scrapers.http_fetch import HttpFetcher
+from src.utils.telemetry import telemetry
+
+
+def _first_text(soup: BeautifulSoup, selectors: Iterable[str]) -> str:
+    for selector in selectors:
+        element = soup.select_one(selector)
+        if element is not None:
+            text = element.get_text(" ", strip=True)
+            if text:
+                return text
+    return ""
+
+
+def _name_of(value) -> str:
+    if isinstance(value, list):
+        return ", ".join(filter(None, (_name_of(item) for item in value)))
+    if isinstance(value, dict):
+        return str(value.get("name", "")).strip()
+    return str(value or "").strip()
+
+
+def _json_ld_book(soup: BeautifulSoup) -> Optional[dict]:
+    """Returns the first schema.org Book/Product object embedded in the page."""
+    for script in soup.find_all("script", type="application/ld+json"):
+        try:
+            data = json.loads(script.string or "")
+        except ValueError:
+            continue
+        stack = [data]
+        while stack:
+            item = stack.pop()
+            if isinstance(item, list):
+                stack.extend(item)
+            elif isinstance(item, dict):
+                types = item.get("@type")
+                types = types if isinstance(types, list) else [types]
+                if "Book" in types or "Product" in types:
+                    return item
+                stack.extend(item.get("@graph", []))
+    return None
+
+
+class StaticScraper:
+    """Looks a book up with plain HTTP requests instead of a WebDriver.
+
+    The search page is fetched first; if it already is the product page (most
+    sites redirect an exact ISBN match) it is parsed directly, otherwise the
+    first result link is followed. The search response only counts as the
+    product page when it was redirected away from the search URL or carries
+    a product marker (a JSON-LD Book/Product or one of the site's
+    ``product_selectors``): result and no-results pages usually repeat the
+    ISBN that was searched. Fields come from schema.org JSON-LD when
+    the page has it and from the site's CSS selectors otherwise. ``search``
+    returns ``None`` whenever the book cannot be extracted with confidence,
+    which tells the caller to fall back to the browser.
+    """
+
+    site_name = ""
+    base_url = ""
+    search_path = ""
+    result_link_selectors = ()
+    product_selectors = ()
+    title_selectors = ("h1",)
+    author_selectors = ()
+    publisher_selectors = ()
+
+    def __init__(self, fetcher: Optional[HttpFetcher] = None, base_url: Optional[str] = None):
+        self.fetcher = fetcher or HttpFetcher()
+        if base_url:
+            self.base_url = base_url
+
+    def search_url(self, isbn: str) -> str:
+        return urljoin(self.base_url, self.search_path.format(isbn=isbn))
+
+    def fetch_page(self, url: str) -> Tuple[str, BeautifulSoup]:
+        """Returns the URL the request ended up at and the parsed page."""
+        with telemetry.stage("static_fetch", self.site_name):
+            final_url, html = self.fetcher.get_page(url)
+        with telemetry.stage("static_parse", self.site_name):
+            return final_url, BeautifulSoup(html, "html.parser")
+
+    def fetch_soup(self, url: str) -> BeautifulSoup:
+        return self.fetch_page(url)[1]
+
+    def is_product_page(self, soup: BeautifulSoup) -> bool:
+        """True when the page carries a product marker."""
+        if _json_ld_book(soup) is not None:
+            return True
+        return any(soup.select_one(selector) is not None for selector in self.product_selectors)
+
+    def search(self, isbn: str) -> Optional[SearchResult]:
+        """Returns the found book as a ``SearchResult``, or ``None``."""
+        url = self.search_url(isbn)
+        final_url, soup = self.fetch_page(url)
+        if urlsplit(final_url).path != urlsplit(url).path or self.is_product_page(soup):
+            book = self.parse_product(soup, final_url, isbn)
+            if book:
+                return book
+
+        link = None
+        for selector in self.result_link_selectors:
+            link = soup.select_one(selector)
+            if link is not None and link.get("href"):
+                break
+        if link is None or not link.get("href"):
+            return None
+
+        product_url = urljoin(url, link["href"])
+        product_soup = self.fetch_soup(product_url)
+        return self.parse_product(product_soup, product_url, isbn)
+
+    def parse_product(self, soup: BeautifulSoup, url: str, isbn: str) -> Optional[SearchResult]:
+        """Extracts the book from a product page, or ``None`` if it is not one for ``isbn``."""
+        data = _json_ld_book(soup) or {}
+        page_isbn = str(data.get("isbn") or data.get("gtin13") or "").replace("-", "")
+        if page_isbn:
+            if page_isbn != isbn:
+                return None
+        elif isbn not in soup.get_text(" "):
+            return None
+
+        title = _name_of(data.get("name")) or _first_text(soup, self.title_selectors)
+        if not title:
+            return None
+        return SearchResult(
+            isbn=isbn,
+            found=True,
+            site=self.site_name,
+            title=title,
+            author=_name_of(data.get("author")) or _first_text(soup, self.author_selectors),
+            publisher=_name_of(data.get("publisher") or data.get("brand"))
+            or _first_text(soup, self.publisher_selectors),
+            url=url,
+        )
+
+
+class BabilStaticScraper(StaticScraper):
+    site_name = "Babil"
+    base_url = "https://www.babil.com"
+    search_path = "/arama?q={isbn}"
+    result_link_selectors = (".product-item a.product-title", ".product-item a[href]")
+    product_selectors = (".product-detail",)
+    title_selectors = ("h1.product-name", "h1")
+    author_selectors = (".product-author a", ".writer a")
+    publisher_selectors = (".product-publisher a", ".publisher a")
+
+
+class DRStaticScraper(StaticScraper):
+    site_name = "D&R"
+    base_url = "https://www.dr.com.tr"
+    search_path = "/search?q={isbn}"
+    result_link_selectors = ("a.prd-name", ".prd-infos a[href]")
+    product_selectors = (".product-detail", ".prd-features")
+    title_selectors = ("h1.prd-name", "h1")
+    author_selectors = (".prd-author a", ".author a")
+    publisher_selectors = (".prd-publisher a", ".publisher a")
+
+
+class KitapsecStaticScraper(StaticScraper):
+    site_name = "Kitapsec"
+    base_url = "https://www.kitapsec.com"
+    search_path = "/Arama/index.php?a={isbn}"
+    result_link_selectors = (".Ks_UrunSatir a[href]", ".Ks_UrunListe a[href]")
+    product_selectors = (".Ks_UrunDetay",)
+    title_selectors = ("h1",)
+    author_selectors = (".yazar a", ".Ks_Yazar a")
+    publisher_selectors = (".yayinevi a", ".Ks_Yayinevi a")
+
+
+class BKMKitapStaticScraper(StaticScraper):
+    site_name = "BKM Kitap"
+    base_url = "https://www.bkmkitap.com"
+    search_path = "/arama?q={isbn}"
+    result_link_selectors = (".product-title a", "a.product-title")
+    product_selectors = ("#productDetail",)
+    title_selectors = ("h1.product-title", "h1")
+    author_selectors = (".writer a", ".author a")
+    publisher_selectors = (".publisher a",)
+
+
+STATIC_SCRAPERS = {
+    scraper_cls.site_name: scraper_cls
+    for scraper_cls in (BabilStaticScraper, DRStaticScraper, KitapsecStaticScraper, BKMKitapStaticScraper)
+}
+
+
+def build_static_scrapers(fetcher: Optional[HttpFetcher] = None, base_urls: Optional[Dict[str, str]] = None):
+    """Returns ``{site_name: StaticScraper}`` sharing one ``HttpFetcher``."""
+    fetcher = fetcher or HttpFetcher()
+    base_urls = base_urls or {}
+    return {
+        site_name: scraper_cls(fetcher, base_url=base_urls.get(site_name))
+        for site_name, scraper_cls in STATIC_SCRAPERS.items()
+    }
@@ -0,0 +1,269 @@
+"""Streaming bulk search: read, validate, search and write without buffering."""
+
+import dataclasses
+import functools
+from collections import OrderedDict, deque
+from itertools import chain
+from typing import Callable, Iterator, List, Optional, Tuple
+
+from src.result_model import SearchResult
+from src.services.bulk_search import BulkSearchEngine
+from src.utils.ingest import IsbnSource
+from src.utils.isbn import canonicalize_series
+
+INVALID_SAMPLE_SIZE = 10
+# Results of recently written ISBNs kept for repeats further down the input
+RECENT_RESULTS = 10000
+
+
+def _returns(record: SearchResult) -> Callable[[], SearchResult]:
+    return lambda: record
+
+
+class PipelineStats:
+    """Counters collected while a bulk pipeline runs."""
+
+    __slots__ = ("chunks", "rows_read", "valid", "invalid", "invalid_samples", "duplicates",
+                 "looked_up", "from_catalog", "refreshed", "succeeded", "failed", "resumed",
+                 "stopped_for_memory")
+
+    def __init__(self):
+        self.chunks = 0
+        self.rows_read = 0
+        self.valid = 0
+        self.invalid = 0
+        self.invalid_samples: List[str] = []
+        self.duplicates = 0
+        self.looked_up = 0
+        self.from_catalog = 0
+        self.refreshed = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.resumed = 0
+        self.stopped_for_memory = False
+
+    @property
+    def searched(self) -> int:
+        return self.succeeded + self.failed
+
+
+class BulkPipeline:
+    """Streams ISBNs from an input file through the search engine into a writer.
+
+    Chunks of the ISBN column from ``IsbnSource`` (.xlsx, CSV or Parquet;
+    the column is detected by content unless ``isbn_column`` is given) are
+    validated and fed lazily to
+    ``BulkSearchEngine``, whose bounded in-flight window means reading only
+    advances as fast as searching does. Each result is handed to
+    ``writer.write_result`` as soon as it is ready, so memory stays bounded
+    by the chunk size and the engine window regardless of the input size.
+
+    ISBNs are checksum-validated and canonicalized to ISBN-13 a chunk at a
+    time, and a book is searched only once while it is in flight or among
+    the last ``RECENT_RESULTS`` distinct results: rows repeating it (in
+    either form) reuse its result and are written in their original
+    position. Rows that need no lookup (these repeats and catalogued books)
+    still pass through the engine as resolved items, so they count against
+    its ``max_buffered`` rows and a long run of them waits behind a slow
+    lookup instead of being read ahead. Every written row keeps the ISBN as
+    it appeared in the input (``input_isbn``) next to the canonical one.
+
+    With a ``catalog`` (see ``BookCatalog``) every new ISBN is resolved from
+    it first: a book catalogued less than ``catalog_max_age`` seconds ago is
+    written without searching, an older one is searched again and its
+    catalog record is kept as the answer if the sites no longer find it.
+    ``catalog_max_age=None`` trusts the catalog regardless of age.
+
+    With a ``journal`` (see ``JobJournal``) every result is checkpointed as
+    it is written, and the rows a previous, interrupted run already finished
+    are replayed from it instead of being searched again.
+    """
+
+    def __init__(
+        self,
+        engine: BulkSearchEngine,
+        writer,
+        chunk_size: int,
+        memory_limit_mb: Optional[float] = None,
+        on_log: Optional[Callable[[str], None]] = None,
+        journal=None,
+        isbn_column: Optional[int] = None,
+        catalog=None,
+        catalog_max_age: Optional[float] = None,
+    ):
+        self.engine = engine
+        self.writer = writer
+        self.chunk_size = chunk_size
+        self.memory_limit_mb = memory_limit_mb
+        self.on_log = on_log or (lambda message: None)
+        self.journal = journal
+        self.isbn_column = isbn_column
+        self.catalog = catalog
+        self.catalog_max_age = catalog_max_age
+        self.stats = PipelineStats()
+        # Canonical ISBN -> [result (None while searching), repeated rows still to be written]
+        self._in_flight = {}
+        # Canonical ISBN -> result of the most recently written distinct ISBNs
+        self._recent = OrderedDict()
+        # Input values of the rows handed to the engine and not yet written, in input order
+        self._row_inputs = deque()
+        # Stale catalog records, kept until their refresh comes back
+        self._stale = {}
+
+    def read_isbns(self, file_path: str) -> Iterator[Tuple[str, str]]:
+        """Yields ``(input value, canonical ISBN-13)`` for every valid row of ``file_path``."""
+        import pandas as pd
+
+        stats = self.stats
+        source = IsbnSource(file_path, self.isbn_column)
+        column = source.column
+        self.on_log(
+            f"🔎 ISBN sütunu: {column.index + 1}"
+            + (f" ({column.header})" if column.header else "")
+            + (f", geçerli örnek oranı: %{column.score * 100:.0f}\n" if column.score else "\n")
+        )
+        for chunk_idx, chunk in enumerate(source.chunks(self.chunk_size), 1):
+            raw_isbns = pd.Series(chunk)
+            del chunk
+            canonical = canonicalize_series(raw_isbns)
+            valid_mask = canonical.notna()
+
+            stats.chunks = chunk_idx
+            stats.rows_read += len(raw_isbns)
+            valid_count = int(valid_mask.sum())
+            stats.valid += valid_count
+            stats.invalid += len(raw_isbns) - valid_count
+            if len(stats.invalid_samples) < INVALID_SAMPLE_SIZE:
+                missing = INVALID_SAMPLE_SIZE - len(stats.invalid_samples)
+                stats.invalid_samples.extend(raw_isbns[~valid_mask].astype(str).head(missing))
+            self.on_log(f"📄 Chunk {chunk_idx} işlendi: {len(raw_isbns)} satır\n")
+
+            yield from zip(raw_isbns[valid_mask].tolist(), canonical[valid_mask].tolist())
+
+            if self.memory_limit_mb:
+                from src.utils.memory import memory_monitor
+
+                if not memory_monitor.check_memory_limit(self.memory_limit_mb):
+                    current_memory = memory_monitor.get_memory_usage()
+                    self.on_log(
+                        f"⚠️ Bellek limiti aşıldı ({current_memory['current_mb']:.1f} MB), "
+                        f"yeni satır okunmayacak\n"
+                    )
+                    stats.stopped_for_memory = True
+                    return
+                if chunk_idx % 5 == 0:
+                    memory_monitor.force_garbage_collection()
+
+    def _write(self, input_isbn: str, record: SearchResult, searched: bool = True):
+        """Writes (and journals) the row whose input cell was ``input_isbn``.
+
+        Rows that were not ``searched`` themselves are marked ``cached``.
+        """
+        row = dataclasses.replace(record, input_isbn=input_isbn, cached=record.cached or not searched)
+        self.writer.write_result(row)
+        if row.found:
+            self.stats.succeeded += 1
+        else:
+            self.stats.failed += 1
+        if self.journal is not None:
+            self.journal.record(row)
+
+    def _remember(self, isbn: str, record: SearchResult):
+        self._recent[isbn] = record
+        self._recent.move_to_end(isbn)
+        if len(self._recent) > RECENT_RESULTS:
+            self._recent.popitem(last=False)
+
+    def _items(self, rows: Iterator[Tuple[str, str]]) -> Iterator:
+        """Engine items for ``rows``: the ISBN of each new book, a resolver for every other row."""
+        for input_isbn, isbn in rows:
+            self._row_inputs.append(input_isbn)
+            shared = self._in_flight.get(isbn)
+            if shared is not None:
+                self.stats.duplicates += 1
+                shared[1] += 1
+                yield functools.partial(self._take_shared, isbn)
+                continue
+            record = self._recent.get(isbn)
+            if record is not None:
+                self.stats.duplicates += 1
+                self._recent.move_to_end(isbn)
+                yield _returns(record)
+                continue
+            record = self._from_catalog(isbn)
+            if record is not None:
+                self._remember(isbn, record)
+                yield _returns(record)
+                continue
+            self._in_flight[isbn] = [None, 0]
+            yield isbn
+
+    def _take_shared(self, isbn: str) -> SearchResult:
+        """Result for a row repeating an ISBN that was in flight when the row was read."""
+        shared = self._in_flight[isbn]
+        shared[1] -= 1
+        if shared[1] == 0:
+            del self._in_flight[isbn]
+        return shared[0]
+
+    def _searched(self, isbn: str, record: SearchResult):
+        shared = self._in_flight[isbn]
+        shared[0] = record
+        if shared[1] == 0:
+            del self._in_flight[isbn]
+        self._remember(isbn, record)
+
+    def _from_catalog(self, isbn: str) -> Optional[SearchResult]:
+        """A fresh catalog record of ``isbn``; a stale one is remembered for ``run`` instead."""
+        if self.catalog is None:
+            return None
+        entry = self.catalog.get(isbn)
+        if entry is None:
+            return None
+        if self.catalog_max_age is not None and entry.age > self.catalog_max_age:
+            self._stale[isbn] = entry.result
+            return None
+        self.stats.from_catalog += 1
+        return entry.result
+
+    def _replay_journal(self, rows: Iterator[Tuple[str, str]]) -> Iterator[Tuple[str, str]]:
+        """Writes the journaled prefix of the job and returns the rows still to process."""
+        replayed = 0
+        for record in self.journal.replay():
+            row = next(rows, None)
+            if row is None or row[1] != record.isbn:
+                # The input no longer lines up with the journal; search from here on
+                self.journal.truncate(replayed)
+                self.stats.resumed = replayed
+                return chain([row], rows) if row is not None else rows
+            if row[1] in self._recent:
+                self.stats.duplicates += 1
+            self._remember(row[1], record)
+            # Straight to the writer: the row is already in the journal
+            self.writer.write_result(dataclasses.replace(record, cached=True))
+            if record.found:
+                self.stats.succeeded += 1
+            else:
+                self.stats.failed += 1
+            replayed += 1
+        self.stats.resumed = replayed
+        return rows
+
+    def run(self, file_path: str) -> PipelineStats:
+        """Runs the whole pipeline and returns its counters."""
+        rows = self.read_isbns(file_path)
+        if self.journal is not None:
+            rows = self._replay_journal(rows)
+
+        for result in self.engine.run(self._items(rows)):
+            record = result.record
+            if result.searched:
+                self.stats.looked_up += 1
+                stale = self._stale.pop(result.isbn, None)
+                if stale is not None:
+                    self.stats.refreshed += 1
+                    if not record.found:
+                        record = stale
+                self._searched(result.isbn, record)
+            self._write(self._row_inputs.popleft(), record, result.searched)
+        return self.stats
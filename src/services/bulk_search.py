@@ -0,0 +1,171 @@
+"""Concurrent bulk ISBN search engine."""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, Iterator, NamedTuple, Optional, Union
+
+from src.result_model import SearchResult
+
+SearchFn = Callable[[str], SearchResult]
+# An ISBN to search, or a callable giving the result of a row that needs no lookup
+BulkItem = Union[str, Callable[[], SearchResult]]
+
+# Rows held at once (in flight or waiting for an earlier row) unless ``max_buffered`` says otherwise
+DEFAULT_MAX_BUFFERED = 1000
+
+
+class BulkResult(NamedTuple):
+    """Outcome of a single lookup inside a bulk run."""
+
+    index: int
+    isbn: str
+    record: SearchResult
+    searched: bool = True  # False for rows resolved without a lookup
+
+
+class BulkProgress(NamedTuple):
+    """Aggregated progress snapshot passed to the progress callback."""
+
+    completed: int
+    succeeded: int
+    failed: int
+
+
+class _Resolved:
+    """A row that needs no lookup; its result is taken when the row's turn comes."""
+
+    __slots__ = ("index", "resolve")
+
+    def __init__(self, index: int, resolve: Callable[[], SearchResult]):
+        self.index = index
+        self.resolve = resolve
+
+    def result(self) -> BulkResult:
+        record = self.resolve()
+        return BulkResult(self.index, record.isbn, record, searched=False)
+
+    def cancel(self):
+        pass
+
+
+class BulkSearchEngine:
+    """Runs ``search_fn`` over many ISBNs on a thread pool.
+
+    Results are yielded in input order. At most ``max_pending`` lookups are
+    in flight at a time, so the input iterable is consumed lazily and a slow
+    lookup holds back submission instead of letting work pile up in memory.
+
+    An input item may also be a callable returning the row's
+    ``SearchResult`` (a duplicate or a catalogued book, say): it is not
+    searched but keeps its place in the output, and it is called on the
+    consuming thread when that place comes up, so it can read results of
+    earlier rows. Such rows take no lookup slot, but at most
+    ``max_buffered`` rows of either kind are held at once, so a long run of
+    them behind one slow lookup stops reading instead of piling up.
+
+    Progress (lookups only) is reported through ``progress_callback`` at
+    most once every ``progress_interval`` seconds, plus a final report when
+    the run ends.
+    """
+
+    def __init__(
+        self,
+        search_fn: SearchFn,
+        max_workers: int = 2,
+        max_pending: Optional[int] = None,
+        progress_callback: Optional[Callable[[BulkProgress], None]] = None,
+        progress_interval: float = 0.5,
+        max_buffered: Optional[int] = None,
+    ):
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        self.search_fn = search_fn
+        self.max_workers = max_workers
+        self.max_pending = max(max_pending or max_workers * 2, max_workers)
+        self.max_buffered = max(max_buffered or DEFAULT_MAX_BUFFERED, self.max_pending)
+        self.progress_callback = progress_callback
+        self.progress_interval = progress_interval
+        self._cancel_event = threading.Event()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+
+    def cancel(self):
+        """Stops submitting new lookups; in-flight ones are abandoned."""
+        self._cancel_event.set()
+
+    def _search_one(self, index: int, isbn: str) -> BulkResult:
+        if self._cancel_event.is_set():
+            return BulkResult(index, isbn, SearchResult.not_found(isbn, "İptal edildi"))
+        try:
+            record = self.search_fn(isbn)
+        except Exception as e:
+            record = SearchResult.not_found(isbn, f"Hata: {e}")
+        return BulkResult(index, isbn, record)
+
+    def run(self, items: Iterable[BulkItem]) -> Iterator[BulkResult]:
+        """Yields a ``BulkResult`` per item, in the order they were given."""
+        self._cancel_event.clear()
+        completed = succeeded = failed = 0
+        last_report = time.monotonic()
+        pending = deque()
+        in_flight = 0
+        source = enumerate(items)
+        held = None  # An ISBN read while every lookup slot was taken
+
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="bulk-search")
+        try:
+            exhausted = False
+            while True:
+                # Keep the in-flight window full
+                while not self._cancel_event.is_set():
+                    if held is None:
+                        if exhausted or len(pending) >= self.max_buffered:
+                            break
+                        try:
+                            held = next(source)
+                        except StopIteration:
+                            exhausted = True
+                            break
+                    index, item = held
+                    if callable(item):
+                        pending.append(_Resolved(index, item))
+                    elif in_flight < self.max_pending:
+                        pending.append(executor.submit(self._search_one, index, item))
+                        in_flight += 1
+                    else:
+                        break
+                    held = None
+
+                if not pending or self._cancel_event.is_set():
+                    break
+
+                head = pending.popleft()
+                result = head.result()
+                if self._cancel_event.is_set():
+                    break
+                if not result.searched:
+                    yield result
+                    continue
+                in_flight -= 1
+                completed += 1
+                if result.record.found:
+                    succeeded += 1
+                else:
+                    failed += 1
+
+                now = time.monotonic()
+                if self.progress_callback and now - last_report >= self.progress_interval:
+                    last_report = now
+                    self.progress_callback(BulkProgress(completed, succeeded, failed))
+
+                yield result
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=False, cancel_futures=True)
+            if self.progress_callback:
+                self.progress_callback(BulkProgress(completed, succeeded, failed))
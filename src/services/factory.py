@@ -0,0 +1,136 @@
+"""Builds the search stack shared by the desktop app and the command line."""
+
+from typing import Optional
+
+from src.services.rate_limit import RateLimitPolicy
+
+# Driver pool bounds; bulk search uses one worker per possible driver
+DRIVER_POOL_MIN_SIZE = 1
+DRIVER_POOL_SIZE = 4
+# A driver is recycled after this many pages or once it uses this much memory
+DRIVER_MAX_PAGES = 200
+DRIVER_MAX_RSS_MB = 1024
+# Bulk runs take catalogued books younger than this as they are; older ones are searched again
+CATALOG_MAX_AGE = 90 * 24 * 3600
+
+# Sites that throttle or show captchas are paced more gently
+SITE_RATE_LIMITS = {
+    "D&R": RateLimitPolicy(rate=1.0, burst=2, max_concurrency=2),
+    "Kitapsec": RateLimitPolicy(rate=1.0, burst=2, max_concurrency=2),
+}
+
+
+def get_scrapers():
+    """Returns ``[(site_name, scraper_cls), ...]`` in sequential search order.
+
+    Imported on demand because the Selenium based scrapers are slow to load.
+    """
+    from src.scrapers.sites.babil import BabilScraper
+    from src.scrapers.sites.bkmkitap import BKMKitapScraper
+    from src.scrapers.sites.dr import DRScraper
+    from src.scrapers.sites.kitapsec import KitapsecScraper
+
+    return [
+        ("Babil", BabilScraper),
+        ("D&R", DRScraper),
+        ("Kitapsec", KitapsecScraper),
+        ("BKM Kitap", BKMKitapScraper),
+    ]
+
+
+def load_app_config():
+    """Loads the configuration, falling back to the defaults if that fails."""
+    from src.config_loader import load_config
+
+    try:
+        return load_config()
+    except Exception:
+        from src.config_model import AppConfig
+
+        return AppConfig()
+
+
+class SearchStack:
+    """The cache, catalog, site ranker, driver pool and search service, closed together."""
+
+    def __init__(self, config, cache, driver_pool, search_service, catalog, site_ranker=None):
+        self.config = config
+        self.cache = cache
+        self.catalog = catalog
+        self.site_ranker = site_ranker
+        self.driver_pool = driver_pool
+        self.search_service = search_service
+
+    def close(self):
+        self.search_service.close()
+        self.driver_pool.close()
+        self.cache.close()
+        self.catalog.close()
+        if self.site_ranker is not None:
+            self.site_ranker.close()
+
+
+def build_search_stack(
+    config=None,
+    warm_up: bool = True,
+    pool_size: int = DRIVER_POOL_SIZE,
+    adaptive_order: bool = True,
+    concurrent_searches: Optional[int] = None,
+    processes: Optional[int] = None,
+    trace_drivers: Optional[bool] = None,
+) -> SearchStack:
+    """Wires up ``MultiSiteSearchService`` with its cache, catalog, pool, static scrapers and governors.
+
+    ``pool_size`` caps the driver pool; worker processes each get a slice of it.
+    ``concurrent_searches`` is how many searches may run at once (bulk
+    workers; default: ``pool_size``), which sizes the race-mode executor.
+    With ``adaptive_order`` the sites are tried in the order a ``SiteRanker``
+    learns (persisted in the data dir) instead of ``get_scrapers`` order.
+
+    ``processes`` is set when the stack serves one of that many worker
+    processes: its governors get ``1 / processes`` of each site's rate
+    and concurrency, and its ranker only reads the saved statistics and
+    forwards what it learns to the parent (see ``ProcessSearchPool``).
+
+    ``trace_drivers`` starts event-firing drivers that time page loads and
+    element lookups (default: only when ``ISBN_SEARCH_PROFILE`` is set).
+    """
+    from src.scrapers.static_sites import build_static_scrapers
+    from src.services.multi_site_search import MultiSiteSearchService
+    from src.services.rate_limit import build_site_governors
+    from src.services.site_ranking import SiteRanker
+    from src.utils.catalog import BookCatalog
+    from src.utils.paths import get_data_path
+    from src.utils.profiling import profiling_requested
+    from src.utils.result_cache import PersistentResultCache
+    from src.webdriver.elastic_pool import ElasticDriverPool
+
+    config = config or load_app_config()
+    scrapers = get_scrapers()
+    cache = PersistentResultCache(get_data_path("result_cache.sqlite3"))
+    catalog = BookCatalog(get_data_path("catalog.sqlite3"))
+    site_names = [name for name, _ in scrapers]
+    site_ranker = None
+    if adaptive_order:
+        site_ranker = SiteRanker(site_names, get_data_path("site_stats.json"), forward=processes is not None)
+    driver_pool = ElasticDriverPool(
+        min_size=min(DRIVER_POOL_MIN_SIZE, pool_size),
+        max_size=pool_size,
+        headless=True,
+        max_pages=DRIVER_MAX_PAGES,
+        max_rss_mb=DRIVER_MAX_RSS_MB,
+        trace=profiling_requested() if trace_drivers is None else trace_drivers,
+    )
+    if warm_up:
+        driver_pool.warm_up()
+    search_service = MultiSiteSearchService(
+        scrapers,
+        driver_pool,
+        concurrent_searches=concurrent_searches or pool_size,
+        cache=cache,
+        static_scrapers=build_static_scrapers(),
+        governors=build_site_governors(site_names, SITE_RATE_LIMITS, processes or 1),
+        catalog=catalog,
+        ranker=site_ranker,
+    )
+    return SearchStack(config, cache, driver_pool, search_service, catalog, site_ranker)
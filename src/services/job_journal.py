@@ -0,0 +1,101 @@
+"""Append-only checkpoint journal for resumable bulk jobs."""
+
+import hashlib
+import json
+import os
+from typing import Iterator, Optional
+
+from src.result_model import SearchResult
+from src.utils.paths import get_data_dir
+
+
+def file_sha256(path: str, block_size: int = 1024 * 1024) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class JobJournal:
+    """JSONL log of the lookups a bulk job has completed, in input order.
+
+    One journal exists per input file, named after the file's SHA-256, so
+    running the same spreadsheet again finds the previous, unfinished job.
+    Entries are appended and flushed one by one; a line cut short by a crash
+    is dropped when the journal is reopened. Because the bulk engine yields
+    results in input order, the journal is always a prefix of the job and
+    can be replayed without holding it in memory.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.completed = 0
+        self._file = None
+        self._recover()
+
+    @classmethod
+    def for_input(cls, input_path: str, directory: Optional[str] = None) -> "JobJournal":
+        directory = directory or os.path.join(get_data_dir(), "jobs")
+        os.makedirs(directory, exist_ok=True)
+        return cls(os.path.join(directory, f"{file_sha256(input_path)}.jsonl"))
+
+    def _recover(self):
+        """Counts the intact entries and cuts off a partially written last line."""
+        if not os.path.exists(self.path):
+            return
+        valid_bytes = 0
+        with open(self.path, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    json.loads(line)
+                except ValueError:
+                    break
+                valid_bytes += len(line)
+                self.completed += 1
+        if valid_bytes != os.path.getsize(self.path):
+            with open(self.path, "r+b") as f:
+                f.truncate(valid_bytes)
+
+    def replay(self) -> Iterator[SearchResult]:
+        """Yields the journaled results in the order they were recorded."""
+        if not self.completed:
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            for _, line in zip(range(self.completed), f):
+                yield SearchResult.from_dict(json.loads(line))
+
+    def truncate(self, count: int):
+        """Keeps only the first ``count`` entries."""
+        self._close_file()
+        kept_bytes = 0
+        with open(self.path, "rb") as f:
+            for _, line in zip(range(count), f):
+                kept_bytes += len(line)
+        with open(self.path, "r+b") as f:
+            f.truncate(kept_bytes)
+        self.completed = min(count, self.completed)
+
+    def record(self, result: SearchResult):
+        if self._file is None:
+            self._file = open(self.path, "a", encoding="utf-8")
+        self._file.write(json.dumps(result.to_dict(), ensure_ascii=False) + "\n")
+        self._file.flush()
+        self.completed += 1
+
+    def _close_file(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def close(self):
+        self._close_file()
+
+    def discard(self):
+        """Deletes the journal once its job has finished."""
+        self._close_file()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        self.completed = 0
@@ -0,0 +1,333 @@
+"""Multi-site ISBN search with sequential and racing strategies."""
+
+import threading
+import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterable, Optional, Tuple, Type
+
+from src.result_model import SearchResult
+from src.scrapers.http_fetch import HttpFetchError
+from src.services.rate_limit import SiteUnavailable, SlotCancelled
+from src.utils.telemetry import site_context, telemetry
+
+NOT_FOUND_MESSAGE = "ISBN hiçbir sitede bulunamadı"
+SITES_UNAVAILABLE_MESSAGE = "Siteler geçici olarak devre dışı, daha sonra tekrar deneyin"
+# Longest single sleep of a lookup waiting for a site's circuit to close
+UNAVAILABLE_POLL_INTERVAL = 1.0
+
+
+class SearchMode:
+    """Available strategies for ``MultiSiteSearchService.search_first``."""
+
+    SEQUENTIAL = "sequential"  # Registration order, stop at the first hit
+    RACE = "race"  # Query every site in parallel, take the first hit
+
+    ALL = (SEQUENTIAL, RACE)
+
+
+def single_site_service(site_name: str, scraper_cls: Type, driver_pool):
+    """Default ``service_factory``: an ``ISBNSearchService`` over a one-site registry.
+
+    Imported on demand, like the Selenium scrapers it drives, so that the
+    service can be built without them when another factory is given.
+    """
+    from src.scrapers.registry import ScraperRegistry
+    from src.services.isbn_search_service import ISBNSearchService
+
+    registry = ScraperRegistry()
+    registry.register(site_name, scraper_cls)
+    return ISBNSearchService(registry, driver_pool)
+
+
+class MultiSiteSearchService:
+    """Searches a set of sites either one after another or all at once.
+
+    Every site gets its own single-entry ``ISBNSearchService`` so that the
+    sites can be queried independently while sharing one ``DriverPool``.
+    In race mode the first valid hit wins; sites that have not started yet
+    are cancelled, the ones still waiting for a rate-limit slot give up
+    without taking a driver, and the ones already loading a page finish in
+    the background and hand their driver back to the pool as usual. The
+    race executor has a thread per site for each of ``concurrent_searches``
+    callers (e.g. bulk workers), so simultaneous races do not queue behind
+    each other's losers.
+
+    When a ``cache`` (see ``PersistentResultCache``) is given, a fresh cached
+    hit is returned without touching any site, and sites with a fresh cached
+    miss are skipped. Every completed site lookup is written back to it.
+
+    Sites listed in ``static_scrapers`` (see ``build_static_scrapers``) are
+    first tried over plain HTTP; the browser is used whenever the static
+    tier does not yield the book, including when its request fails (a bot
+    wall answering plain clients with 403, a timeout, a 5xx).
+    ``fetch_tier_stats`` reports per site how often that fast path was
+    enough.
+
+    ``governors`` (see ``build_site_governors``) pace each site with a token
+    bucket and an AIMD concurrency limit; a site whose circuit breaker has
+    opened after repeated errors is left out of the rotation until its
+    cool-down ends. Only browser-tier failures and explicit throttling
+    (HTTP 429 or a ``Retry-After`` header) count as errors there. When every
+    site is out, a lookup fails with ``SITES_UNAVAILABLE_MESSAGE`` at once,
+    unless it is made with ``wait_for_sites`` (bulk runs, which must not
+    record thousands of misses in a few seconds): then it waits for the
+    first cool-down to end, or for ``close``.
+
+    With a ``ranker`` (see ``SiteRanker``) the sites are tried in the order
+    that minimizes the expected time to a hit for the ISBN at hand, learned
+    from every completed site lookup, instead of registration order.
+
+    Every found book is also added to ``catalog`` (see ``BookCatalog``), the
+    long-lived index that bulk runs and offline title/author search read.
+
+    Every stage of a lookup is timed into ``src.utils.telemetry``, labelled
+    with the site it ran for. The governors are fed only the site's own
+    response time per tier: the static request, or the browser lookup minus
+    the wait for a driver (read from the pool's ``thread_wait_total`` when
+    it has one).
+
+    ``service_factory(site_name, scraper_cls, driver_pool)`` builds the
+    browser-tier service of each site; anything with a ``search_first(isbn)
+    -> (ok, site, message)`` method will do (the benchmarks plug in mock
+    sites this way).
+    """
+
+    def __init__(
+        self,
+        sites: Iterable[Tuple[str, Type]],
+        driver_pool,
+        mode: str = SearchMode.SEQUENTIAL,
+        max_workers: Optional[int] = None,
+        concurrent_searches: int = 1,
+        cache=None,
+        static_scrapers: Optional[Dict[str, object]] = None,
+        governors: Optional[Dict[str, object]] = None,
+        service_factory: Optional[Callable[[str, Type, object], object]] = None,
+        catalog=None,
+        ranker=None,
+    ):
+        if mode not in SearchMode.ALL:
+            raise ValueError(f"Unknown search mode: {mode}")
+        self.mode = mode
+        self.cache = cache
+        self.catalog = catalog
+        self.ranker = ranker
+        self._driver_wait = getattr(driver_pool, "thread_wait_total", None)
+        self.static_scrapers = dict(static_scrapers or {})
+        self.governors = dict(governors or {})
+        self._tier_stats = {}
+        self._stats_lock = threading.Lock()
+        self._closing = threading.Event()
+        service_factory = service_factory or single_site_service
+        self.site_services = [
+            (site_name, service_factory(site_name, scraper_cls, driver_pool))
+            for site_name, scraper_cls in sites
+        ]
+        if not self.site_services:
+            raise ValueError("At least one site must be registered")
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or len(self.site_services) * max(concurrent_searches, 1),
+            thread_name_prefix="site-search",
+        )
+
+    @property
+    def site_names(self):
+        return [site_name for site_name, _ in self.site_services]
+
+    def _count(self, site_name: str, key: str):
+        with self._stats_lock:
+            self._tier_stats.setdefault(site_name, Counter())[key] += 1
+
+    def fetch_tier_stats(self) -> Dict[str, Dict[str, float]]:
+        """Returns per-site counters for the HTTP fast path and the browser fallback."""
+        with self._stats_lock:
+            snapshot = {site: Counter(counter) for site, counter in self._tier_stats.items()}
+        stats = {}
+        for site_name, counter in snapshot.items():
+            lookups = counter["static_hits"] + counter["browser_lookups"]
+            stats[site_name] = {
+                "lookups": lookups,
+                "static_hits": counter["static_hits"],
+                "static_errors": counter["static_errors"],
+                "browser_lookups": counter["browser_lookups"],
+                "fast_path_ratio": counter["static_hits"] / lookups if lookups else 0.0,
+            }
+        return stats
+
+    def site_lookup_counts(self) -> Dict[str, int]:
+        """Cumulative number of lookups that reached each site (static or browser)."""
+        return {site_name: stats["lookups"] for site_name, stats in self.fetch_tier_stats().items()}
+
+    def site_health(self) -> Dict[str, dict]:
+        """Returns the rate limiter / circuit breaker state of every governed site."""
+        return {site_name: governor.snapshot() for site_name, governor in self.governors.items()}
+
+    def search_first(self, isbn: str, mode: Optional[str] = None, wait_for_sites: bool = False) -> SearchResult:
+        """Returns the ``SearchResult`` of the first site that finds the ISBN."""
+        mode = mode or self.mode
+        if mode not in SearchMode.ALL:
+            raise ValueError(f"Unknown search mode: {mode}")
+
+        started = time.monotonic()
+        isbn = isbn.replace("-", "").replace(" ", "")
+        result = self._search(isbn, mode, wait_for_sites)
+        result.elapsed = time.monotonic() - started
+        site = result.site or ""
+        telemetry.observe("lookup", result.elapsed, site=site)
+        telemetry.count("found" if result.found else "not_found", site=site)
+        if self.catalog is not None and result.found and not result.cached:
+            self.catalog.put(isbn, result)
+        return result
+
+    def _search(self, isbn: str, mode: str, wait_for_sites: bool) -> SearchResult:
+        site_services = self.site_services
+        if self.cache is not None:
+            with telemetry.stage("cache_get", site=""):
+                cached = self.cache.get(isbn)
+            for site_name, _ in site_services:
+                result = cached.get(site_name)
+                if result is not None and result.found:
+                    telemetry.count("cache_hit", site=site_name)
+                    return result
+            for site_name, _ in site_services:
+                telemetry.count("cache_negative_hit" if site_name in cached else "cache_miss", site=site_name)
+            site_services = [(name, service) for name, service in site_services if name not in cached]
+            if not site_services:
+                return SearchResult.not_found(isbn, NOT_FOUND_MESSAGE)
+
+        if self.governors:
+            site_services = self._available_sites(site_services, wait_for_sites)
+            if not site_services:
+                return SearchResult.not_found(isbn, SITES_UNAVAILABLE_MESSAGE)
+
+        if self.ranker is not None and len(site_services) > 1:
+            services = dict(site_services)
+            site_services = [(name, services[name]) for name in self.ranker.rank(isbn, list(services))]
+
+        if mode == SearchMode.RACE:
+            return self._search_race(isbn, site_services)
+        return self._search_sequential(isbn, site_services)
+
+    def _available_sites(self, site_services, wait: bool):
+        """The sites whose circuit is not open; with ``wait``, waits until there is one."""
+        while True:
+            available = [
+                (name, service) for name, service in site_services
+                if name not in self.governors or self.governors[name].available()
+            ]
+            if available or not wait:
+                return available
+            delay = min(self.governors[name].breaker.reopens_in() for name, _ in site_services)
+            with telemetry.stage("sites_unavailable_wait", site=""):
+                if self._closing.wait(min(max(delay, 0.05), UNAVAILABLE_POLL_INTERVAL)):
+                    return []
+
+    def _search_site(
+        self, site_name: str, service, isbn: str, cancel_event: Optional[threading.Event] = None
+    ) -> SearchResult:
+        if cancel_event is not None and cancel_event.is_set():
+            return SearchResult.not_found(isbn, "")
+        governor = self.governors.get(site_name)
+        with site_context(site_name):
+            if governor is None:
+                outcome = {}
+                started = time.monotonic()
+                result = self._lookup_site(site_name, service, isbn, cancel_event, outcome)
+                elapsed = time.monotonic() - started
+            else:
+                try:
+                    with governor.slot(cancel_event) as outcome:
+                        # Timed after the rate-limit wait, which reflects our own load rather than the site
+                        started = time.monotonic()
+                        result = self._lookup_site(site_name, service, isbn, cancel_event, outcome)
+                        elapsed = time.monotonic() - started
+                except SiteUnavailable:
+                    telemetry.count("circuit_open")
+                    return SearchResult.not_found(isbn, f"{site_name} geçici olarak devre dışı")
+                except SlotCancelled:
+                    return SearchResult.not_found(isbn, "")
+        if self.ranker is not None and not outcome.get("cancelled"):
+            self.ranker.observe(site_name, isbn, result.found, outcome.get("error", False), elapsed)
+        return result
+
+    def _lookup_site(self, site_name: str, service, isbn: str, cancel_event, outcome: dict) -> SearchResult:
+        """Static fetch first, then the browser; flags ``outcome['error']`` on throttling and browser failures.
+
+        ``outcome['cancelled']`` is set when a race was decided before the site answered.
+        """
+        if cancel_event is not None and cancel_event.is_set():
+            outcome["cancelled"] = True
+            return SearchResult.not_found(isbn, "")
+
+        static_scraper = self.static_scrapers.get(site_name)
+        if static_scraper is not None:
+            started = time.monotonic()
+            try:
+                result = static_scraper.search(isbn)
+                outcome["latency"], outcome["tier"] = time.monotonic() - started, "static"
+            except HttpFetchError as e:
+                result = None
+                self._count(site_name, "static_errors")
+                if e.throttled:
+                    # The site asked us to back off; the browser still gets its turn
+                    outcome["error"] = True
+            except Exception:
+                result = None
+                self._count(site_name, "static_errors")
+            if result is not None:
+                self._count(site_name, "static_hits")
+                if self.cache is not None:
+                    self.cache.put(isbn, site_name, result)
+                return result
+            if cancel_event is not None and cancel_event.is_set():
+                outcome["cancelled"] = True
+                return SearchResult.not_found(isbn, "")
+
+        self._count(site_name, "browser_lookups")
+        waited_before = self._driver_wait() if self._driver_wait else 0.0
+        started = time.monotonic()
+        try:
+            with telemetry.stage("browser_lookup"):
+                ok, found_site, message = service.search_first(isbn)
+        except Exception as e:
+            outcome["error"] = True
+            return SearchResult.not_found(isbn, f"Hata: {e}")
+        finally:
+            waited = self._driver_wait() - waited_before if self._driver_wait else 0.0
+            outcome["latency"], outcome["tier"] = max(time.monotonic() - started - waited, 0.0), "browser"
+        result = SearchResult.from_message(isbn, ok, found_site or site_name, message)
+        if self.cache is not None:
+            self.cache.put(isbn, site_name, result)
+        return result
+
+    def _search_sequential(self, isbn: str, site_services) -> SearchResult:
+        for site_name, service in site_services:
+            result = self._search_site(site_name, service, isbn)
+            if result.found:
+                return result
+        return SearchResult.not_found(isbn, NOT_FOUND_MESSAGE)
+
+    def _search_race(self, isbn: str, site_services):
+        cancel_event = threading.Event()
+        pending = {
+            self._executor.submit(self._search_site, site_name, service, isbn, cancel_event)
+            for site_name, service in site_services
+        }
+        try:
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    result = future.result()
+                    if result.found:
+                        return result
+            return SearchResult.not_found(isbn, NOT_FOUND_MESSAGE)
+        finally:
+            # Losers that have not started are dropped; running ones release their driver on exit
+            cancel_event.set()
+            for future in pending:
+                future.cancel()
+
+    def close(self):
+        self._closing.set()
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,404 @@
+"""Runs lookups in worker processes, each with its own drivers and scrapers."""
+
+import itertools
+import logging
+import multiprocessing
+import os
+import signal
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from multiprocessing.connection import wait
+from typing import Callable, Dict, Optional
+
+from src.result_model import SearchResult
+from src.services.multi_site_search import SearchMode
+from src.services.site_ranking import SiteRanker
+from src.utils.telemetry import telemetry
+
+# Lookups (and drivers) per worker process
+WORKER_THREADS = 2
+DEFAULT_MAX_PROCESSES = 8
+# A lookup running longer than this is taken for a wedged browser and its worker is killed
+TASK_TIMEOUT = 180.0
+# Times a lookup is handed to a worker before it is given up as crashing them
+MAX_ATTEMPTS = 3
+# Consecutive workers that die before they are ready before the pool gives up
+MAX_STARTUP_FAILURES = 3
+TELEMETRY_FLUSH_INTERVAL = 1.0
+SHUTDOWN_TIMEOUT = 30.0
+_POLL_INTERVAL = 0.5
+
+_READY, _RESULT, _STATS = "ready", "result", "stats"
+
+logger = logging.getLogger(__name__)
+
+
+def default_process_count() -> int:
+    """One worker per core, up to ``DEFAULT_MAX_PROCESSES``."""
+    return max(1, min(os.cpu_count() or 1, DEFAULT_MAX_PROCESSES))
+
+
+def build_worker_stack(
+    threads: int, processes: int, adaptive_order: bool = True, trace_drivers: Optional[bool] = None
+):
+    """Default ``stack_factory``: the app's search stack with a ``threads``-driver pool.
+
+    Its site governors get a ``1 / processes`` share of each site's budget.
+    """
+    from src.services.factory import build_search_stack
+
+    return build_search_stack(
+        pool_size=threads, adaptive_order=adaptive_order, processes=processes, trace_drivers=trace_drivers
+    )
+
+
+def _worker_main(worker_id: int, stack_factory: Callable, threads: int, processes: int, inbox, results):
+    """Entry point of a worker process: serves lookups from ``inbox`` until it reads ``None``."""
+    # Ctrl+C reaches the whole process group; the parent decides when workers stop
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    pid = os.getpid()
+    send_lock = threading.Lock()
+    last_flush = time.monotonic()
+
+    def send(message):
+        with send_lock:
+            results.send(message)
+
+    stack = stack_factory(threads, processes)
+    service = stack.search_service
+    ranker = getattr(stack, "site_ranker", None)
+    send((_READY, worker_id, pid, None, None, None, None, None))
+
+    def observations():
+        return ranker.drain() if ranker is not None else None
+
+    def lookup(task_id, isbn, mode, wait_for_sites):
+        nonlocal last_flush
+        try:
+            result = service.search_first(isbn, mode=mode, wait_for_sites=wait_for_sites)
+        except Exception as e:
+            result = SearchResult.not_found(isbn, f"Hata: {e}")
+        state = counts = observed = None
+        with send_lock:
+            now = time.monotonic()
+            if now - last_flush >= TELEMETRY_FLUSH_INTERVAL:
+                last_flush = now
+                state, counts, observed = telemetry.drain(), service.site_lookup_counts(), observations()
+        send((_RESULT, worker_id, pid, task_id, result.to_dict(), state, counts, observed))
+
+    executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="process-search")
+    try:
+        while True:
+            task = inbox.get()
+            if task is None:
+                break
+            executor.submit(lookup, *task)
+    finally:
+        executor.shutdown(wait=True)
+        send((_STATS, worker_id, pid, None, None, telemetry.drain(), service.site_lookup_counts(), observations()))
+        stack.close()
+        results.close()
+
+
+class _Task:
+    __slots__ = ("task_id", "isbn", "mode", "wait_for_sites", "future", "attempts", "started", "worker")
+
+    def __init__(self, task_id: int, isbn: str, mode: str, wait_for_sites: bool, future: Future):
+        self.task_id = task_id
+        self.isbn = isbn
+        self.mode = mode
+        self.wait_for_sites = wait_for_sites
+        self.future = future
+        self.attempts = 0
+        self.started = 0.0
+        self.worker = None
+
+
+class _Worker:
+    __slots__ = ("worker_id", "process", "inbox", "results", "tasks", "ready")
+
+    def __init__(self, worker_id: int, process, inbox, results):
+        self.worker_id = worker_id
+        self.process = process
+        self.inbox = inbox
+        self.results = results
+        self.tasks: Dict[int, _Task] = {}
+        self.ready = False
+
+
+class ProcessSearchPool:
+    """Spreads lookups over ``processes`` worker processes.
+
+    Every worker builds its own search stack through
+    ``stack_factory(threads, processes)`` (by default the app's, with a
+    ``threads``-driver slice of the pool and a ``1 / processes`` share of
+    each site's rate limit, as the workers pace the sites separately) and
+    runs up to ``threads`` lookups at once, so HTML parsing runs on as many
+    cores as there are workers and a crashed or hung chromedriver only takes
+    its own worker down. Lookups go to the least busy worker over its own
+    queue; results stream back over a pipe per worker (a worker killed
+    mid-write cannot wedge the others, as it could on a shared queue's
+    lock), where a collector thread resolves the caller's ``Future``.
+
+    The collector also watches the workers: one that exits, or whose lookup
+    has run longer than ``task_timeout``, is killed and replaced, and its
+    unfinished lookups are handed out again (each at most ``max_attempts``
+    times). Workers ship their telemetry and per-site lookup counts back, so
+    ``src.utils.telemetry`` and ``site_lookup_counts`` cover them too, and
+    their ``SiteRanker`` observations, which are merged into ``site_ranker``
+    (the parent's, the only one that saves) when one is given.
+
+    ``search_first(isbn, mode, wait_for_sites)`` blocks like ``MultiSiteSearchService``'s,
+    so the pool drops into ``BulkSearchEngine`` unchanged; give the engine
+    ``processes * threads`` workers to keep every slot busy. Workers are
+    started with the ``spawn`` method, which is safe next to the threads and
+    browsers of the parent and works the same on Windows.
+    """
+
+    def __init__(
+        self,
+        processes: Optional[int] = None,
+        threads: int = WORKER_THREADS,
+        stack_factory: Optional[Callable] = None,
+        mode: str = SearchMode.SEQUENTIAL,
+        task_timeout: float = TASK_TIMEOUT,
+        max_attempts: int = MAX_ATTEMPTS,
+        site_ranker: Optional[SiteRanker] = None,
+    ):
+        if mode not in SearchMode.ALL:
+            raise ValueError(f"Unknown search mode: {mode}")
+        self.processes = processes or default_process_count()
+        self.threads = threads
+        self.stack_factory = stack_factory or build_worker_stack
+        self.mode = mode
+        self.task_timeout = task_timeout
+        self.max_attempts = max_attempts
+        self.site_ranker = site_ranker
+        self.restarts = 0
+
+        self._context = multiprocessing.get_context("spawn")
+        self._lock = threading.Lock()
+        self._ids = itertools.count()
+        self._tasks: Dict[int, _Task] = {}
+        self._backlog = deque()
+        # Cumulative lookup counts of every worker process, by pid
+        self._site_counts: Dict[int, Dict[str, int]] = {}
+        self._startup_failures = 0
+        self._broken = None
+        self._closed = False
+        self._closed_at = 0.0
+        self._workers = [self._start_worker(worker_id) for worker_id in range(self.processes)]
+        self._collector = threading.Thread(target=self._collect, name="process-pool-collector", daemon=True)
+        self._collector.start()
+
+    @property
+    def capacity(self) -> int:
+        """Lookups the pool runs at once."""
+        return self.processes * self.threads
+
+    def _start_worker(self, worker_id: int) -> _Worker:
+        inbox = self._context.Queue()
+        results, worker_end = self._context.Pipe(duplex=False)
+        process = self._context.Process(
+            target=_worker_main,
+            args=(worker_id, self.stack_factory, self.threads, self.processes, inbox, worker_end),
+            name=f"isbn-search-worker-{worker_id}",
+            daemon=True,
+        )
+        process.start()
+        # Only the worker may hold the write end, so its exit shows up here as EOF
+        worker_end.close()
+        return _Worker(worker_id, process, inbox, results)
+
+    # -- public ------------------------------------------------------------
+
+    def submit(self, isbn: str, mode: Optional[str] = None, wait_for_sites: bool = False) -> Future:
+        """Queues a lookup; the ``Future`` resolves to its ``SearchResult``."""
+        mode = mode or self.mode
+        if mode not in SearchMode.ALL:
+            raise ValueError(f"Unknown search mode: {mode}")
+        future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Process pool is closed")
+            if self._broken:
+                future.set_result(SearchResult.not_found(isbn, self._broken))
+                return future
+            task = _Task(next(self._ids), isbn, mode, wait_for_sites, future)
+            self._tasks[task.task_id] = task
+            self._backlog.append(task)
+            self._dispatch()
+        return future
+
+    def search_first(self, isbn: str, mode: Optional[str] = None, wait_for_sites: bool = False) -> SearchResult:
+        """Looks ``isbn`` up in a worker process and waits for the result."""
+        return self.submit(isbn, mode, wait_for_sites).result()
+
+    def site_lookup_counts(self) -> Dict[str, int]:
+        """Lookups that reached each site, summed over all workers (reported about once a second)."""
+        totals = {}
+        with self._lock:
+            for counts in self._site_counts.values():
+                for site_name, lookups in counts.items():
+                    totals[site_name] = totals.get(site_name, 0) + lookups
+        return totals
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "processes": self.processes,
+                "threads": self.threads,
+                "alive": sum(worker.process.is_alive() for worker in self._workers),
+                "restarts": self.restarts,
+                "in_flight": sum(len(worker.tasks) for worker in self._workers),
+                "queued": len(self._backlog),
+            }
+
+    def close(self):
+        """Lets the workers finish their lookups and stop; queued lookups are dropped."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._closed_at = time.monotonic()
+            while self._backlog:
+                self._finish(self._backlog.popleft(), SearchResult.not_found("", "İptal edildi"))
+            for worker in self._workers:
+                if worker.process.is_alive():
+                    worker.inbox.put(None)
+        self._collector.join()
+        for worker in self._workers:
+            worker.process.join(timeout=1)
+            worker.results.close()
+
+    # -- collector thread --------------------------------------------------
+
+    def _finish(self, task: _Task, result: SearchResult):
+        self._tasks.pop(task.task_id, None)
+        if task.worker is not None:
+            task.worker.tasks.pop(task.task_id, None)
+            task.worker = None
+        if not result.isbn:
+            result.isbn = task.isbn
+        if not task.future.done():
+            task.future.set_result(result)
+
+    def _dispatch(self):
+        """Hands queued lookups to the least busy ready workers (lock held)."""
+        while self._backlog:
+            candidates = [
+                worker for worker in self._workers
+                if worker.ready and len(worker.tasks) < self.threads and worker.process.is_alive()
+            ]
+            if not candidates:
+                return
+            worker = min(candidates, key=lambda candidate: len(candidate.tasks))
+            task = self._backlog.popleft()
+            if task.future.done():
+                continue
+            task.attempts += 1
+            task.started = time.monotonic()
+            task.worker = worker
+            worker.tasks[task.task_id] = task
+            worker.inbox.put((task.task_id, task.isbn, task.mode, task.wait_for_sites))
+
+    def _handle(self, message):
+        kind, worker_id, pid, task_id, payload, state, counts, observations = message
+        if state is not None:
+            telemetry.merge(state)
+        if counts is not None:
+            self._site_counts[pid] = counts
+        if observations and self.site_ranker is not None:
+            self.site_ranker.merge(observations)
+        if kind == _READY:
+            worker = self._workers[worker_id]
+            if worker.process.pid == pid:
+                self._startup_failures = 0
+                worker.ready = True
+        elif kind == _RESULT:
+            task = self._tasks.get(task_id)
+            # A lookup handed out again after its worker died may still report from the old one
+            if task is not None:
+                self._finish(task, SearchResult.from_dict(payload))
+
+    def _restart(self, index: int, reason: str):
+        worker = self._workers[index]
+        logger.warning("Search worker %s (pid %s) %s; restarting", worker.worker_id, worker.process.pid, reason)
+        self.restarts += 1
+        telemetry.count("worker_restart", site="")
+        if not worker.ready:
+            self._startup_failures += 1
+        worker.inbox.cancel_join_thread()
+        worker.inbox.close()
+        worker.results.close()
+
+        orphans = sorted(worker.tasks.values(), key=lambda task: task.task_id, reverse=True)
+        worker.tasks.clear()
+        if self._startup_failures >= MAX_STARTUP_FAILURES:
+            self._broken = f"Arama süreçleri başlatılamadı ({reason})"
+            for task in orphans + list(self._backlog):
+                self._finish(task, SearchResult.not_found(task.isbn, self._broken))
+            self._backlog.clear()
+            return
+        for task in orphans:
+            task.worker = None
+            if task.attempts >= self.max_attempts:
+                self._finish(task, SearchResult.not_found(task.isbn, f"Arama süreci çöktü ({reason})"))
+            else:
+                self._backlog.appendleft(task)
+        self._workers[index] = self._start_worker(worker.worker_id)
+
+    def _check_workers(self):
+        """Replaces dead or wedged workers (lock held)."""
+        if self._broken:
+            return
+        now = time.monotonic()
+        for index, worker in enumerate(self._workers):
+            if worker.process.is_alive():
+                if not any(now - task.started > self.task_timeout for task in worker.tasks.values()):
+                    continue
+                worker.process.kill()
+                worker.process.join(timeout=5)
+                self._restart(index, f"{self.task_timeout:.0f} sn içinde yanıt vermedi")
+            else:
+                self._restart(index, f"beklenmedik şekilde kapandı (çıkış kodu {worker.process.exitcode})")
+            if self._broken:
+                return
+
+    def _shutdown_step(self) -> bool:
+        """Once closed: True when every worker has exited, killing stragglers after the timeout."""
+        if time.monotonic() - self._closed_at > SHUTDOWN_TIMEOUT:
+            for worker in self._workers:
+                if worker.process.is_alive():
+                    worker.process.kill()
+        if any(worker.process.is_alive() for worker in self._workers):
+            return False
+        for worker in self._workers:
+            for task in list(worker.tasks.values()):
+                self._finish(task, SearchResult.not_found(task.isbn, "İptal edildi"))
+        return True
+
+    def _collect(self):
+        while True:
+            with self._lock:
+                connections = [worker.results for worker in self._workers if not worker.results.closed]
+            messages = []
+            if not connections:
+                time.sleep(_POLL_INTERVAL)
+            for connection in wait(connections, timeout=_POLL_INTERVAL) if connections else ():
+                try:
+                    messages.append(connection.recv())
+                except (EOFError, OSError):
+                    # The worker exited; its results are all in, the process check does the rest
+                    connection.close()
+            with self._lock:
+                for message in messages:
+                    self._handle(message)
+                if self._closed:
+                    if not messages and self._shutdown_step():
+                        return
+                    continue
+                self._check_workers()
+                self._dispatch()
@@ -0,0 +1,279 @@
+"""Per-site pacing: token bucket, AIMD concurrency and circuit breaking."""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, NamedTuple, Optional
+
+from src.utils.telemetry import telemetry
+
+# How often a cancellable wait re-checks its event
+CANCEL_POLL_INTERVAL = 0.05
+
+
+class SiteUnavailable(Exception):
+    """Raised by ``SiteGovernor.slot`` while the site's circuit is open."""
+
+
+class SlotCancelled(Exception):
+    """Raised by ``SiteGovernor.slot`` when its ``cancel_event`` is set while waiting."""
+
+
+class RateLimitPolicy(NamedTuple):
+    """Tuning knobs for one site's ``SiteGovernor``."""
+
+    rate: float = 2.0  # Sustained lookups per second
+    burst: int = 4  # Token bucket capacity
+    min_concurrency: int = 1
+    max_concurrency: int = 4
+    latency_tolerance: float = 2.0  # Slow-down when latency exceeds baseline by this factor
+    failure_threshold: int = 5  # Consecutive failures that open the circuit
+    open_seconds: float = 30.0  # First cool-down; doubles on each re-open
+    max_open_seconds: float = 600.0
+
+    def split(self, processes: int) -> "RateLimitPolicy":
+        """The share of this policy for one of ``processes`` that each pace the site on their own.
+
+        Rate, burst and concurrency are divided evenly; burst and concurrency
+        cannot go below one per process, so with more processes than slots
+        the site sees up to ``processes`` at once.
+        """
+        if processes <= 1:
+            return self
+        max_concurrency = max(1, self.max_concurrency // processes)
+        return self._replace(
+            rate=self.rate / processes,
+            burst=max(1, self.burst // processes),
+            min_concurrency=min(self.min_concurrency, max_concurrency),
+            max_concurrency=max_concurrency,
+        )
+
+
+class TokenBucket:
+    """Classic token bucket; ``acquire`` blocks until a token is available."""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, cancel_event: Optional[threading.Event] = None) -> bool:
+        """Takes a token; returns False without one if ``cancel_event`` is set first."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait = (1 - self._tokens) / self.rate
+            if cancel_event is None:
+                time.sleep(wait)
+            elif cancel_event.wait(wait):
+                return False
+
+
+class AdaptiveConcurrencyLimiter:
+    """AIMD concurrency limit driven by latency and errors.
+
+    Each healthy response grows the limit by ``1 / limit`` (about one slot
+    per round of requests); an error, or a latency above
+    ``latency_tolerance`` times the smoothed baseline, halves it.
+
+    Latencies are compared per ``tier`` (e.g. a static HTTP request versus
+    a browser page load), each against its own baseline, so a normally
+    slower tier is not mistaken for congestion.
+    """
+
+    def __init__(self, min_limit: int, max_limit: int, latency_tolerance: float):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_tolerance = latency_tolerance
+        self.limit = float(min_limit)
+        self.in_flight = 0
+        self.baselines: Dict[str, float] = {}
+        self._cond = threading.Condition()
+
+    def acquire(self, cancel_event: Optional[threading.Event] = None) -> bool:
+        """Takes a slot; returns False without one if ``cancel_event`` is set first."""
+        with self._cond:
+            while self.in_flight >= int(self.limit):
+                if cancel_event is None:
+                    self._cond.wait()
+                elif cancel_event.is_set():
+                    return False
+                else:
+                    self._cond.wait(CANCEL_POLL_INTERVAL)
+            self.in_flight += 1
+            return True
+
+    def release(self, latency: Optional[float], error: bool, tier: str = ""):
+        """Frees a slot; ``latency`` is the site's own response time, ``None`` if no request was sent."""
+        with self._cond:
+            self.in_flight -= 1
+            self._cond.notify_all()
+            if latency is None and not error:
+                return
+            baseline = self.baselines.get(tier)
+            congested = error or (baseline is not None and latency > baseline * self.latency_tolerance)
+            if congested:
+                self.limit = max(self.min_limit, self.limit / 2)
+            else:
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            if not error and latency is not None:
+                self.baselines[tier] = latency if baseline is None else 0.9 * baseline + 0.1 * latency
+
+    def baseline_snapshot(self) -> Dict[str, float]:
+        """Smoothed baseline latency per tier, in seconds."""
+        with self._cond:
+            return {tier or "-": round(latency, 4) for tier, latency in self.baselines.items()}
+
+
+class CircuitBreaker:
+    """Opens after ``failure_threshold`` consecutive failures.
+
+    While open the site is skipped; after the cool-down one probe request is
+    let through (half-open). A failed probe re-opens the circuit with the
+    cool-down doubled, up to ``max_open_seconds``.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, failure_threshold: int, open_seconds: float, max_open_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.base_open_seconds = open_seconds
+        self.max_open_seconds = max_open_seconds
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opens = 0
+        self._open_seconds = open_seconds
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def is_open(self) -> bool:
+        """True while requests would be rejected; unlike ``allow`` it claims no probe."""
+        with self._lock:
+            if self.state == self.OPEN:
+                return time.monotonic() - self._opened_at < self._open_seconds
+            return self.state == self.HALF_OPEN and self._probing
+
+    def reopens_in(self) -> float:
+        """Seconds until an open circuit lets a probe through; 0 once it may."""
+        with self._lock:
+            if self.state != self.OPEN:
+                return 0.0
+            return max(0.0, self._opened_at + self._open_seconds - time.monotonic())
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self._opened_at >= self._open_seconds:
+                self.state = self.HALF_OPEN
+                self._probing = False
+            if self.state == self.HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def release_probe(self):
+        """Gives back a half-open probe that was granted but never sent."""
+        with self._lock:
+            self._probing = False
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._probing = False
+            self._open_seconds = self.base_open_seconds
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN:
+                self._open_seconds = min(self.max_open_seconds, self._open_seconds * 2)
+                self._trip()
+            elif self.state == self.CLOSED and self.failures >= self.failure_threshold:
+                self._trip()
+
+    def _trip(self):
+        self.state = self.OPEN
+        self.opens += 1
+        self._opened_at = time.monotonic()
+        self._probing = False
+
+
+class SiteGovernor:
+    """Token bucket + AIMD limiter + circuit breaker for a single site."""
+
+    def __init__(self, policy: RateLimitPolicy = RateLimitPolicy()):
+        self.policy = policy
+        self.bucket = TokenBucket(policy.rate, policy.burst)
+        self.limiter = AdaptiveConcurrencyLimiter(
+            policy.min_concurrency, policy.max_concurrency, policy.latency_tolerance
+        )
+        self.breaker = CircuitBreaker(policy.failure_threshold, policy.open_seconds, policy.max_open_seconds)
+
+    def available(self) -> bool:
+        """False while the circuit is open, i.e. the site should be left out of the rotation."""
+        return not self.breaker.is_open()
+
+    @contextmanager
+    def slot(self, cancel_event: Optional[threading.Event] = None):
+        """Waits for a token and a concurrency slot; yields a dict to fill in.
+
+        The caller sets ``error`` on failure, and ``latency`` and ``tier``
+        to the duration and kind of the request it sent the site, timed
+        without waits on our side such as the driver pool. A slot left with
+        neither (no request was sent, e.g. a race was already decided) does
+        not count for or against the site, and gives back a half-open
+        probe. Raises ``SiteUnavailable`` if the circuit is open, and
+        ``SlotCancelled`` if ``cancel_event`` is set before a slot is free.
+        """
+        if not self.breaker.allow():
+            raise SiteUnavailable()
+        with telemetry.stage("rate_limit_wait"):
+            acquired = self.bucket.acquire(cancel_event) and self.limiter.acquire(cancel_event)
+        if not acquired:
+            self.breaker.release_probe()
+            raise SlotCancelled()
+        outcome = {"error": False, "latency": None, "tier": ""}
+        try:
+            yield outcome
+        except Exception:
+            outcome["error"] = True
+            raise
+        finally:
+            self.limiter.release(outcome["latency"], outcome["error"], outcome["tier"])
+            if outcome["error"]:
+                self.breaker.record_failure()
+            elif outcome["latency"] is None:
+                self.breaker.release_probe()
+            else:
+                self.breaker.record_success()
+
+    def snapshot(self) -> dict:
+        return {
+            "state": self.breaker.state,
+            "circuit_opens": self.breaker.opens,
+            "concurrency_limit": round(self.limiter.limit, 2),
+            "in_flight": self.limiter.in_flight,
+            "baseline_latency_s": self.limiter.baseline_snapshot(),
+        }
+
+
+def build_site_governors(
+    site_names: Iterable[str], policies: Optional[Dict[str, RateLimitPolicy]] = None, processes: int = 1
+) -> Dict[str, SiteGovernor]:
+    """Returns ``{site_name: SiteGovernor}`` using ``policies`` where given, defaults otherwise.
+
+    ``processes`` is the number of processes searching the sites side by
+    side; each one's governors get ``1 / processes`` of every policy.
+    """
+    policies = policies or {}
+    return {name: SiteGovernor(policies.get(name, RateLimitPolicy()).split(processes)) for name in site_names}
@@ -0,0 +1,261 @@
+"""Learns which sites find which books fastest and orders the lookups accordingly."""
+
+import json
+import logging
+import os
+import random
+import statistics
+import threading
+import time
+from collections import deque
+from typing import Dict, Iterable, List, Optional
+
+from src.utils.isbn import canonicalize_isbn
+
+# Weight kept by the old counts on each new observation; ~1 / (1 - DECAY) lookups are remembered
+DECAY = 0.98
+# Latencies per site the median is taken over
+LATENCY_WINDOW = 100
+# Pseudo-observations pulling a sparse estimate towards the broader one (hits: the site's overall rate)
+PRIOR_WEIGHT = 5.0
+PRIOR_HIT_RATE = 0.5
+PRIOR_LATENCY = 5.0  # Seconds assumed for a site that was never timed
+MIN_HIT_RATE = 0.01
+# Share of lookups that keep the registration order, so low-ranked sites still get measured
+EXPLORE_RATE = 0.05
+# ISBN-13 prefixes the hit rate is also tracked for: registration group (978-975) and
+# roughly the publisher (978-975-07); longer prefixes only count once they have data
+PREFIX_LENGTHS = (6, 9)
+MAX_PREFIXES_PER_SITE = 5000
+SAVE_INTERVAL = 30.0
+STATS_VERSION = 1
+
+logger = logging.getLogger(__name__)
+
+
+def isbn_prefixes(isbn: str) -> List[str]:
+    """The ``PREFIX_LENGTHS`` prefixes of the canonical ISBN-13, shortest first."""
+    canonical = canonicalize_isbn(isbn) or isbn
+    return [canonical[:length] for length in PREFIX_LENGTHS if len(canonical) > length]
+
+
+class _Rate:
+    """Exponentially decayed hit / error counts."""
+
+    __slots__ = ("attempts", "hits", "errors")
+
+    def __init__(self, attempts: float = 0.0, hits: float = 0.0, errors: float = 0.0):
+        self.attempts = attempts
+        self.hits = hits
+        self.errors = errors
+
+    def add(self, found: bool, error: bool):
+        self.attempts = self.attempts * DECAY + 1
+        self.hits = self.hits * DECAY + found
+        self.errors = self.errors * DECAY + error
+
+    def hit_rate(self, prior: float) -> float:
+        return (self.hits + PRIOR_WEIGHT * prior) / (self.attempts + PRIOR_WEIGHT)
+
+    def to_list(self) -> List[float]:
+        return [round(self.attempts, 4), round(self.hits, 4), round(self.errors, 4)]
+
+
+class _SiteStats:
+    __slots__ = ("overall", "prefixes", "latencies")
+
+    def __init__(self):
+        self.overall = _Rate()
+        self.prefixes: Dict[str, _Rate] = {}
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+
+    def hit_rate(self, prefixes: List[str]) -> float:
+        """Hit rate for ``prefixes``, each level shrunk towards the one above it."""
+        rate = self.overall.hit_rate(PRIOR_HIT_RATE)
+        for prefix in prefixes:
+            counts = self.prefixes.get(prefix)
+            if counts is None:
+                break
+            rate = counts.hit_rate(rate)
+        return rate
+
+    def error_rate(self) -> float:
+        return self.overall.errors / (self.overall.attempts + PRIOR_WEIGHT)
+
+    def latency_p50(self) -> float:
+        return statistics.median(self.latencies) if self.latencies else PRIOR_LATENCY
+
+
+class SiteRanker:
+    """Rolling per-site statistics and the site order they suggest for an ISBN.
+
+    Every completed site lookup is recorded with ``observe``: whether the
+    site had the book, whether it failed, and how long it took. Hit and
+    error rates decay exponentially (``DECAY``), so the ranking follows
+    sites whose stock or reliability changes; the hit rate is also kept
+    per ISBN prefix (registration group and, roughly, publisher) and
+    shrunk towards the site's overall rate while a prefix has few lookups.
+    Latency is the median of the last ``LATENCY_WINDOW`` lookups.
+
+    ``rank`` orders sites by expected time-to-hit, ``p50 latency /
+    P(useful hit)`` where a useful hit is a hit without an error: trying
+    sites in increasing order of that ratio minimizes the expected time of
+    a sequential search. Ties and unknown sites keep registration order,
+    and ``EXPLORE_RATE`` of the lookups keep it outright so that sites
+    ranked last are still measured.
+
+    With a ``path`` the statistics are loaded from and saved to a JSON
+    file (at most every ``SAVE_INTERVAL`` seconds, and on ``close``), so
+    what was learned carries over between runs. Safe to share between
+    threads.
+
+    A ranker in a worker process is created with ``forward=True``: it
+    only reads ``path`` and keeps its observations for ``drain``, so that
+    the parent can ``merge`` them into its own ranker, the one that saves.
+    """
+
+    def __init__(
+        self,
+        site_names: Iterable[str],
+        path: Optional[str] = None,
+        explore_rate: float = EXPLORE_RATE,
+        forward: bool = False,
+    ):
+        self.site_names = list(site_names)
+        self.path = path
+        self.explore_rate = explore_rate
+        self.forward = forward
+        self._lock = threading.Lock()
+        self._sites = {site_name: _SiteStats() for site_name in self.site_names}
+        self._random = random.Random()
+        self._unsent: List[tuple] = []
+        self._dirty = False
+        self._saved_at = time.monotonic()
+        if path:
+            self._load()
+
+    # -- persistence -------------------------------------------------------
+
+    def _load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable site statistics %s: %s", self.path, e)
+            return
+        if data.get("version") != STATS_VERSION:
+            return
+        for site_name, saved in data.get("sites", {}).items():
+            stats = self._sites.get(site_name)
+            if stats is None:  # A site that is no longer searched
+                continue
+            stats.overall = _Rate(*saved["overall"])
+            stats.prefixes = {prefix: _Rate(*counts) for prefix, counts in saved["prefixes"].items()}
+            stats.latencies.extend(saved["latencies"])
+
+    def save(self):
+        """Writes the statistics to ``path`` (atomically) if anything changed."""
+        if not self.path or self.forward:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            self._dirty = False
+            self._saved_at = time.monotonic()
+            sites = {}
+            for site_name, stats in self._sites.items():
+                prefixes = stats.prefixes
+                if len(prefixes) > MAX_PREFIXES_PER_SITE:
+                    # Forget the prefixes with the least (decayed) evidence
+                    keep = sorted(prefixes, key=lambda prefix: prefixes[prefix].attempts)[-MAX_PREFIXES_PER_SITE:]
+                    prefixes = stats.prefixes = {prefix: prefixes[prefix] for prefix in keep}
+                sites[site_name] = {
+                    "overall": stats.overall.to_list(),
+                    "prefixes": {prefix: counts.to_list() for prefix, counts in prefixes.items()},
+                    "latencies": [round(latency, 4) for latency in stats.latencies],
+                }
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": STATS_VERSION, "sites": sites}, f, ensure_ascii=False)
+        os.replace(temp_path, self.path)
+
+    def close(self):
+        self.save()
+
+    # -- learning ----------------------------------------------------------
+
+    def observe(self, site_name: str, isbn: str, found: bool, error: bool, elapsed: float):
+        """Records one completed lookup of ``isbn`` on ``site_name``."""
+        prefixes = isbn_prefixes(isbn)
+        with self._lock:
+            stats = self._sites.get(site_name)
+            if stats is None:
+                return
+            stats.overall.add(found, error)
+            for prefix in prefixes:
+                counts = stats.prefixes.get(prefix)
+                if counts is None:
+                    counts = stats.prefixes[prefix] = _Rate()
+                counts.add(found, error)
+            # A failed lookup's duration says little about how long a real answer takes
+            if not error:
+                stats.latencies.append(elapsed)
+            if self.forward:
+                self._unsent.append((site_name, isbn, found, error, elapsed))
+                return
+            self._dirty = True
+            due = time.monotonic() - self._saved_at >= SAVE_INTERVAL
+        if due:
+            try:
+                self.save()
+            except OSError as e:
+                logger.warning("Could not save site statistics to %s: %s", self.path, e)
+
+    def drain(self) -> List[tuple]:
+        """Returns and forgets the observations made since the last call (``forward`` rankers only)."""
+        with self._lock:
+            observations, self._unsent = self._unsent, []
+        return observations
+
+    def merge(self, observations: Iterable[tuple]):
+        """Records observations ``drain``-ed from a ranker in another process."""
+        for observation in observations:
+            self.observe(*observation)
+
+    def expected_time_to_hit(self, site_name: str, isbn: str) -> float:
+        prefixes = isbn_prefixes(isbn)
+        with self._lock:
+            stats = self._sites[site_name]
+            useful = stats.hit_rate(prefixes) * (1 - stats.error_rate())
+            return stats.latency_p50() / max(useful, MIN_HIT_RATE)
+
+    def rank(self, isbn: str, site_names: Optional[List[str]] = None) -> List[str]:
+        """``site_names`` (default: all) in the order they should be tried for ``isbn``."""
+        site_names = list(self.site_names if site_names is None else site_names)
+        if self.explore_rate and self._random.random() < self.explore_rate:
+            return site_names
+        known = [site_name for site_name in site_names if site_name in self._sites]
+        scores = {site_name: self.expected_time_to_hit(site_name, isbn) for site_name in known}
+        # sorted() is stable, so equal scores keep registration order
+        ordered = sorted(known, key=scores.__getitem__)
+        return ordered + [site_name for site_name in site_names if site_name not in self._sites]
+
+    def snapshot(self) -> Dict[str, dict]:
+        """Per-site hit rate, error rate, p50 latency and expected time-to-hit, best first."""
+        with self._lock:
+            rows = {}
+            for site_name, stats in self._sites.items():
+                hit_rate = stats.overall.hit_rate(PRIOR_HIT_RATE)
+                error_rate = stats.error_rate()
+                latency = stats.latency_p50()
+                rows[site_name] = {
+                    "recent_lookups": round(stats.overall.attempts, 1),  # Decayed count
+                    "hit_rate": round(hit_rate, 3),
+                    "error_rate": round(error_rate, 3),
+                    "latency_p50_s": round(latency, 3),
+                    "expected_time_to_hit_s": round(latency / max(hit_rate * (1 - error_rate), MIN_HIT_RATE), 3),
+                    "prefixes": len(stats.prefixes),
+                }
+        return dict(sorted(rows.items(), key=lambda item: item[1]["expected_time_to_hit_s"]))
@@ -0,0 +1,179 @@
+"""Local catalog of every book found so far, searchable offline."""
+
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from typing import List, NamedTuple, Optional
+
+from src.result_model import SearchResult
+from src.utils.isbn import canonicalize_isbn
+
+SEARCH_FIELDS = ("title", "author", "publisher")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS books (
+    isbn TEXT PRIMARY KEY,
+    site TEXT NOT NULL,
+    title TEXT NOT NULL,
+    author TEXT NOT NULL,
+    publisher TEXT NOT NULL,
+    url TEXT NOT NULL,
+    norm_title TEXT NOT NULL,
+    norm_author TEXT NOT NULL,
+    norm_publisher TEXT NOT NULL,
+    first_seen REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS books_norm_author ON books (norm_author);
+"""
+
+# External-content FTS5 index over the normalized columns, kept in sync by triggers
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS books_fts USING fts5(
+    norm_title, norm_author, norm_publisher, content='books', content_rowid='rowid'
+);
+CREATE TRIGGER IF NOT EXISTS books_ai AFTER INSERT ON books BEGIN
+    INSERT INTO books_fts (rowid, norm_title, norm_author, norm_publisher)
+    VALUES (new.rowid, new.norm_title, new.norm_author, new.norm_publisher);
+END;
+CREATE TRIGGER IF NOT EXISTS books_ad AFTER DELETE ON books BEGIN
+    INSERT INTO books_fts (books_fts, rowid, norm_title, norm_author, norm_publisher)
+    VALUES ('delete', old.rowid, old.norm_title, old.norm_author, old.norm_publisher);
+END;
+CREATE TRIGGER IF NOT EXISTS books_au AFTER UPDATE ON books BEGIN
+    INSERT INTO books_fts (books_fts, rowid, norm_title, norm_author, norm_publisher)
+    VALUES ('delete', old.rowid, old.norm_title, old.norm_author, old.norm_publisher);
+    INSERT INTO books_fts (rowid, norm_title, norm_author, norm_publisher)
+    VALUES (new.rowid, new.norm_title, new.norm_author, new.norm_publisher);
+END;
+"""
+
+# Dotless/dotted i do not decompose, so fold them before stripping accents
+_TURKISH_FOLD = str.maketrans({"ı": "i", "İ": "i", "I": "i"})
+_WORD_RE = re.compile(r"\w+")
+
+
+def normalize_text(text: str) -> str:
+    """Lower-cases, strips accents (ç→c, ğ→g, ı→i, ...) and punctuation, collapses spaces."""
+    text = unicodedata.normalize("NFKD", (text or "").translate(_TURKISH_FOLD).casefold())
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return " ".join(_WORD_RE.findall(text))
+
+
+class CatalogEntry(NamedTuple):
+    result: SearchResult
+    updated_at: float
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.updated_at
+
+
+class BookCatalog:
+    """SQLite store of found books keyed by canonical ISBN-13.
+
+    Unlike ``PersistentResultCache`` nothing here expires: an entry is the
+    last known record of the book and only gets replaced when a newer hit
+    comes in. Lookups by ISBN are a primary-key read on one shared
+    connection. Title/author/publisher are stored normalized
+    (``normalize_text``) and indexed with FTS5 for offline word-prefix
+    search; if the SQLite build lacks FTS5, ``search`` falls back to LIKE.
+    Safe to share between threads.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        try:
+            self._conn.executescript(_FTS_SCHEMA)
+            self.has_fts = True
+        except sqlite3.OperationalError:
+            self.has_fts = False
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM books").fetchone()[0]
+
+    @staticmethod
+    def _to_result(row) -> SearchResult:
+        isbn, site, title, author, publisher, url = row
+        return SearchResult(
+            isbn=isbn, found=True, site=site, title=title, author=author,
+            publisher=publisher, url=url, cached=True,
+        )
+
+    def get(self, isbn: str) -> Optional[CatalogEntry]:
+        """The last known record of ``isbn`` (ISBN-10 or -13), marked ``cached``."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT isbn, site, title, author, publisher, url, updated_at FROM books WHERE isbn = ?",
+                (canonicalize_isbn(isbn) or isbn,),
+            ).fetchone()
+        if row is None:
+            return None
+        return CatalogEntry(self._to_result(row[:6]), row[6])
+
+    def put(self, isbn: str, result: SearchResult):
+        """Adds or refreshes the book found for ``isbn``; misses are ignored."""
+        if not result.found:
+            return
+        isbn = canonicalize_isbn(isbn) or isbn
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO books (isbn, site, title, author, publisher, url, "
+                "norm_title, norm_author, norm_publisher, first_seen, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (isbn) DO UPDATE SET site = excluded.site, title = excluded.title, "
+                "author = excluded.author, publisher = excluded.publisher, url = excluded.url, "
+                "norm_title = excluded.norm_title, norm_author = excluded.norm_author, "
+                "norm_publisher = excluded.norm_publisher, updated_at = excluded.updated_at",
+                (isbn, result.site or "", result.title, result.author, result.publisher, result.url,
+                 normalize_text(result.title), normalize_text(result.author),
+                 normalize_text(result.publisher), now, now),
+            )
+
+    def search(self, query: str, field: Optional[str] = None, limit: int = 20) -> List[SearchResult]:
+        """Books whose title/author/publisher (or only ``field``) contain every word of ``query``.
+
+        Words match as prefixes and accents are ignored, so "sait fa" finds
+        "Sait Faik Abasıyanık". FTS results are ranked by relevance.
+        """
+        if field is not None and field not in SEARCH_FIELDS:
+            raise ValueError(f"Unknown catalog field: {field}")
+        words = normalize_text(query).split()
+        if not words:
+            return []
+
+        if self.has_fts:
+            terms = " ".join(f'"{word}"*' for word in words)
+            match = f"norm_{field} : ({terms})" if field else terms
+            sql = (
+                "SELECT b.isbn, b.site, b.title, b.author, b.publisher, b.url "
+                "FROM books_fts JOIN books b ON b.rowid = books_fts.rowid "
+                "WHERE books_fts MATCH ? ORDER BY rank LIMIT ?"
+            )
+            params = (match, limit)
+        else:
+            columns = [f"norm_{field}"] if field else [f"norm_{name}" for name in SEARCH_FIELDS]
+            haystack = " || ' ' || ".join(columns)
+            sql = (
+                "SELECT isbn, site, title, author, publisher, url FROM books WHERE "
+                + " AND ".join(f"(' ' || {haystack}) LIKE ?" for _ in words)
+                + " ORDER BY title LIMIT ?"
+            )
+            params = (*(f"% {word}%" for word in words), limit)
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [self._to_result(row) for row in rows]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,195 @@
+"""Streaming readers that pull only the ISBN column out of .xlsx, CSV and Parquet files."""
+
+import csv
+import os
+import re
+from contextlib import closing
+from itertools import islice
+from typing import Iterator, List, NamedTuple, Optional, Sequence
+
+from src.utils.isbn import canonicalize_isbn
+
+XLSX_EXTENSIONS = (".xlsx", ".xlsm")
+CSV_EXTENSIONS = (".csv", ".tsv", ".txt")
+PARQUET_EXTENSIONS = (".parquet", ".pq")
+SUPPORTED_EXTENSIONS = XLSX_EXTENSIONS + CSV_EXTENSIONS + PARQUET_EXTENSIONS
+
+# Rows inspected to find the ISBN column
+DETECT_SAMPLE_ROWS = 200
+CSV_SNIFF_BYTES = 64 * 1024
+# Header names that mark the ISBN column when the content alone is ambiguous
+_HEADER_HINT_RE = re.compile(r"isbn|barkod|barcode|ean|gtin", re.IGNORECASE)
+_WORD_RE = re.compile(r"[^\W\d_]{2,}")
+
+
+class IsbnColumn(NamedTuple):
+    """Where the ISBNs are: 0-based ``index``, and the header text if the first row is one."""
+
+    index: int
+    header: Optional[str]
+    score: float  # Share of sampled cells that are valid ISBNs
+
+
+def cell_text(value) -> str:
+    """Normalizes a cell to text; integral floats lose the ``.0`` a numeric cell would get."""
+    if value is None:
+        return ""
+    if isinstance(value, float):
+        if value != value:  # NaN
+            return ""
+        if value.is_integer():
+            return str(int(value))
+    return str(value).strip()
+
+
+def _header_text(first: str) -> Optional[str]:
+    """``first`` if it reads like a column title (a word, not an ISBN), else ``None``."""
+    if first and canonicalize_isbn(first) is None and _WORD_RE.search(first):
+        return first
+    return None
+
+
+def detect_isbn_column(rows: Sequence[Sequence]) -> IsbnColumn:
+    """Picks the column where most sampled cells are valid ISBNs.
+
+    Ties go to a column whose first cell looks like an ISBN header, then to
+    the leftmost one. The first row counts as a header when the chosen
+    column holds a word there instead of an ISBN. Without any valid ISBN
+    the first column is assumed, as before.
+    """
+    width = max((len(row) for row in rows), default=0)
+    best = None
+    for index in range(width):
+        cells = [cell_text(row[index]) if index < len(row) else "" for row in rows]
+        filled = [cell for cell in cells if cell]
+        if not filled:
+            continue
+        score = sum(canonicalize_isbn(cell) is not None for cell in filled) / len(filled)
+        hinted = bool(cells[0]) and bool(_HEADER_HINT_RE.search(cells[0]))
+        key = (score, hinted, -index)
+        if best is None or key > best[0]:
+            best = (key, index, cells[0], score)
+
+    if best is None or best[3] == 0:
+        index, first, score = 0, cell_text(rows[0][0]) if rows and rows[0] else "", 0.0
+    else:
+        _, index, first, score = best
+    return IsbnColumn(index, _header_text(first), score)
+
+
+def _file_kind(path: str) -> str:
+    extension = os.path.splitext(path)[1].lower()
+    if extension in XLSX_EXTENSIONS:
+        return "xlsx"
+    if extension in CSV_EXTENSIONS:
+        return "csv"
+    if extension in PARQUET_EXTENSIONS:
+        return "parquet"
+    raise ValueError(
+        f"Desteklenmeyen dosya türü: {extension or path} (desteklenenler: {', '.join(SUPPORTED_EXTENSIONS)})"
+    )
+
+
+class IsbnSource:
+    """One input file, opened lazily; ``column`` is detected from the first rows.
+
+    ``chunks`` re-reads the file from the start and yields the ISBN column
+    only, ``chunk_size`` non-empty cells at a time, as fixed-width NumPy
+    string arrays: no DataFrame is built, the other columns are dropped row
+    by row, and a chunk costs one contiguous buffer rather than a Python
+    object per cell.
+
+    - .xlsx/.xlsm: openpyxl in read-only mode, first worksheet
+    - .csv/.tsv/.txt: delimiter sniffed (Turkish Excel writes ``;``)
+    - .parquet: needs ``pyarrow``; only the ISBN column is decoded
+    """
+
+    def __init__(self, path: str, column: Optional[int] = None):
+        self.path = path
+        self.kind = _file_kind(path)
+        with closing(self._rows()) as rows:
+            sample = list(islice(rows, DETECT_SAMPLE_ROWS))
+        if column is None:
+            self.column = detect_isbn_column(sample)
+        else:
+            first = cell_text(sample[0][column]) if sample and column < len(sample[0]) else ""
+            self.column = IsbnColumn(column, _header_text(first), 0.0)
+
+    # -- row access --------------------------------------------------------
+
+    def _rows(self) -> Iterator[Sequence]:
+        """Every row with all of its columns (used for detection only)."""
+        if self.kind == "xlsx":
+            return self._xlsx_cells(None)
+        if self.kind == "csv":
+            return self._csv_rows()
+        return self._parquet_rows()
+
+    def _column_values(self) -> Iterator:
+        index = self.column.index
+        if self.kind == "xlsx":
+            return (row[0] if row else None for row in self._xlsx_cells(index))
+        if self.kind == "csv":
+            return (row[index] if index < len(row) else None for row in self._csv_rows())
+        return self._parquet_column(index)
+
+    def _xlsx_cells(self, index: Optional[int]) -> Iterator[Sequence]:
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(self.path, read_only=True, data_only=True)
+        try:
+            worksheet = workbook.worksheets[0]
+            if index is None:
+                yield from worksheet.iter_rows(values_only=True)
+            else:
+                yield from worksheet.iter_rows(min_col=index + 1, max_col=index + 1, values_only=True)
+        finally:
+            workbook.close()
+
+    def _csv_rows(self) -> Iterator[List[str]]:
+        # ISBNs are ASCII, so undecodable bytes elsewhere in the row are harmless
+        with open(self.path, encoding="utf-8-sig", errors="replace", newline="") as f:
+            sample = f.read(CSV_SNIFF_BYTES)
+            f.seek(0)
+            try:
+                dialect = csv.Sniffer().sniff(sample, delimiters=",;\t|")
+            except csv.Error:
+                dialect = csv.excel_tab if self.path.lower().endswith(".tsv") else csv.excel
+            yield from csv.reader(f, dialect)
+
+    def _parquet_file(self):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ValueError("Parquet dosyaları için 'pyarrow' paketi gerekli (pip install pyarrow)") from e
+        return pq.ParquetFile(self.path)
+
+    def _parquet_rows(self) -> Iterator[Sequence]:
+        batch = next(self._parquet_file().iter_batches(batch_size=DETECT_SAMPLE_ROWS), None)
+        if batch is None:
+            return
+        # Column names stand in for a header row so detection can use them as hints
+        yield tuple(batch.schema.names)
+        yield from zip(*(column.to_pylist() for column in batch.columns))
+
+    def _parquet_column(self, index: int) -> Iterator:
+        parquet_file = self._parquet_file()
+        name = parquet_file.schema_arrow.names[index]
+        for batch in parquet_file.iter_batches(columns=[name]):
+            yield from batch.column(0).to_pylist()
+
+    # -- public ------------------------------------------------------------
+
+    def chunks(self, chunk_size: int) -> Iterator:
+        """Yields the non-empty ISBN cells as NumPy ``<U`` arrays of up to ``chunk_size``."""
+        import numpy as np
+
+        values = self._column_values()
+        if self.column.header is not None and self.kind != "parquet":
+            next(values, None)
+        texts = (text for text in map(cell_text, values) if text)
+        while True:
+            chunk = list(islice(texts, chunk_size))
+            if not chunk:
+                return
+            yield np.array(chunk, dtype=str)
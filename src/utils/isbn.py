@@ -0,0 +1,111 @@
+"""ISBN cleaning, checksum validation and ISBN-13 canonicalization."""
+
+import re
+from typing import Optional, Tuple
+
+_ISBN13_WEIGHTS = [1, 3] * 6 + [1]
+_ISBN10_WEIGHTS = list(range(10, 0, -1))
+_ISBN978_WEIGHTS = [1, 3] * 6
+# [0-9], not \d: \d also matches other scripts' digits (e.g. fullwidth "０")
+_ISBN13_PATTERN = r"97[89][0-9]{10}"
+_ISBN10_PATTERN = r"[0-9]{9}[0-9X]"
+_ISBN13_RE = re.compile(_ISBN13_PATTERN)
+_ISBN10_RE = re.compile(_ISBN10_PATTERN)
+
+
+def clean_isbn(isbn) -> str:
+    """Removes hyphens/spaces and the ``.0`` Excel adds to numeric cells."""
+    cleaned = str(isbn).strip().replace("-", "").replace(" ", "").upper()
+    if cleaned.endswith(".0"):
+        cleaned = cleaned[:-2]
+    return cleaned
+
+
+def _digits(values, width: int):
+    """Turns an array of equal-length ASCII strings into an ``(n, width)`` digit matrix."""
+    import numpy as np
+
+    raw = np.frombuffer("".join(values).encode("ascii"), dtype=np.uint8).reshape(-1, width)
+    digits = raw.astype(np.int64) - ord("0")
+    digits[raw == ord("X")] = 10
+    return digits
+
+
+def canonicalize_series(series):
+    """Returns the ISBN-13 form of every value, or ``None`` where it is not a valid ISBN.
+
+    Works on a whole chunk at once: cleaning uses vectorized string ops and
+    checksums are computed as NumPy matrix products, so validating a chunk
+    costs a handful of array operations instead of a Python loop per row.
+    ISBN-10 values (including a trailing ``X``) are converted to ISBN-13,
+    which makes both forms of the same book share one key.
+    """
+    # Imported here so that single lookups (e.g. from the CLI) do not pay for them
+    import numpy as np
+    import pandas as pd
+
+    cleaned = (
+        series.astype(str)
+        .str.strip()
+        .str.replace(r"[\s-]", "", regex=True)
+        .str.upper()
+        .str.replace(r"\.0$", "", regex=True)
+    )
+    result = pd.Series(None, index=series.index, dtype=object)
+
+    mask13 = cleaned.str.fullmatch(_ISBN13_PATTERN).to_numpy(dtype=bool)
+    if mask13.any():
+        values = cleaned.to_numpy()[mask13]
+        valid = _digits(values, 13) @ np.array(_ISBN13_WEIGHTS) % 10 == 0
+        result.iloc[np.flatnonzero(mask13)[valid]] = values[valid]
+
+    mask10 = cleaned.str.fullmatch(_ISBN10_PATTERN).to_numpy(dtype=bool)
+    if mask10.any():
+        values = cleaned.to_numpy()[mask10]
+        digits = _digits(values, 10)
+        valid = (digits @ np.array(_ISBN10_WEIGHTS) % 11 == 0) & (digits[:, :9] < 10).all(axis=1)
+        body = np.hstack([np.tile([9, 7, 8], (valid.sum(), 1)), digits[valid, :9]])
+        check = (10 - body @ np.array(_ISBN978_WEIGHTS) % 10) % 10
+        converted = ["978" + value[:9] + str(c) for value, c in zip(values[valid], check)]
+        result.iloc[np.flatnonzero(mask10)[valid]] = converted
+
+    return result
+
+
+def _digit_values(isbn: str):
+    return [10 if char == "X" else int(char) for char in isbn]
+
+
+def canonicalize_isbn(isbn) -> Optional[str]:
+    """Scalar version of ``canonicalize_series``; pure Python."""
+    cleaned = clean_isbn(isbn)
+    if _ISBN13_RE.fullmatch(cleaned):
+        digits = _digit_values(cleaned)
+        if sum(d * w for d, w in zip(digits, _ISBN13_WEIGHTS)) % 10 == 0:
+            return cleaned
+        return None
+    if _ISBN10_RE.fullmatch(cleaned):
+        digits = _digit_values(cleaned)
+        if sum(d * w for d, w in zip(digits, _ISBN10_WEIGHTS)) % 11 != 0:
+            return None
+        body = "978" + cleaned[:9]
+        check = (10 - sum(int(d) * w for d, w in zip(body, _ISBN978_WEIGHTS)) % 10) % 10
+        return body + str(check)
+    return None
+
+
+def _is_ascii_digits(text: str) -> bool:
+    return text.isascii() and text.isdigit()
+
+
+def validate_isbn(isbn) -> Tuple[bool, str]:
+    """Checks length, characters and checksum; returns ``(is_valid, error_message)``."""
+    cleaned = clean_isbn(isbn)
+    if len(cleaned) not in (10, 13):
+        return False, "ISBN 10 veya 13 haneli olmalıdır."
+    body, check = cleaned[:-1], cleaned[-1]
+    if not _is_ascii_digits(body) or not (_is_ascii_digits(check) or (check == "X" and len(cleaned) == 10)):
+        return False, "ISBN yalnızca rakamlardan oluşmalıdır (ISBN-10 'X' ile bitebilir)."
+    if canonicalize_isbn(cleaned) is None:
+        return False, "ISBN kontrol hanesi hatalı."
+    return True, ""
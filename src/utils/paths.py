@@ -0,0 +1,20 @@
+"""Locations for files the application keeps between runs."""
+
+import os
+
+DATA_DIR_ENV = "ISBN_SEARCH_DATA_DIR"
+
+
+def get_data_dir() -> str:
+    """Returns (and creates) the per-user data directory.
+
+    Defaults to ``~/.isbn_search``; set ``ISBN_SEARCH_DATA_DIR`` to override.
+    """
+    path = os.environ.get(DATA_DIR_ENV) or os.path.join(os.path.expanduser("~"), ".isbn_search")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def get_data_path(filename: str) -> str:
+    """Returns the path of ``filename`` inside the data directory."""
+    return os.path.join(get_data_dir(), filename)
@@ -0,0 +1,175 @@
+"""Opt-in cProfile + tracemalloc capture around long-running jobs."""
+
+import cProfile
+import ctypes
+import functools
+import io
+import logging
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Optional
+
+from src.utils.paths import get_data_path
+
+PROFILE_ENV = "ISBN_SEARCH_PROFILE"
+TOP_FUNCTIONS = 40
+TOP_ALLOCATIONS = 25
+
+# From 3.12 cProfile hooks into sys.monitoring, which covers every thread at once
+PER_THREAD_PROFILERS = sys.version_info < (3, 12)
+
+logger = logging.getLogger(__name__)
+
+
+def _current_thread_state() -> int:
+    return ctypes.pythonapi.PyThreadState_Get()
+
+
+def _clear_thread_profilers(thread_states):
+    """Removes the profile hook of the live threads among ``thread_states`` (CPython before 3.12).
+
+    A thread's hook can otherwise only be removed by that thread itself, and
+    a pooled worker that is idle never gets to do it.
+    """
+    api = ctypes.pythonapi
+    interpreter = api.PyInterpreterState_Get()
+    state = api.PyInterpreterState_ThreadHead(interpreter)
+    while state:
+        if state in thread_states:
+            api._PyEval_SetProfile(state, None, None)
+        state = api.PyThreadState_Next(state)
+
+
+if PER_THREAD_PROFILERS:
+    ctypes.pythonapi.PyThreadState_Get.restype = ctypes.c_void_p
+    ctypes.pythonapi.PyInterpreterState_Get.restype = ctypes.c_void_p
+    ctypes.pythonapi.PyInterpreterState_ThreadHead.argtypes = [ctypes.c_void_p]
+    ctypes.pythonapi.PyInterpreterState_ThreadHead.restype = ctypes.c_void_p
+    ctypes.pythonapi.PyThreadState_Next.argtypes = [ctypes.c_void_p]
+    ctypes.pythonapi.PyThreadState_Next.restype = ctypes.c_void_p
+    ctypes.pythonapi._PyEval_SetProfile.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_void_p]
+    ctypes.pythonapi._PyEval_SetProfile.restype = ctypes.c_int
+
+
+def profiling_requested() -> bool:
+    """True when ``ISBN_SEARCH_PROFILE`` is set to a truthy value."""
+    return os.environ.get(PROFILE_ENV, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+class ProfileSession:
+    """CPU and allocation profile of everything run between ``start`` and ``stop``.
+
+    Before Python 3.12 cProfile only sees the thread that enables it, so
+    every thread started during the session (the bulk search workers, the
+    race-mode executor) gets its own profiler through ``threading.setprofile``
+    and their stats are merged on ``stop``. ``stop`` also removes the hooks
+    of those threads that are still alive (pooled threads outlive the
+    session), which Python only lets a thread do for itself, through the
+    interpreter's C API. From 3.12 a single profiler covers every thread.
+    Nothing is installed besides the profile hooks, so a debugger or
+    coverage tracer keeps working. tracemalloc is process-wide. Writes
+    ``<name>-<timestamp>.pstats`` (open with ``pstats`` or snakeviz) and a
+    readable ``.txt`` summary to ``output_dir``.
+    """
+
+    def __init__(self, name: str, output_dir: Optional[str] = None):
+        self.name = name
+        self.output_dir = output_dir or get_data_path("profiles")
+        self.stats_path = None
+        self.report_path = None
+        self._profiles = []
+        self._thread_states = set()
+        self._lock = threading.Lock()
+        self._started_tracemalloc = False
+        self._started = 0.0
+        self._stopping = False
+
+    def _profile_new_thread(self, frame, event, arg):
+        # Runs once as the first profile event of each new thread, then hands over to cProfile
+        sys.setprofile(None)
+        profile = cProfile.Profile()
+        with self._lock:
+            if self._stopping:
+                return
+            self._profiles.append(profile)
+            self._thread_states.add(_current_thread_state())
+            profile.enable()
+
+    def start(self):
+        os.makedirs(self.output_dir, exist_ok=True)
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        tracemalloc.reset_peak()
+        if PER_THREAD_PROFILERS:
+            threading.setprofile(self._profile_new_thread)
+        main_profile = cProfile.Profile()
+        self._profiles.append(main_profile)
+        self._started = time.perf_counter()
+        main_profile.enable()
+
+    def stop(self):
+        self._profiles[0].disable()
+        if PER_THREAD_PROFILERS:
+            threading.setprofile(None)
+            with self._lock:
+                self._stopping = True
+                self._thread_states.discard(_current_thread_state())
+                _clear_thread_profilers(self._thread_states)
+        elapsed = time.perf_counter() - self._started
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+
+        base = os.path.join(self.output_dir, f"{self.name}-{time.strftime('%Y%m%d-%H%M%S')}")
+        with self._lock:
+            profiles = list(self._profiles)
+        stats = pstats.Stats(*profiles)
+        self.stats_path = base + ".pstats"
+        stats.dump_stats(self.stats_path)
+
+        report = io.StringIO()
+        report.write(
+            f"{self.name}: {elapsed:.1f} s, {len(profiles)} profiled threads\n"
+            f"tracemalloc: peak {peak / 2 ** 20:.1f} MB, still allocated {current / 2 ** 20:.1f} MB\n\n"
+        )
+        stats.stream = report
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(TOP_FUNCTIONS)
+        report.write(f"\nTop {TOP_ALLOCATIONS} allocation sites still alive at the end:\n")
+        for statistic in snapshot.statistics("lineno")[:TOP_ALLOCATIONS]:
+            report.write(f"{statistic}\n")
+        self.report_path = base + ".txt"
+        with open(self.report_path, "w", encoding="utf-8") as f:
+            f.write(report.getvalue())
+        logger.info("Profile written to %s and %s", self.stats_path, self.report_path)
+
+
+@contextmanager
+def profile_session(name: str, enabled: Optional[bool] = None, output_dir: Optional[str] = None):
+    """Profiles the block when ``enabled`` (default: ``ISBN_SEARCH_PROFILE``); yields the session or None."""
+    if not (profiling_requested() if enabled is None else enabled):
+        yield None
+        return
+    session = ProfileSession(name, output_dir)
+    session.start()
+    try:
+        yield session
+    finally:
+        session.stop()
+
+
+def profiled(name: str):
+    """Decorator form of ``profile_session`` controlled by ``ISBN_SEARCH_PROFILE``."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with profile_session(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,118 @@
+"""Persistent, SQLite-backed cache of per-site ISBN lookups."""
+
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+from src.result_model import SearchResult
+
+DEFAULT_TTL = 7 * 24 * 3600  # Found books rarely change
+DEFAULT_NEGATIVE_TTL = 24 * 3600  # Sites add stock, so retry misses daily
+# Expired rows are deleted on open and again after this many writes
+PURGE_INTERVAL_WRITES = 1000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS site_results (
+    isbn TEXT NOT NULL,
+    site TEXT NOT NULL,
+    found INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    author TEXT NOT NULL,
+    publisher TEXT NOT NULL,
+    url TEXT NOT NULL,
+    error TEXT NOT NULL,
+    stored_at REAL NOT NULL,
+    PRIMARY KEY (isbn, site)
+) WITHOUT ROWID
+"""
+
+
+class PersistentResultCache:
+    """Stores the outcome of every ``(isbn, site)`` lookup on disk.
+
+    Both hits and misses are kept: a hit short-circuits the search, a miss
+    ("not found on site X") lets the caller skip that site until the entry
+    expires. TTLs can be overridden per site through ``site_ttls`` and
+    ``site_negative_ttls``. Expired entries are purged when the cache is
+    opened and every ``PURGE_INTERVAL_WRITES`` writes, so the file does not
+    keep growing across runs. Safe to share between threads.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttl: float = DEFAULT_TTL,
+        negative_ttl: float = DEFAULT_NEGATIVE_TTL,
+        site_ttls: Optional[Dict[str, float]] = None,
+        site_negative_ttls: Optional[Dict[str, float]] = None,
+    ):
+        self.path = path
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.site_ttls = dict(site_ttls or {})
+        self.site_negative_ttls = dict(site_negative_ttls or {})
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(_SCHEMA)
+        self.purge_expired()
+
+    def _ttl_for(self, site: str, found: bool) -> float:
+        if found:
+            return self.site_ttls.get(site, self.ttl)
+        return self.site_negative_ttls.get(site, self.negative_ttl)
+
+    def get(self, isbn: str) -> Dict[str, SearchResult]:
+        """Returns the fresh entries for ``isbn`` as ``{site: SearchResult}``."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT site, found, title, author, publisher, url, error, stored_at "
+                "FROM site_results WHERE isbn = ?",
+                (isbn,),
+            ).fetchall()
+        now = time.time()
+        return {
+            site: SearchResult(
+                isbn=isbn,
+                found=bool(found),
+                site=site if found else None,
+                title=title,
+                author=author,
+                publisher=publisher,
+                url=url,
+                error=error,
+                cached=True,
+            )
+            for site, found, title, author, publisher, url, error, stored_at in rows
+            if now - stored_at < self._ttl_for(site, bool(found))
+        }
+
+    def put(self, isbn: str, site: str, result: SearchResult):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO site_results "
+                "(isbn, site, found, title, author, publisher, url, error, stored_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (isbn, site, int(result.found), result.title, result.author, result.publisher,
+                 result.url, result.error, time.time()),
+            )
+            self._writes += 1
+            purge = self._writes % PURGE_INTERVAL_WRITES == 0
+        if purge:
+            self.purge_expired()
+
+    def purge_expired(self) -> int:
+        """Deletes entries older than the longest configured TTL; returns the count."""
+        longest = max([self.ttl, self.negative_ttl, *self.site_ttls.values(), *self.site_negative_ttls.values()])
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM site_results WHERE stored_at < ?", (time.time() - longest,)
+            )
+        return cursor.rowcount
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,117 @@
+"""Disk-backed table of bulk results for views that render rows on demand."""
+
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from src.result_model import SearchResult
+from src.utils.result_writer import result_to_row
+
+# Rows buffered in memory before they are written to the table in one transaction
+FLUSH_ROWS = 500
+# Rows kept decoded for the view; a screenful is a few dozen
+CACHED_ROWS = 256
+
+
+class ResultStore:
+    """Append-only table of display rows, one per written result.
+
+    Implements the writer interface (``write_result``/``close``) so it can
+    sit next to the file writer behind a ``TeeResultWriter``. Rows are kept
+    as tuples of strings in ``RESULT_COLUMNS`` order in a temporary SQLite
+    file (in ``directory``, default: the system's), so memory does not grow
+    with the number of results: at most ``FLUSH_ROWS`` new rows wait in
+    memory, and the ``CACHED_ROWS`` most recently read ones stay decoded.
+    A virtual list control asks for rows by index, so only the visible ones
+    are ever read back. ``discard`` deletes the file.
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        fd, self.path = tempfile.mkstemp(prefix="isbn-results-", suffix=".sqlite3", dir=directory)
+        os.close(fd)
+        self._lock = threading.Lock()
+        # Scratch data: no journal and no fsync, the file is thrown away anyway
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=OFF")
+        self._conn.execute("PRAGMA synchronous=OFF")
+        self._conn.execute(
+            "CREATE TABLE result_rows (id INTEGER PRIMARY KEY, found INTEGER NOT NULL, row TEXT NOT NULL)"
+        )
+        self._stored = 0
+        self._pending = []
+        self._cache = OrderedDict()
+
+    def write_result(self, result: SearchResult):
+        row = tuple(str(value) for value in result_to_row(result))
+        with self._lock:
+            self._pending.append((row, result.found))
+            if len(self._pending) >= FLUSH_ROWS:
+                self._flush()
+
+    def _flush(self):
+        """Writes the pending rows to the table (lock held)."""
+        if not self._pending:
+            return
+        with self._conn:
+            self._conn.executemany(
+                "INSERT INTO result_rows (id, found, row) VALUES (?, ?, ?)",
+                (
+                    (self._stored + offset, int(found), json.dumps(row, ensure_ascii=False))
+                    for offset, (row, found) in enumerate(self._pending)
+                ),
+            )
+        self._stored += len(self._pending)
+        self._pending = []
+
+    def close(self):
+        with self._lock:
+            self._flush()
+
+    def clear(self):
+        with self._lock:
+            with self._conn:
+                self._conn.execute("DELETE FROM result_rows")
+            self._stored = 0
+            self._pending = []
+            self._cache.clear()
+
+    def discard(self):
+        """Closes and deletes the table file."""
+        with self._lock:
+            self._conn.close()
+            self._pending = []
+            self._cache.clear()
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._stored + len(self._pending)
+
+    def _entry(self, index: int) -> Tuple[Tuple[str, ...], bool]:
+        with self._lock:
+            if index >= self._stored:
+                return self._pending[index - self._stored]
+            entry = self._cache.get(index)
+            if entry is None:
+                found, row = self._conn.execute(
+                    "SELECT found, row FROM result_rows WHERE id = ?", (index,)
+                ).fetchone()
+                entry = self._cache[index] = (tuple(json.loads(row)), bool(found))
+                if len(self._cache) > CACHED_ROWS:
+                    self._cache.popitem(last=False)
+            else:
+                self._cache.move_to_end(index)
+            return entry
+
+    def row(self, index: int) -> Tuple[str, ...]:
+        return self._entry(index)[0]
+
+    def is_found(self, index: int) -> bool:
+        return self._entry(index)[1]
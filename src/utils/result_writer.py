@@ -0,0 +1,322 @@
+"""Incremental writers for bulk search results."""
+
+import csv
+import json
+import os
+import time
+from array import array
+from typing import Callable, Dict, List, Optional, TextIO
+
+import xlsxwriter
+from xlsxwriter.utility import xl_range
+
+from src.result_model import NOT_FOUND, SearchResult
+
+RESULT_COLUMNS = ["ISBN", "Kitap Adı", "Yazar", "Yayınevi", "Web Adresi", "Kaynak", "Süre (sn)", "ISBN-13"]
+COLUMN_WIDTHS = [20, 40, 30, 30, 40, 30, 10, 16]
+CSV_FIELDS = [
+    "input_isbn", "isbn", "found", "site", "title", "author", "publisher", "url", "error", "elapsed", "cached",
+]
+
+
+def result_to_row(result: SearchResult) -> list:
+    """Maps a record onto ``RESULT_COLUMNS``; misses keep their ISBN and show why in "Kaynak".
+
+    "ISBN" is the value from the input row (the searched ISBN if there was
+    none), "ISBN-13" the canonical form it was searched as.
+    """
+    isbn = result.input_isbn or result.isbn
+    if result.found:
+        return [isbn, result.title, result.author, result.publisher, result.url,
+                result.site, round(result.elapsed, 2), result.isbn]
+    return [isbn, NOT_FOUND, NOT_FOUND, NOT_FOUND, NOT_FOUND, result.error, round(result.elapsed, 2), result.isbn]
+
+
+def unique_output_path(directory: str, base_filename: str = "Arama_Sonuclari", extension: str = ".xlsx") -> str:
+    """Creates and returns an empty, timestamped file in ``directory`` for the results.
+
+    The file is created with exclusive mode, so two runs started in the
+    same second cannot pick the same name; a suffix is only tried then.
+    """
+    stem = os.path.join(directory, f"{base_filename}_{time.strftime('%Y%m%d_%H%M%S')}")
+    suffix = ""
+    for attempt in range(1, 1000):
+        output_path = f"{stem}{suffix}{extension}"
+        try:
+            with open(output_path, "x"):
+                return output_path
+        except FileExistsError:
+            suffix = f"_{attempt}"
+    raise FileExistsError(f"No free output file name for {stem}{extension}")
+
+
+class ResultSummary:
+    """Per-site hit counts and lookup times of the results passing through a writer.
+
+    Totals cover every row; the per-site figures and the mean time only
+    cover live lookups, i.e. rows that are not ``cached`` (cache, catalog,
+    repeated ISBNs and resumed rows are all marked so).
+
+    ``site_lookups``, if given, returns cumulative ``{site: lookups}`` (see
+    ``MultiSiteSearchService.site_lookup_counts``); it is read when the
+    summary starts and again in ``site_rows`` so that hit rates only count
+    the lookups made in between.
+    """
+
+    def __init__(self, site_lookups: Optional[Callable[[], Dict[str, int]]] = None):
+        self.total = 0
+        self.found = 0
+        self.cached = 0
+        self.live_found = 0
+        self.live_elapsed_total = 0.0
+        self._site_lookups = site_lookups
+        self._lookups_at_start = site_lookups() if site_lookups else {}
+        self._site_elapsed: Dict[str, array] = {}
+
+    def add(self, result: SearchResult):
+        self.total += 1
+        self.found += result.found
+        if result.cached:
+            self.cached += 1
+            return
+        self.live_elapsed_total += result.elapsed
+        if result.found:
+            self.live_found += 1
+            self._site_elapsed.setdefault(result.site or "", array("d")).append(result.elapsed)
+
+    @property
+    def live(self) -> int:
+        return self.total - self.cached
+
+    def site_rows(self) -> List[list]:
+        """``[site, hits, share of live hits, lookups, hit rate, mean s, p50 s, p95 s]`` per site, live rows only."""
+        lookups = {}
+        if self._site_lookups:
+            lookups = {
+                site: count - self._lookups_at_start.get(site, 0)
+                for site, count in self._site_lookups().items()
+            }
+        rows = []
+        for site in sorted(set(self._site_elapsed) | set(lookups)):
+            elapsed = sorted(self._site_elapsed.get(site, ()))
+            hits = len(elapsed)
+            site_lookups = lookups.get(site)
+            rows.append([
+                site,
+                hits,
+                hits / self.live_found if self.live_found else 0.0,
+                site_lookups if site_lookups is not None else "",
+                hits / site_lookups if site_lookups else "",
+                sum(elapsed) / hits if hits else "",
+                elapsed[(hits - 1) // 2] if hits else "",
+                elapsed[min(hits - 1, int(hits * 0.95))] if hits else "",
+            ])
+        return rows
+
+
+class ExcelResultWriter:
+    """Appends result rows to an .xlsx file as they arrive.
+
+    The workbook is opened in xlsxwriter's ``constant_memory`` mode, so each
+    row is flushed to disk once the next one is written and memory use does
+    not grow with the number of results. Misses are highlighted by one
+    conditional format spanning exactly the rows written, and an "Özet"
+    sheet with totals and per-site hit rates and timings (see
+    ``ResultSummary``) is added on ``close``.
+    """
+
+    def __init__(
+        self,
+        output_path: str,
+        sheet_name: str = "Sonuçlar",
+        site_lookups: Optional[Callable[[], Dict[str, int]]] = None,
+    ):
+        self.output_path = output_path
+        self.workbook = xlsxwriter.Workbook(output_path, {"constant_memory": True})
+        self.worksheet = self.workbook.add_worksheet(sheet_name)
+        self.summary_sheet = self.workbook.add_worksheet("Özet")
+        self.summary = ResultSummary(site_lookups)
+        self.red_format = self.workbook.add_format({"bg_color": "#FFC7CE", "font_color": "#9C0006"})
+        self.header_format = header_format = self.workbook.add_format({"bold": True, "border": 1})
+
+        for col, width in enumerate(COLUMN_WIDTHS):
+            self.worksheet.set_column(col, col, width)
+        # Header on the second row, data below it (same layout as before)
+        self.worksheet.write_row(1, 0, RESULT_COLUMNS, header_format)
+        self._next_row = 2
+        self.rows_written = 0
+
+    def write_row(self, row: List[str]):
+        self.worksheet.write_row(self._next_row, 0, row)
+        self._next_row += 1
+        self.rows_written += 1
+
+    def write_result(self, result: SearchResult):
+        self.write_row(result_to_row(result))
+        self.summary.add(result)
+
+    def _write_summary(self):
+        sheet = self.summary_sheet
+        summary = self.summary
+        percent = self.workbook.add_format({"num_format": "0.0%"})
+        seconds = self.workbook.add_format({"num_format": "0.00"})
+        totals = [
+            ("Toplam sonuç", summary.total, None),
+            ("Bulunan", summary.found, None),
+            ("Bulunamayan", summary.total - summary.found, None),
+            ("Bulunma oranı", summary.found / summary.total if summary.total else 0.0, percent),
+            ("Aramasız (önbellek, katalog, tekrar)", summary.cached, None),
+            ("Canlı arama", summary.live, None),
+            ("Ortalama arama süresi (sn)",
+             summary.live_elapsed_total / summary.live if summary.live else 0.0, seconds),
+        ]
+        sheet.set_column(0, 0, 34)
+        sheet.set_column(1, 7, 14)
+        for row, (label, value, cell_format) in enumerate(totals):
+            sheet.write(row, 0, label, self.header_format)
+            sheet.write(row, 1, value, cell_format)
+
+        top = len(totals) + 1
+        sheet.write_row(top, 0, [
+            "Site", "Canlı bulunan", "Bulunanlardaki pay", "Arama", "İsabet oranı",
+            "Ortalama (sn)", "p50 (sn)", "p95 (sn)",
+        ], self.header_format)
+        for offset, values in enumerate(summary.site_rows(), 1):
+            sheet.write_row(top + offset, 0, values[:2])
+            sheet.write(top + offset, 2, values[2], percent)
+            sheet.write(top + offset, 3, values[3])
+            sheet.write(top + offset, 4, values[4], percent)
+            for col in range(5, 8):
+                sheet.write(top + offset, col, values[col], seconds)
+
+    def close(self):
+        if self.rows_written:
+            self.worksheet.conditional_format(
+                xl_range(2, 1, self._next_row - 1, 4),
+                {"type": "text", "criteria": "containing", "value": NOT_FOUND, "format": self.red_format},
+            )
+        # constant_memory needs rows in order, so the summary is written once every result is in
+        self._write_summary()
+        self.workbook.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class _StreamResultWriter:
+    """Base for writers that emit text to a stream, one line per result.
+
+    A borrowed stream (e.g. stdout) is flushed after every row so results
+    show up live; with ``owns_stream`` the stream is a file that is left to
+    buffer and is closed with the writer.
+    """
+
+    def __init__(self, stream: TextIO, owns_stream: bool = False):
+        self.stream = stream
+        self.owns_stream = owns_stream
+        self.rows_written = 0
+
+    def _written(self):
+        if not self.owns_stream:
+            self.stream.flush()
+        self.rows_written += 1
+
+    def close(self):
+        if self.owns_stream:
+            self.stream.close()
+        else:
+            self.stream.flush()
+
+
+class CsvResultWriter(_StreamResultWriter):
+    """Writes result rows as CSV with a ``CSV_FIELDS`` header."""
+
+    def __init__(self, stream: TextIO, owns_stream: bool = False):
+        super().__init__(stream, owns_stream)
+        self._writer = csv.DictWriter(stream, fieldnames=CSV_FIELDS)
+        self._writer.writeheader()
+
+    def write_result(self, result: SearchResult):
+        self._writer.writerow(result.to_dict())
+        self._written()
+
+
+class JsonLinesResultWriter(_StreamResultWriter):
+    """Writes one JSON object per result."""
+
+    def write_result(self, result: SearchResult):
+        self.stream.write(json.dumps(result.to_dict(), ensure_ascii=False) + "\n")
+        self._written()
+
+
+class ParquetResultWriter:
+    """Writes results to a Parquet file in row groups of ``batch_size`` (needs ``pyarrow``)."""
+
+    def __init__(self, output_path: str, batch_size: int = 10000):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ValueError("Parquet çıktısı için 'pyarrow' paketi gerekli (pip install pyarrow)") from e
+        self._pa = pa
+        self.output_path = output_path
+        self.batch_size = batch_size
+        self.schema = pa.schema([
+            ("isbn", pa.string()), ("found", pa.bool_()), ("site", pa.string()), ("title", pa.string()),
+            ("author", pa.string()), ("publisher", pa.string()), ("url", pa.string()), ("error", pa.string()),
+            ("elapsed", pa.float64()), ("cached", pa.bool_()), ("input_isbn", pa.string()),
+        ])
+        self._writer = pq.ParquetWriter(output_path, self.schema)
+        self._batch = []
+        self.rows_written = 0
+
+    def write_result(self, result: SearchResult):
+        self._batch.append(result.to_dict())
+        self.rows_written += 1
+        if len(self._batch) >= self.batch_size:
+            self._flush()
+
+    def _flush(self):
+        if self._batch:
+            self._writer.write_table(self._pa.Table.from_pylist(self._batch, schema=self.schema))
+            self._batch = []
+
+    def close(self):
+        self._flush()
+        self._writer.close()
+
+
+def open_result_writer(output_path: str, site_lookups: Optional[Callable[[], Dict[str, int]]] = None):
+    """Returns the writer for ``output_path`` by extension: .xlsx, .csv, .parquet or .jsonl.
+
+    CSV and JSON Lines files are opened here and closed with the writer.
+    """
+    extension = os.path.splitext(output_path)[1].lower()
+    if extension == ".xlsx":
+        return ExcelResultWriter(output_path, site_lookups=site_lookups)
+    if extension == ".parquet":
+        return ParquetResultWriter(output_path)
+    if extension == ".csv":
+        # The BOM lets Excel open the file with Turkish characters intact
+        return CsvResultWriter(open(output_path, "w", encoding="utf-8-sig", newline=""), owns_stream=True)
+    if extension == ".jsonl":
+        return JsonLinesResultWriter(open(output_path, "w", encoding="utf-8"), owns_stream=True)
+    raise ValueError(f"Desteklenmeyen çıktı türü: {extension or output_path} (.xlsx, .csv, .parquet, .jsonl)")
+
+
+class TeeResultWriter:
+    """Hands every result to several writers, e.g. the output file and an on-screen store."""
+
+    def __init__(self, *writers):
+        self.writers = writers
+
+    def write_result(self, result: SearchResult):
+        for writer in self.writers:
+            writer.write_result(result)
+
+    def close(self):
+        for writer in self.writers:
+            writer.close()
@@ -0,0 +1,245 @@
+"""Per-stage timing histograms and event counters for the lookup hot path.
+
+Instrumented code calls ``telemetry.stage(name)`` around a step (or
+``observe`` with a measured duration) and ``telemetry.count`` for events
+such as cache hits. Each sample is labelled with the site being searched,
+which ``MultiSiteSearchService`` sets per thread with ``site_context`` so
+that shared code like the driver pool needs no site argument.
+
+Stages recorded today:
+
+``lookup``            whole ``search_first`` call (site: the one that found it)
+``cache_get``         result cache read
+``rate_limit_wait``   waiting for the site's token bucket / concurrency slot
+``static_fetch``      HTTP download of a page by a static scraper
+``static_parse``      BeautifulSoup parse of a fetched page
+``browser_lookup``    the Selenium scraper call, including everything below
+``driver_acquire``    waiting for a WebDriver from the pool
+``page_load``         ``driver.get`` (needs an event-firing driver, see ``create_chrome_driver``)
+``dom_wait``          ``find_element(s)`` calls, including implicit waits
+
+Histograms use fixed buckets, so recording is a lock plus a bisect and the
+data exports directly as Prometheus text or JSON.
+"""
+
+import json
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from contextlib import contextmanager
+from typing import Dict, Optional, Tuple
+
+# Upper bounds in seconds; everything slower lands in the implicit +Inf bucket
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+METRIC_PREFIX = "isbn_search"
+
+_local = threading.local()
+
+
+def current_site() -> str:
+    """The site the calling thread is searching, or ``""``."""
+    return getattr(_local, "site", "")
+
+
+@contextmanager
+def site_context(site_name: str):
+    """Labels everything recorded on this thread with ``site_name``."""
+    previous = current_site()
+    _local.site = site_name
+    try:
+        yield
+    finally:
+        _local.site = previous
+
+
+class Histogram:
+    """Bucketed distribution of durations; not thread-safe on its own."""
+
+    __slots__ = ("buckets", "counts", "count", "total", "max")
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other: "Histogram"):
+        for index, bucket_count in enumerate(other.counts):
+            self.counts[index] += bucket_count
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def quantile(self, q: float) -> float:
+        """Estimates a quantile by linear interpolation inside its bucket."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        cumulative = 0
+        for index, bucket_count in enumerate(self.counts):
+            if cumulative + bucket_count >= rank and bucket_count:
+                lower = self.buckets[index - 1] if index else 0.0
+                upper = self.buckets[index] if index < len(self.buckets) else self.max
+                return lower + (upper - lower) * (rank - cumulative) / bucket_count
+            cumulative += bucket_count
+        return self.max
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "sum": round(self.total, 6),
+            "mean": round(self.total / self.count, 6) if self.count else 0.0,
+            "max": round(self.max, 6),
+            "p50": round(self.quantile(0.5), 6),
+            "p95": round(self.quantile(0.95), 6),
+            "p99": round(self.quantile(0.99), 6),
+            "buckets": {
+                **{str(bound): count for bound, count in zip(self.buckets, self.counts)},
+                "+Inf": self.counts[-1],
+            },
+        }
+
+
+class Telemetry:
+    """Thread-safe registry of ``(stage, site)`` histograms and ``(event, site)`` counters."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS, enabled: bool = True):
+        self.buckets = buckets
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._histograms: Dict[Tuple[str, str], Histogram] = {}
+        self._events = Counter()
+
+    def observe(self, stage: str, seconds: float, site: Optional[str] = None):
+        if not self.enabled:
+            return
+        key = (stage, current_site() if site is None else site)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(self.buckets)
+            histogram.observe(seconds)
+
+    def count(self, event: str, site: Optional[str] = None, amount: int = 1):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._events[(event, current_site() if site is None else site)] += amount
+
+    @contextmanager
+    def stage(self, stage: str, site: Optional[str] = None):
+        """``with telemetry.stage("static_fetch"):`` times the block, even if it raises."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - started, site)
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._events.clear()
+
+    def drain(self) -> dict:
+        """Returns everything recorded so far as plain picklable data and starts over.
+
+        Worker processes ship this to the parent, which folds it into its
+        own registry with ``merge``.
+        """
+        with self._lock:
+            histograms, self._histograms = self._histograms, {}
+            events, self._events = self._events, Counter()
+        return {
+            "histograms": {
+                key: (histogram.counts, histogram.count, histogram.total, histogram.max)
+                for key, histogram in histograms.items()
+            },
+            "events": dict(events),
+        }
+
+    def merge(self, state: dict):
+        """Adds a ``drain`` result from another registry (with the same buckets) to this one."""
+        with self._lock:
+            for key, (counts, count, total, maximum) in state["histograms"].items():
+                histogram = self._histograms.get(key)
+                if histogram is None:
+                    histogram = self._histograms[key] = Histogram(self.buckets)
+                for index, bucket_count in enumerate(counts):
+                    histogram.counts[index] += bucket_count
+                histogram.count += count
+                histogram.total += total
+                histogram.max = max(histogram.max, maximum)
+            self._events.update(state["events"])
+
+    def stage_totals(self) -> Dict[str, Histogram]:
+        """Every stage's histogram summed over all sites."""
+        totals = {}
+        with self._lock:
+            for (stage, _), histogram in self._histograms.items():
+                totals.setdefault(stage, Histogram(self.buckets)).merge(histogram)
+        return totals
+
+    def snapshot(self) -> dict:
+        """``{"stages": {stage: {site: histogram}}, "events": {event: {site: n}}}``."""
+        with self._lock:
+            stages = {}
+            for (stage, site), histogram in sorted(self._histograms.items()):
+                stages.setdefault(stage, {})[site or "-"] = histogram.to_dict()
+            events = {}
+            for (event, site), value in sorted(self._events.items()):
+                events.setdefault(event, {})[site or "-"] = value
+        return {"stages": stages, "events": events}
+
+    def to_prometheus(self) -> str:
+        """Renders everything in the Prometheus text exposition format."""
+        stage_metric = f"{METRIC_PREFIX}_stage_seconds"
+        event_metric = f"{METRIC_PREFIX}_events_total"
+        lines = [
+            f"# HELP {stage_metric} Time spent in each stage of an ISBN lookup.",
+            f"# TYPE {stage_metric} histogram",
+        ]
+        with self._lock:
+            histograms = sorted(self._histograms.items())
+            events = sorted(self._events.items())
+            for (stage, site), histogram in histograms:
+                labels = f'stage="{stage}",site="{_escape(site)}"'
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets, histogram.counts):
+                    cumulative += bucket_count
+                    lines.append(f'{stage_metric}_bucket{{{labels},le="{bound}"}} {cumulative}')
+                lines.append(f'{stage_metric}_bucket{{{labels},le="+Inf"}} {histogram.count}')
+                lines.append(f"{stage_metric}_sum{{{labels}}} {histogram.total:.6f}")
+                lines.append(f"{stage_metric}_count{{{labels}}} {histogram.count}")
+        lines += [
+            f"# HELP {event_metric} Lookup events such as cache hits and misses.",
+            f"# TYPE {event_metric} counter",
+        ]
+        for (event, site), value in events:
+            lines.append(f'{event_metric}{{event="{event}",site="{_escape(site)}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+    def export(self, path: str):
+        """Writes Prometheus text for ``.prom``/``.txt`` paths and JSON otherwise."""
+        if path.endswith((".prom", ".txt")):
+            text = self.to_prometheus()
+        else:
+            text = json.dumps(self.snapshot(), ensure_ascii=False, indent=2) + "\n"
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+# Process-wide instance shared by every instrumented module
+telemetry = Telemetry()
@@ -0,0 +1,63 @@
+"""Coalesces worker-thread updates so the UI can pick them up at a fixed frame rate."""
+
+import threading
+from collections import deque
+from typing import NamedTuple, Optional
+
+DEFAULT_LOG_LINES = 500
+
+
+class UiFrame(NamedTuple):
+    """What changed since the previous ``UiFeed.drain``; ``None`` means unchanged."""
+
+    progress: Optional[object]
+    log_text: Optional[str]
+
+
+class UiFeed:
+    """Thread-safe mailbox between background workers and a UI timer.
+
+    Workers call ``post_progress`` and ``post_log`` as often as they like;
+    only the latest progress survives and the log keeps its last
+    ``log_lines`` lines in a ring buffer. The UI thread calls ``drain`` from
+    a timer, so the event loop sees at most one update per frame however
+    fast results arrive, and the log control never grows without bound.
+    """
+
+    def __init__(self, log_lines: int = DEFAULT_LOG_LINES):
+        self._lock = threading.Lock()
+        self._lines = deque(maxlen=log_lines)
+        self._partial = ""
+        self._log_dirty = False
+        self._progress = None
+
+    def post_progress(self, progress):
+        with self._lock:
+            self._progress = progress
+
+    def post_log(self, message: str):
+        """Appends ``message``; text after the last newline waits for the rest of its line."""
+        with self._lock:
+            lines = (self._partial + message).split("\n")
+            self._partial = lines.pop()
+            self._lines.extend(lines)
+            self._log_dirty = True
+
+    def clear(self):
+        with self._lock:
+            self._lines.clear()
+            self._partial = ""
+            self._progress = None
+            self._log_dirty = True
+
+    def drain(self) -> UiFrame:
+        with self._lock:
+            progress, self._progress = self._progress, None
+            log_text = None
+            if self._log_dirty:
+                self._log_dirty = False
+                log_text = "\n".join(self._lines)
+                if self._lines:
+                    log_text += "\n"
+                log_text += self._partial
+        return UiFrame(progress, log_text)
@@ -0,0 +1,408 @@
+"""Elastic, self-healing pool of Selenium WebDrivers."""
+
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Optional
+
+from src.utils.telemetry import telemetry
+
+try:
+    import psutil
+except ImportError:  # RSS based recycling is skipped without psutil
+    psutil = None
+
+logger = logging.getLogger(__name__)
+
+# Pause between attempts to start a driver after one failed
+SPAWN_RETRY_DELAY = 1.0
+
+
+class DriverStartError(RuntimeError):
+    """Raised by ``ElasticDriverPool.acquire`` once starting drivers keeps failing."""
+
+
+def _timing_listener():
+    """Event listener recording ``page_load`` and ``dom_wait`` telemetry stages."""
+    from selenium.webdriver.support.events import AbstractEventListener
+
+    class TimingListener(AbstractEventListener):
+        def __init__(self):
+            self._local = threading.local()
+
+        def _start(self, stage):
+            self._local.pending = (stage, time.perf_counter())
+
+        def _finish(self):
+            pending = getattr(self._local, "pending", None)
+            if pending is not None:
+                self._local.pending = None
+                telemetry.observe(pending[0], time.perf_counter() - pending[1])
+
+        def before_navigate_to(self, url, driver):
+            self._start("page_load")
+
+        def after_navigate_to(self, url, driver):
+            self._finish()
+
+        def before_find(self, by, value, driver):
+            self._start("dom_wait")
+
+        def after_find(self, by, value, driver):
+            self._finish()
+
+        def on_exception(self, exception, driver):
+            # A timed-out find still spent its implicit wait
+            self._finish()
+
+    return TimingListener()
+
+
+def create_chrome_driver(headless: bool = True, trace: bool = False):
+    """Default driver factory: a lean Chrome instance.
+
+    With ``trace`` the driver is wrapped in an ``EventFiringWebDriver`` so
+    page loads and element lookups show up in the telemetry. The wrapper
+    adds a listener call around every navigation and find, so it is only
+    meant for profiling and metrics runs.
+    """
+    from selenium import webdriver
+
+    options = webdriver.ChromeOptions()
+    if headless:
+        options.add_argument("--headless=new")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--disable-extensions")
+    options.add_argument("--blink-settings=imagesEnabled=false")
+    options.page_load_strategy = "eager"
+    driver = webdriver.Chrome(options=options)
+    if trace:
+        from selenium.webdriver.support.events import EventFiringWebDriver
+
+        driver = EventFiringWebDriver(driver, _timing_listener())
+    return driver
+
+
+def driver_rss_mb(driver) -> float:
+    """Resident memory of the driver's browser process tree, in MB."""
+    if psutil is None:
+        return 0.0
+    try:
+        process = psutil.Process(driver.service.process.pid)
+        processes = [process, *process.children(recursive=True)]
+        return sum(p.memory_info().rss for p in processes) / (1024 * 1024)
+    except (AttributeError, psutil.Error):
+        return 0.0
+
+
+class _DriverInfo:
+    __slots__ = ("created_at", "last_used", "pages")
+
+    def __init__(self):
+        self.created_at = self.last_used = time.monotonic()
+        self.pages = 0
+
+
+class ElasticDriverPool:
+    """WebDriver pool that grows and shrinks between ``min_size`` and ``max_size``.
+
+    A new driver is started only when a caller is waiting and the pool is
+    below ``max_size``; drivers idle longer than ``idle_timeout`` are closed
+    down to ``min_size``. Each driver is recycled after ``max_pages`` lookups
+    or once its browser tree exceeds ``max_rss_mb``, and is health-checked
+    before being lent out so a hung or crashed browser is replaced instead
+    of handed to a scraper. Follows the ``DriverPool`` contract
+    (``acquire``/``release``/``close``) so it can be passed to
+    ``ISBNSearchService`` unchanged.
+
+    If the driver factory fails ``max_spawn_failures`` times in a row (e.g.
+    chromedriver is missing), ``acquire`` raises ``DriverStartError`` with
+    the factory's exception as the cause instead of retrying forever; a
+    later successful start resets the count.
+
+    ``trace`` makes the default factory start event-firing drivers that
+    record ``page_load``/``dom_wait`` telemetry; it is ignored when a
+    ``driver_factory`` is given.
+    """
+
+    def __init__(
+        self,
+        min_size: int = 1,
+        max_size: int = 4,
+        headless: bool = True,
+        max_pages: int = 200,
+        max_rss_mb: Optional[float] = 1024,
+        idle_timeout: float = 120.0,
+        driver_factory: Optional[Callable[[], object]] = None,
+        max_spawn_failures: int = 3,
+        trace: bool = False,
+    ):
+        if not 0 <= min_size <= max_size or max_size < 1:
+            raise ValueError("Pool sizes must satisfy 0 <= min_size <= max_size and max_size >= 1")
+        self.min_size = min_size
+        self.max_size = max_size
+        self.max_pages = max_pages
+        self.max_rss_mb = max_rss_mb
+        self.idle_timeout = idle_timeout
+        self.driver_factory = driver_factory or (lambda: create_chrome_driver(headless, trace))
+        self.max_spawn_failures = max_spawn_failures
+
+        self._cond = threading.Condition()
+        self._local = threading.local()
+        self._idle = deque()
+        self._info = {}
+        self._starting = 0
+        self._waiting = 0
+        self._closed = False
+        # Consecutive driver starts that failed, and the last failure
+        self._spawn_failures = 0
+        self._spawn_error: Optional[BaseException] = None
+
+        self._created = 0
+        self._recycled = 0
+        self._health_failures = 0
+        self._acquires = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._retired_lifetime_total = 0.0
+        self._retired = 0
+
+    # -- lifecycle -------------------------------------------------------
+
+    def warm_up(self, background: bool = True):
+        """Starts drivers until the pool holds ``min_size`` of them."""
+        def fill():
+            while True:
+                with self._cond:
+                    if self._closed or len(self._info) + self._starting >= self.min_size:
+                        return
+                    self._starting += 1
+                if not self._spawn_idle():
+                    return  # Give up warming; acquire() will retry on demand
+
+        if background:
+            threading.Thread(target=fill, name="driver-pool-warmup", daemon=True).start()
+        else:
+            fill()
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            drivers = list(self._info)
+            self._idle.clear()
+            self._info.clear()
+            self._cond.notify_all()
+        for driver in drivers:
+            self._quit(driver)
+
+    # -- lending ---------------------------------------------------------
+
+    def acquire(self, timeout: Optional[float] = None):
+        """Returns a healthy driver, starting a new one if the pool may grow.
+
+        Raises ``TimeoutError`` once ``timeout`` passes and
+        ``DriverStartError`` when drivers keep failing to start.
+        """
+        started = time.monotonic()
+        deadline = None if timeout is None else started + timeout
+        while True:
+            driver = None
+            spawn = False
+            with self._cond:
+                self._waiting += 1
+                try:
+                    while True:
+                        if self._closed:
+                            raise RuntimeError("Driver pool is closed")
+                        if self._idle:
+                            driver = self._idle.pop()
+                            break
+                        if len(self._info) + self._starting < self.max_size:
+                            self._starting += 1
+                            spawn = True
+                            break
+                        remaining = None if deadline is None else deadline - time.monotonic()
+                        if remaining is not None and remaining <= 0:
+                            raise TimeoutError("Timed out waiting for a WebDriver")
+                        self._cond.wait(remaining)
+                finally:
+                    self._waiting -= 1
+
+            if spawn:
+                driver = self._spawn()
+                if driver is None:
+                    self._after_spawn_failure(deadline)
+                    continue
+            elif not self._is_healthy(driver):
+                self._retire(driver, recycled=False)
+                continue
+
+            waited = time.monotonic() - started
+            telemetry.observe("driver_acquire", waited)
+            self._local.wait_total = self.thread_wait_total() + waited
+            with self._cond:
+                self._acquires += 1
+                self._wait_total += waited
+                self._wait_max = max(self._wait_max, waited)
+            return driver
+
+    def thread_wait_total(self) -> float:
+        """Seconds the calling thread has spent in ``acquire`` so far.
+
+        Lets a caller timing a browser lookup take the wait for a driver out
+        of the site's response time.
+        """
+        return getattr(self._local, "wait_total", 0.0)
+
+    def release(self, driver):
+        """Returns a driver; it is recycled if it has served enough pages or grown too large."""
+        with self._cond:
+            info = self._info.get(driver)
+            if info is None:
+                return
+            info.pages += 1
+            info.last_used = time.monotonic()
+            worn_out = info.pages >= self.max_pages
+
+        if worn_out or (self.max_rss_mb and driver_rss_mb(driver) > self.max_rss_mb):
+            self._retire(driver, recycled=True)
+            self.warm_up()
+            return
+
+        with self._cond:
+            closed = self._closed
+            if not closed:
+                self._idle.append(driver)
+                self._cond.notify()
+            expired = self._pop_expired_idle()
+        if closed:
+            self._quit(driver)
+        for idle_driver in expired:
+            self._retire(idle_driver, recycled=False)
+
+    @contextmanager
+    def driver(self, timeout: Optional[float] = None):
+        """``with pool.driver() as driver:`` convenience wrapper."""
+        driver = self.acquire(timeout)
+        try:
+            yield driver
+        finally:
+            self.release(driver)
+
+    # -- stats -----------------------------------------------------------
+
+    def stats(self) -> dict:
+        with self._cond:
+            now = time.monotonic()
+            live_lifetimes = [now - info.created_at for info in self._info.values()]
+            return {
+                "size": len(self._info),
+                "idle": len(self._idle),
+                "in_use": len(self._info) - len(self._idle),
+                "starting": self._starting,
+                "waiting": self._waiting,
+                "created": self._created,
+                "recycled": self._recycled,
+                "health_check_failures": self._health_failures,
+                "acquires": self._acquires,
+                "avg_wait_s": self._wait_total / self._acquires if self._acquires else 0.0,
+                "max_wait_s": self._wait_max,
+                "avg_retired_lifetime_s": (
+                    self._retired_lifetime_total / self._retired if self._retired else 0.0
+                ),
+                "max_live_lifetime_s": max(live_lifetimes, default=0.0),
+            }
+
+    # -- internals -------------------------------------------------------
+
+    def _spawn(self):
+        """Starts a driver for a caller that reserved a slot in ``_starting``."""
+        try:
+            driver = self.driver_factory()
+        except Exception as e:
+            logger.exception("WebDriver could not be started")
+            with self._cond:
+                self._starting -= 1
+                self._spawn_failures += 1
+                self._spawn_error = e
+                self._cond.notify()
+            return None
+        with self._cond:
+            self._starting -= 1
+            self._spawn_failures = 0
+            self._spawn_error = None
+            if self._closed:
+                driver_to_quit = driver
+            else:
+                self._info[driver] = _DriverInfo()
+                self._created += 1
+                driver_to_quit = None
+        if driver_to_quit is not None:
+            self._quit(driver_to_quit)
+            return None
+        return driver
+
+    def _after_spawn_failure(self, deadline: Optional[float]):
+        """Raises once starts keep failing or ``deadline`` has passed; else waits before a retry."""
+        with self._cond:
+            failures, error = self._spawn_failures, self._spawn_error
+        if failures >= self.max_spawn_failures:
+            raise DriverStartError(f"WebDriver could not be started ({failures} attempts in a row)") from error
+        delay = SPAWN_RETRY_DELAY
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError("Timed out waiting for a WebDriver") from error
+            delay = min(delay, remaining)
+        time.sleep(delay)
+
+    def _spawn_idle(self) -> bool:
+        driver = self._spawn()
+        if driver is None:
+            return False
+        with self._cond:
+            self._idle.append(driver)
+            self._cond.notify()
+        return True
+
+    def _is_healthy(self, driver) -> bool:
+        try:
+            driver.execute_script("return 1")
+            return True
+        except Exception:
+            with self._cond:
+                self._health_failures += 1
+            return False
+
+    def _pop_expired_idle(self):
+        """Removes idle drivers past ``idle_timeout`` while above ``min_size`` (lock held)."""
+        expired = []
+        now = time.monotonic()
+        while self._idle and len(self._info) - len(expired) > self.min_size and self._waiting == 0:
+            oldest = self._idle[0]
+            if now - self._info[oldest].last_used < self.idle_timeout:
+                break
+            expired.append(self._idle.popleft())
+        return expired
+
+    def _retire(self, driver, recycled: bool):
+        with self._cond:
+            info = self._info.pop(driver, None)
+            if info is not None:
+                self._retired += 1
+                self._retired_lifetime_total += time.monotonic() - info.created_at
+                if recycled:
+                    self._recycled += 1
+            self._cond.notify()
+        self._quit(driver)
+
+    @staticmethod
+    def _quit(driver):
+        try:
+            driver.quit()
+        except Exception:
+            logger.debug("WebDriver quit failed", exc_info=True)
@@ -0,0 +1,180 @@
+import dataclasses
+import threading
+import time
+
+from src.result_model import SearchResult
+from src.services import bulk_pipeline
+from src.services.bulk_pipeline import BulkPipeline
+from src.services.bulk_search import BulkSearchEngine
+from src.services.job_journal import JobJournal
+from src.utils.catalog import CatalogEntry
+
+# (ISBN-13, the same book as ISBN-10)
+BOOKS = [
+    ("9780306406157", "0306406152"),
+    ("9789750719387", "9750719387"),
+    ("9780804429573", "080442957X"),
+]
+
+
+class ListWriter:
+    def __init__(self):
+        self.rows = []
+
+    def write_result(self, result):
+        self.rows.append(result)
+
+    def close(self):
+        pass
+
+
+class FakeSearch:
+    """Finds every ISBN whose last digit is odd; counts the lookups per ISBN."""
+
+    def __init__(self):
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def __call__(self, isbn):
+        with self._lock:
+            self.calls.append(isbn)
+        if int(isbn[-1]) % 2:
+            return SearchResult(isbn=isbn, found=True, site="Babil", title=f"Kitap {isbn}")
+        return SearchResult.not_found(isbn, "Bulunamadı")
+
+
+def isbn13(number):
+    first12 = f"978605{number:06d}"
+    total = sum(int(d) * (1 if i % 2 == 0 else 3) for i, d in enumerate(first12))
+    return first12 + str((10 - total % 10) % 10)
+
+
+class FakeCatalog:
+    def __init__(self, isbns, age=0.0):
+        self.isbns = set(isbns)
+        self.age = age
+
+    def get(self, isbn):
+        if isbn not in self.isbns:
+            return None
+        record = SearchResult(isbn=isbn, found=True, site="Babil", title="Katalogdan", cached=True)
+        return CatalogEntry(record, time.time() - self.age)
+
+
+def write_csv(path, values):
+    path.write_text("ISBN\n" + "".join(f"{value}\n" for value in values), encoding="utf-8")
+    return str(path)
+
+
+def run_pipeline(tmp_path, values, search=None, **pipeline_options):
+    search = search or FakeSearch()
+    engine = BulkSearchEngine(search, max_workers=2)
+    writer = ListWriter()
+    pipeline = BulkPipeline(engine, writer, chunk_size=4, **pipeline_options)
+    stats = pipeline.run(write_csv(tmp_path / "input.csv", values))
+    return stats, writer.rows, search
+
+
+def test_repeated_books_are_searched_once_and_fanned_out(tmp_path):
+    values = [BOOKS[0][0], BOOKS[1][1], BOOKS[0][1], "978-0-306-40615-7", BOOKS[1][0], BOOKS[2][1]]
+    stats, rows, search = run_pipeline(tmp_path, values)
+
+    assert sorted(search.calls) == sorted([BOOKS[0][0], BOOKS[1][0], BOOKS[2][0]])
+    assert stats.looked_up == 3
+    assert stats.duplicates == 3
+    assert [row.input_isbn for row in rows] == values
+    assert [row.isbn for row in rows] == [BOOKS[0][0], BOOKS[1][0], BOOKS[0][0], BOOKS[0][0], BOOKS[1][0],
+                                          BOOKS[2][0]]
+    assert [row.found for row in rows] == [True, True, True, True, True, True]
+    assert [row.cached for row in rows] == [False, False, True, True, True, False]
+
+
+def test_rows_are_written_in_input_order_despite_uneven_lookups(tmp_path):
+    values = [isbn13(number) for number in range(300)]
+
+    def search(isbn):
+        time.sleep(0.005 if int(isbn[-2]) % 2 else 0)
+        return SearchResult.not_found(isbn, "Bulunamadı")
+
+    engine = BulkSearchEngine(search, max_workers=4)
+    writer = ListWriter()
+    BulkPipeline(engine, writer, chunk_size=64).run(write_csv(tmp_path / "input.csv", values))
+    assert [row.isbn for row in writer.rows] == values
+
+
+def test_invalid_rows_are_counted_not_written(tmp_path):
+    values = [BOOKS[0][0], "not an isbn", "9780306406150", BOOKS[1][1]]
+    stats, rows, _ = run_pipeline(tmp_path, values)
+
+    assert [row.input_isbn for row in rows] == [BOOKS[0][0], BOOKS[1][1]]
+    assert (stats.valid, stats.invalid) == (2, 2)
+    assert "not an isbn" in stats.invalid_samples
+
+
+def test_catalog_rows_wait_behind_a_slow_lookup_instead_of_piling_up(tmp_path):
+    values = [isbn13(number) for number in range(20000)]
+    release = threading.Event()
+    buffered_while_blocked = []
+    pipeline = None
+
+    def search(isbn):
+        if isbn == values[0]:
+            # Give the reader every chance to run ahead, then look at what it holds
+            time.sleep(0.2)
+            buffered_while_blocked.append(len(pipeline._row_inputs))
+            release.set()
+        return SearchResult.not_found(isbn, "Bulunamadı")
+
+    engine = BulkSearchEngine(search, max_workers=2, max_buffered=100)
+    writer = ListWriter()
+    pipeline = BulkPipeline(engine, writer, chunk_size=1000, catalog=FakeCatalog(values[1:]))
+    stats = pipeline.run(write_csv(tmp_path / "input.csv", values))
+
+    assert buffered_while_blocked and buffered_while_blocked[0] <= 101
+    assert (stats.looked_up, stats.from_catalog) == (1, 19999)
+    assert [row.input_isbn for row in writer.rows] == values
+    assert len(pipeline._row_inputs) == 0 and not pipeline._in_flight
+    assert len(pipeline._recent) <= bulk_pipeline.RECENT_RESULTS
+
+
+def test_stale_catalog_record_is_kept_when_the_refresh_misses(tmp_path):
+    # FakeSearch finds odd last digits only
+    found = BOOKS[0][0]
+    missing = next(isbn for isbn in map(isbn13, range(100)) if int(isbn[-1]) % 2 == 0)
+    catalog = FakeCatalog([found, missing], age=1000)
+    stats, rows, search = run_pipeline(tmp_path, [found, missing], catalog=catalog, catalog_max_age=10)
+
+    assert sorted(search.calls) == sorted([found, missing])
+    assert stats.refreshed == 2
+    assert rows[0].title == f"Kitap {found}" and not rows[0].cached
+    assert rows[1].found and rows[1].title == "Katalogdan"
+
+
+def test_interrupted_job_resumes_from_its_journal(tmp_path):
+    values = [isbn13(number) for number in range(40)] + [BOOKS[0][1]]
+    input_path = write_csv(tmp_path / "input.csv", values)
+    journal_dir = str(tmp_path / "jobs")
+
+    # First run: stopped after 15 rows
+    engine = BulkSearchEngine(FakeSearch(), max_workers=2)
+    first_writer = ListWriter()
+    first_writer.write_result = lambda row: (
+        first_writer.rows.append(row), len(first_writer.rows) == 15 and engine.cancel()
+    )
+    journal = JobJournal.for_input(input_path, journal_dir)
+    BulkPipeline(engine, first_writer, chunk_size=8, journal=journal).run(input_path)
+    journal.close()
+
+    # Second run: replays the journaled rows and searches only the rest
+    journal = JobJournal.for_input(input_path, journal_dir)
+    assert journal.completed == 15
+    search = FakeSearch()
+    writer = ListWriter()
+    pipeline = BulkPipeline(BulkSearchEngine(search, max_workers=2), writer, chunk_size=8, journal=journal)
+    stats = pipeline.run(input_path)
+
+    assert stats.resumed == 15
+    assert set(search.calls) == {isbn13(number) for number in range(15, 40)} | {BOOKS[0][0]}
+    assert [row.input_isbn for row in writer.rows] == values
+    assert writer.rows[:15] == [dataclasses.replace(row, cached=True) for row in first_writer.rows[:15]]
+    assert journal.completed == len(values)
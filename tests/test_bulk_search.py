@@ -0,0 +1,97 @@
+import random
+import threading
+import time
+
+from src.result_model import SearchResult
+from src.services.bulk_search import BulkSearchEngine
+
+
+class SlowSearch:
+    """Sleeps a random few milliseconds per lookup and tracks the peak concurrency."""
+
+    def __init__(self, seed=0):
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.active = 0
+        self.peak = 0
+
+    def __call__(self, isbn):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            delay = self._random.uniform(0, 0.01)
+        time.sleep(delay)
+        with self._lock:
+            self.active -= 1
+        return SearchResult(isbn=isbn, found=int(isbn) % 2 == 1)
+
+
+def counting(items, consumed):
+    for item in items:
+        consumed.append(item)
+        yield item
+
+
+def test_results_come_back_in_input_order():
+    isbns = [str(number) for number in range(200)]
+    engine = BulkSearchEngine(SlowSearch(), max_workers=4)
+    results = list(engine.run(isbns))
+    assert [result.index for result in results] == list(range(200))
+    assert [result.isbn for result in results] == isbns
+
+
+def test_lookups_in_flight_and_read_ahead_are_bounded():
+    search = SlowSearch()
+    consumed = []
+    engine = BulkSearchEngine(search, max_workers=3, max_pending=5)
+    for result in engine.run(counting((str(number) for number in range(100)), consumed)):
+        # The window, plus at most one item read while every slot was taken
+        assert len(consumed) - result.index <= engine.max_pending + 1
+    assert search.peak <= 3
+
+
+def test_resolved_rows_keep_their_place_and_respect_max_buffered():
+    consumed = []
+    items = []
+    for number in range(60):
+        if number % 3:
+            record = SearchResult(isbn=str(number), found=True, site="Katalog")
+            items.append(lambda record=record: record)
+        else:
+            items.append(str(number))
+    engine = BulkSearchEngine(SlowSearch(), max_workers=2, max_buffered=10)
+    results = []
+    for result in engine.run(counting(items, consumed)):
+        assert len(consumed) - result.index <= engine.max_buffered + 1
+        results.append(result)
+
+    assert [result.isbn for result in results] == [str(number) for number in range(60)]
+    assert [result.searched for result in results] == [number % 3 == 0 for number in range(60)]
+
+
+def test_progress_counts_lookups_only():
+    reports = []
+    items = ["1", lambda: SearchResult(isbn="2", found=True), "3", "4"]
+    engine = BulkSearchEngine(SlowSearch(), max_workers=2, progress_callback=reports.append)
+    list(engine.run(items))
+    assert reports[-1] == (3, 2, 1)
+
+
+def test_cancel_stops_yielding():
+    engine = BulkSearchEngine(SlowSearch(), max_workers=2)
+    seen = []
+    for result in engine.run(str(number) for number in range(1000)):
+        seen.append(result)
+        if len(seen) == 10:
+            engine.cancel()
+    assert len(seen) == 10
+    assert engine.cancelled
+
+
+def test_failed_lookup_becomes_a_miss():
+    def search(isbn):
+        raise RuntimeError("boom")
+
+    results = list(BulkSearchEngine(search, max_workers=1).run(["1"]))
+    assert not results[0].record.found
+    assert "boom" in results[0].record.error
@@ -0,0 +1,19 @@
+import pytest
+
+from src import cli
+
+
+def test_bulk_rejects_a_missing_file(tmp_path, capsys):
+    with pytest.raises(SystemExit) as excinfo:
+        cli.main(["bulk", str(tmp_path / "missing.xlsx")])
+    assert excinfo.value.code == 2
+    assert "Dosya bulunamadı" in capsys.readouterr().err
+
+
+def test_bulk_rejects_an_unsupported_file(tmp_path, capsys):
+    path = tmp_path / "isbns.pdf"
+    path.write_bytes(b"%PDF")
+    with pytest.raises(SystemExit) as excinfo:
+        cli.main(["bulk", str(path)])
+    assert excinfo.value.code == 2
+    assert "Desteklenmeyen dosya türü: .pdf" in capsys.readouterr().err
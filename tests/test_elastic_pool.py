@@ -0,0 +1,69 @@
+import time
+
+import pytest
+
+from src.webdriver import elastic_pool
+from src.webdriver.elastic_pool import DriverStartError, ElasticDriverPool
+
+
+class FakeDriver:
+    def execute_script(self, script):
+        return 1
+
+    def quit(self):
+        pass
+
+
+def failing_factory():
+    raise FileNotFoundError("chromedriver")
+
+
+@pytest.fixture(autouse=True)
+def fast_retries(monkeypatch):
+    monkeypatch.setattr(elastic_pool, "SPAWN_RETRY_DELAY", 0.01)
+
+
+def test_acquire_raises_when_drivers_keep_failing_to_start():
+    pool = ElasticDriverPool(min_size=0, max_size=2, driver_factory=failing_factory)
+    with pytest.raises(DriverStartError) as excinfo:
+        pool.acquire(timeout=3)
+    assert isinstance(excinfo.value.__cause__, FileNotFoundError)
+    pool.close()
+
+
+def test_acquire_honours_its_deadline_while_starts_fail(monkeypatch):
+    monkeypatch.setattr(elastic_pool, "SPAWN_RETRY_DELAY", 0.05)
+    pool = ElasticDriverPool(min_size=0, max_size=2, driver_factory=failing_factory, max_spawn_failures=1000)
+    started = time.monotonic()
+    with pytest.raises(TimeoutError):
+        pool.acquire(timeout=0.3)
+    assert time.monotonic() - started < 2
+    pool.close()
+
+
+def test_a_successful_start_resets_the_failure_count():
+    attempts = []
+
+    def flaky_factory():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise OSError("busy")
+        return FakeDriver()
+
+    pool = ElasticDriverPool(min_size=0, max_size=2, driver_factory=flaky_factory)
+    driver = pool.acquire(timeout=3)
+    assert isinstance(driver, FakeDriver)
+    assert pool._spawn_failures == 0
+    pool.release(driver)
+    pool.close()
+
+
+def test_default_factory_starts_untraced_drivers_unless_asked(monkeypatch):
+    started = []
+    monkeypatch.setattr(
+        elastic_pool, "create_chrome_driver", lambda headless, trace: started.append(trace) or FakeDriver()
+    )
+    for pool in (ElasticDriverPool(min_size=0, max_size=1), ElasticDriverPool(min_size=0, max_size=1, trace=True)):
+        pool.release(pool.acquire(timeout=3))
+        pool.close()
+    assert started == [False, True]
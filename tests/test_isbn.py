@@ -0,0 +1,88 @@
+import random
+
+import pandas as pd
+import pytest
+
+from src.utils.isbn import canonicalize_isbn, canonicalize_series, clean_isbn, validate_isbn
+
+
+def isbn13_check_digit(first12):
+    total = sum(int(d) * (1 if i % 2 == 0 else 3) for i, d in enumerate(first12))
+    return str((10 - total % 10) % 10)
+
+
+def isbn10_check_digit(first9):
+    check = (11 - sum((10 - i) * int(d) for i, d in enumerate(first9)) % 11) % 11
+    return "X" if check == 10 else str(check)
+
+
+def test_clean_isbn_strips_separators_and_excel_suffix():
+    assert clean_isbn(" 978-975-07-1938-7 ") == "9789750719387"
+    assert clean_isbn("9789750719387.0") == "9789750719387"
+    assert clean_isbn("080442957x") == "080442957X"
+
+
+@pytest.mark.parametrize("isbn", ["9789750719387", "978-0-306-40615-7", "9790000000001"])
+def test_valid_isbn13_is_kept(isbn):
+    assert canonicalize_isbn(isbn) == isbn.replace("-", "")
+    assert validate_isbn(isbn) == (True, "")
+
+
+@pytest.mark.parametrize("isbn", ["9789750719388", "9780306406150", "9770306406157"])
+def test_isbn13_with_bad_checksum_or_prefix_is_rejected(isbn):
+    assert canonicalize_isbn(isbn) is None
+    assert not validate_isbn(isbn)[0]
+
+
+@pytest.mark.parametrize("isbn10, isbn13", [
+    ("0306406152", "9780306406157"),
+    ("0-8044-2957-X", "9780804429573"),
+    ("975-07-1938-7", "9789750719387"),
+])
+def test_isbn10_is_converted_to_isbn13(isbn10, isbn13):
+    assert canonicalize_isbn(isbn10) == isbn13
+    assert validate_isbn(isbn10) == (True, "")
+
+
+@pytest.mark.parametrize("isbn", ["0306406153", "X306406152", "03064061X2", "978975071938X"])
+def test_isbn10_with_bad_checksum_or_misplaced_x_is_rejected(isbn):
+    assert canonicalize_isbn(isbn) is None
+    assert not validate_isbn(isbn)[0]
+
+
+@pytest.mark.parametrize("isbn", ["０３０６４０６１５２", "978０３０６４０６１５7", "٩٧٨٠٣٠٦٤٠٦١٥٧"])
+def test_non_ascii_digits_are_rejected(isbn):
+    assert canonicalize_isbn(isbn) is None
+    assert validate_isbn(isbn)[0] is False
+    assert canonicalize_series(pd.Series([isbn])).isna().all()
+
+
+def test_validate_isbn_messages():
+    assert "10 veya 13" in validate_isbn("12345")[1]
+    assert "rakam" in validate_isbn("97897507193A7")[1]
+    assert "kontrol" in validate_isbn("9789750719388")[1]
+
+
+def test_series_matches_scalar_version():
+    rng = random.Random(7)
+    values = ["", "abc", "9789750719387.0", " 978-975-07-1938-7", "080442957x", "０３０６４０６１５２"]
+    for _ in range(500):
+        first12 = f"978{rng.randrange(10 ** 9):09d}"
+        first9 = f"{rng.randrange(10 ** 9):09d}"
+        values += [
+            first12 + isbn13_check_digit(first12),
+            first12 + str(rng.randrange(10)),
+            first9 + isbn10_check_digit(first9),
+            first9 + rng.choice("0123456789X"),
+        ]
+    series = pd.Series(values)
+    vectorized = canonicalize_series(series)
+    for value, canonical in zip(values, vectorized):
+        expected = canonicalize_isbn(value)
+        assert (None if pd.isna(canonical) else canonical) == expected, value
+
+
+def test_series_handles_numeric_cells():
+    canonical = canonicalize_series(pd.Series([9789750719387.0, 9789750719387, None]))
+    assert canonical.iloc[0] == canonical.iloc[1] == "9789750719387"
+    assert pd.isna(canonical.iloc[2])
@@ -0,0 +1,96 @@
+import json
+
+from src.result_model import SearchResult
+from src.services.job_journal import JobJournal, file_sha256
+
+ISBNS = ["9789750719387", "9786050000008", "9789753638029"]
+
+
+def results():
+    return [
+        SearchResult(isbn=ISBNS[0], found=True, site="Babil", title="Kitap"),
+        SearchResult.not_found(ISBNS[1], "Bulunamadı"),
+        SearchResult(isbn=ISBNS[2], found=True, site="D&R", title="Başka Kitap"),
+    ]
+
+
+def write_journal(path, records):
+    journal = JobJournal(str(path))
+    for record in records:
+        journal.record(record)
+    journal.close()
+
+
+def test_replay_returns_records_in_order(tmp_path):
+    path = tmp_path / "job.jsonl"
+    write_journal(path, results())
+
+    journal = JobJournal(str(path))
+    assert journal.completed == 3
+    assert list(journal.replay()) == results()
+
+
+def test_truncated_last_line_is_dropped_on_reopen(tmp_path):
+    path = tmp_path / "job.jsonl"
+    write_journal(path, results()[:2])
+    intact_size = path.stat().st_size
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(results()[2].to_dict())[:25])
+
+    journal = JobJournal(str(path))
+    assert journal.completed == 2
+    assert path.stat().st_size == intact_size
+    assert [record.isbn for record in journal.replay()] == ISBNS[:2]
+
+    # Appending after recovery continues on a clean line
+    journal.record(results()[2])
+    journal.close()
+    assert list(JobJournal(str(path)).replay()) == results()
+
+
+def test_unparsable_line_ends_the_intact_prefix(tmp_path):
+    path = tmp_path / "job.jsonl"
+    write_journal(path, results()[:1])
+    with open(path, "a", encoding="utf-8") as f:
+        f.write("{not json}\n")
+        f.write(json.dumps(results()[1].to_dict()) + "\n")
+
+    journal = JobJournal(str(path))
+    assert journal.completed == 1
+    assert [record.isbn for record in journal.replay()] == ISBNS[:1]
+
+
+def test_truncate_keeps_a_prefix(tmp_path):
+    path = tmp_path / "job.jsonl"
+    write_journal(path, results())
+
+    journal = JobJournal(str(path))
+    journal.truncate(1)
+    assert journal.completed == 1
+    journal.record(results()[2])
+    journal.close()
+    assert [record.isbn for record in JobJournal(str(path)).replay()] == [ISBNS[0], ISBNS[2]]
+
+
+def test_discard_removes_the_file(tmp_path):
+    path = tmp_path / "job.jsonl"
+    write_journal(path, results())
+    journal = JobJournal(str(path))
+    journal.discard()
+    assert not path.exists()
+    assert journal.completed == 0
+
+
+def test_for_input_is_keyed_by_file_content(tmp_path):
+    first = tmp_path / "a.csv"
+    second = tmp_path / "b.csv"
+    first.write_text("ISBN\n9789750719387\n", encoding="utf-8")
+    second.write_text("ISBN\n9789750719387\n", encoding="utf-8")
+    journal_dir = str(tmp_path / "jobs")
+
+    journal = JobJournal.for_input(str(first), journal_dir)
+    assert journal.path.endswith(f"{file_sha256(str(first))}.jsonl")
+    assert JobJournal.for_input(str(second), journal_dir).path == journal.path
+
+    second.write_text("ISBN\n9786050000008\n", encoding="utf-8")
+    assert JobJournal.for_input(str(second), journal_dir).path != journal.path
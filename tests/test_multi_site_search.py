@@ -0,0 +1,83 @@
+import threading
+import time
+
+from src.scrapers.http_fetch import HttpFetchError
+from src.services.multi_site_search import SITES_UNAVAILABLE_MESSAGE, MultiSiteSearchService
+from src.services.rate_limit import CircuitBreaker, RateLimitPolicy, SiteGovernor
+
+ISBN = "9789750719387"
+
+
+class BrowserService:
+    def __init__(self):
+        self.calls = 0
+
+    def search_first(self, isbn):
+        self.calls += 1
+        return True, "Babil", f"ISBN: {isbn}\nKitap Adı: Kitap"
+
+
+class FailingStatic:
+    def __init__(self, status):
+        self.status = status
+
+    def search(self, isbn):
+        raise HttpFetchError("blocked", status=self.status)
+
+
+def governor(**policy):
+    return SiteGovernor(RateLimitPolicy(rate=1000, burst=100, **policy))
+
+
+def make_service(governors, static_scrapers=None):
+    browser = BrowserService()
+    service = MultiSiteSearchService(
+        [("Babil", None)],
+        None,
+        governors=governors,
+        static_scrapers=static_scrapers,
+        service_factory=lambda site_name, scraper_cls, driver_pool: browser,
+    )
+    return service, browser
+
+
+def test_static_failure_falls_back_to_the_browser_without_counting_as_an_error():
+    site = governor(failure_threshold=1)
+    service, browser = make_service({"Babil": site}, {"Babil": FailingStatic(403)})
+    result = service.search_first(ISBN)
+    assert result.found and browser.calls == 1
+    assert site.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_throttled_static_fetch_counts_against_the_site():
+    site = governor(failure_threshold=1)
+    service, browser = make_service({"Babil": site}, {"Babil": FailingStatic(429)})
+    assert service.search_first(ISBN).found
+    assert site.breaker.state == CircuitBreaker.OPEN
+
+
+def test_lookup_fails_fast_when_every_circuit_is_open():
+    site = governor(failure_threshold=1, open_seconds=60)
+    site.breaker.record_failure()
+    service, browser = make_service({"Babil": site})
+    result = service.search_first(ISBN)
+    assert not result.found and result.error == SITES_UNAVAILABLE_MESSAGE
+    assert browser.calls == 0
+
+
+def test_bulk_lookup_waits_for_the_first_cool_down():
+    site = governor(failure_threshold=1, open_seconds=0.3)
+    site.breaker.record_failure()
+    service, browser = make_service({"Babil": site})
+    started = time.monotonic()
+    assert service.search_first(ISBN, wait_for_sites=True).found
+    assert time.monotonic() - started >= 0.25
+
+
+def test_waiting_lookup_gives_up_when_the_service_closes():
+    site = governor(failure_threshold=1, open_seconds=60)
+    site.breaker.record_failure()
+    service, browser = make_service({"Babil": site})
+    threading.Timer(0.1, service.close).start()
+    result = service.search_first(ISBN, wait_for_sites=True)
+    assert result.error == SITES_UNAVAILABLE_MESSAGE
@@ -0,0 +1,50 @@
+import sys
+import threading
+
+import pytest
+
+from src.utils.profiling import PER_THREAD_PROFILERS, ProfileSession
+
+
+@pytest.mark.skipif(not PER_THREAD_PROFILERS, reason="one profiler covers every thread")
+def test_stop_disables_profilers_of_threads_that_outlive_the_session(tmp_path):
+    session = ProfileSession("test", output_dir=str(tmp_path))
+    started = threading.Event()
+    resume = threading.Event()
+    profiled_during = []
+    profiled_after = []
+
+    def worker():
+        profiled_during.append(sys.getprofile() is not None)
+        started.set()
+        resume.wait(5)
+        profiled_after.append(sys.getprofile() is not None)
+
+    session.start()
+    thread = threading.Thread(target=worker)
+    thread.start()
+    started.wait(5)
+    session.stop()
+    resume.set()
+    thread.join(5)
+
+    assert profiled_during == [True]
+    assert profiled_after == [False]
+    assert "2 profiled threads" in open(session.report_path, encoding="utf-8").read()
+
+
+@pytest.mark.skipif(not PER_THREAD_PROFILERS, reason="one profiler covers every thread")
+def test_profiling_installs_no_tracer(tmp_path):
+    session = ProfileSession("test", output_dir=str(tmp_path))
+    traced = []
+
+    def worker():
+        traced.append(sys.gettrace())
+
+    session.start()
+    thread = threading.Thread(target=worker)
+    thread.start()
+    thread.join(5)
+    session.stop()
+
+    assert traced == [None]
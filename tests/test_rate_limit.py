@@ -0,0 +1,170 @@
+import types
+
+import pytest
+
+from src.services import rate_limit
+from src.services.rate_limit import (
+    AdaptiveConcurrencyLimiter,
+    CircuitBreaker,
+    RateLimitPolicy,
+    SiteGovernor,
+    SiteUnavailable,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(rate_limit, "time", types.SimpleNamespace(monotonic=fake, sleep=rate_limit.time.sleep))
+    return fake
+
+
+def test_breaker_opens_after_threshold_and_recovers_through_a_probe(clock):
+    breaker = CircuitBreaker(failure_threshold=3, open_seconds=10, max_open_seconds=60)
+    for _ in range(2):
+        breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+
+    clock.now += 10
+    assert breaker.allow()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert not breaker.allow()  # Only one probe at a time
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow()
+
+
+def test_failed_probe_reopens_with_doubled_cool_down(clock):
+    breaker = CircuitBreaker(failure_threshold=1, open_seconds=10, max_open_seconds=15)
+    breaker.record_failure()
+    clock.now += 10
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.opens == 2
+
+    clock.now += 14
+    assert not breaker.allow()
+    clock.now += 1  # Capped at max_open_seconds
+    assert breaker.allow()
+
+
+def test_released_probe_can_be_claimed_again(clock):
+    breaker = CircuitBreaker(failure_threshold=1, open_seconds=10, max_open_seconds=60)
+    breaker.record_failure()
+    clock.now += 10
+    assert breaker.allow()
+    breaker.release_probe()
+    assert breaker.allow()
+
+
+def test_limiter_grows_on_healthy_responses_and_halves_on_errors():
+    limiter = AdaptiveConcurrencyLimiter(min_limit=1, max_limit=8, latency_tolerance=2.0)
+    for _ in range(20):
+        limiter.acquire()
+        limiter.release(0.1, error=False)
+    assert limiter.limit > 4
+    grown = limiter.limit
+    limiter.acquire()
+    limiter.release(None, error=True)
+    assert limiter.limit == grown / 2
+
+
+def test_limiter_halves_on_latency_above_baseline():
+    limiter = AdaptiveConcurrencyLimiter(min_limit=1, max_limit=8, latency_tolerance=2.0)
+    limiter.limit = 4.0
+    limiter.acquire()
+    limiter.release(0.1, error=False)
+    before = limiter.limit
+    limiter.acquire()
+    limiter.release(0.5, error=False)
+    assert limiter.limit == before / 2
+
+
+def test_limiter_keeps_a_baseline_per_tier():
+    limiter = AdaptiveConcurrencyLimiter(min_limit=1, max_limit=8, latency_tolerance=2.0)
+    limiter.limit = 4.0
+    limiter.acquire()
+    limiter.release(0.05, error=False, tier="static")
+    before = limiter.limit
+    limiter.acquire()
+    limiter.release(2.0, error=False, tier="browser")  # Slow tier, but no congestion
+    assert limiter.limit > before
+    assert set(limiter.baseline_snapshot()) == {"static", "browser"}
+
+
+def test_limiter_ignores_slots_that_sent_no_request():
+    limiter = AdaptiveConcurrencyLimiter(min_limit=1, max_limit=8, latency_tolerance=2.0)
+    limiter.acquire()
+    limiter.release(None, error=False)
+    assert limiter.limit == 1.0
+    assert limiter.in_flight == 0
+    assert limiter.baselines == {}
+
+
+def test_governor_opens_circuit_after_failed_slots():
+    governor = SiteGovernor(RateLimitPolicy(rate=1000, burst=10, failure_threshold=2))
+    for _ in range(2):
+        with governor.slot() as outcome:
+            outcome["error"] = True
+    assert not governor.available()
+    with pytest.raises(SiteUnavailable):
+        with governor.slot():
+            pass
+    assert governor.snapshot()["circuit_opens"] == 1
+
+
+def test_policy_is_split_between_processes():
+    policy = RateLimitPolicy(rate=2.0, burst=4, min_concurrency=2, max_concurrency=4)
+    assert policy.split(1) is policy
+    share = policy.split(2)
+    assert (share.rate, share.burst, share.min_concurrency, share.max_concurrency) == (1.0, 2, 2, 2)
+    share = policy.split(8)
+    assert (share.rate, share.burst, share.min_concurrency, share.max_concurrency) == (0.25, 1, 1, 1)
+
+
+def test_unsent_slots_do_not_count_for_the_breaker(clock):
+    governor = SiteGovernor(RateLimitPolicy(rate=1000, burst=10, failure_threshold=5))
+    for _ in range(4):
+        with governor.slot() as outcome:
+            outcome["error"] = True
+        with governor.slot():
+            pass  # A race loser that never sent its request
+    assert governor.breaker.failures == 4
+    with governor.slot() as outcome:
+        outcome["error"] = True
+    assert governor.breaker.state == CircuitBreaker.OPEN
+
+
+def test_unsent_probe_leaves_the_circuit_half_open(clock):
+    governor = SiteGovernor(RateLimitPolicy(rate=1000, burst=10, failure_threshold=1, open_seconds=10))
+    with governor.slot() as outcome:
+        outcome["error"] = True
+    clock.now += 10
+    with governor.slot():
+        pass
+    assert governor.breaker.state == CircuitBreaker.HALF_OPEN
+    with governor.slot() as outcome:
+        outcome["latency"] = 0.1
+    assert governor.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_breaker_reports_when_it_lets_a_probe_through(clock):
+    breaker = CircuitBreaker(failure_threshold=1, open_seconds=10, max_open_seconds=60)
+    assert breaker.reopens_in() == 0.0
+    breaker.record_failure()
+    clock.now += 4
+    assert breaker.reopens_in() == 6.0
+    clock.now += 6
+    assert breaker.reopens_in() == 0.0
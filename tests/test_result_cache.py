@@ -0,0 +1,86 @@
+import pytest
+
+from src.result_model import SearchResult
+from src.utils import result_cache
+from src.utils.result_cache import PersistentResultCache
+
+ISBN = "9789750719387"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(result_cache.time, "time", fake.time)
+    return fake
+
+
+def hit(site):
+    return SearchResult(isbn=ISBN, found=True, site=site, title="Kitap")
+
+
+def row_count(cache):
+    return cache._conn.execute("SELECT COUNT(*) FROM site_results").fetchone()[0]
+
+
+def test_entries_expire_by_ttl(tmp_path, clock):
+    cache = PersistentResultCache(str(tmp_path / "cache.sqlite3"), ttl=100, negative_ttl=10)
+    cache.put(ISBN, "Babil", hit("Babil"))
+    cache.put(ISBN, "D&R", SearchResult.not_found(ISBN, "Bulunamadı"))
+    assert set(cache.get(ISBN)) == {"Babil", "D&R"}
+    assert cache.get(ISBN)["Babil"].cached
+
+    clock.now += 50
+    assert set(cache.get(ISBN)) == {"Babil"}
+
+    clock.now += 60
+    assert cache.get(ISBN) == {}
+    cache.close()
+
+
+def test_site_ttl_overrides_default(tmp_path, clock):
+    cache = PersistentResultCache(str(tmp_path / "cache.sqlite3"), ttl=100, site_ttls={"Babil": 1000})
+    cache.put(ISBN, "Babil", hit("Babil"))
+    cache.put(ISBN, "D&R", hit("D&R"))
+    clock.now += 500
+    assert set(cache.get(ISBN)) == {"Babil"}
+    cache.close()
+
+
+def test_expired_rows_are_purged_on_open(tmp_path, clock):
+    path = str(tmp_path / "cache.sqlite3")
+    cache = PersistentResultCache(path, ttl=100, negative_ttl=10)
+    cache.put(ISBN, "Babil", hit("Babil"))
+    cache.put("9786050000008", "Babil", SearchResult.not_found("9786050000008", "Bulunamadı"))
+    cache.close()
+
+    clock.now += 50
+    cache = PersistentResultCache(path, ttl=100, negative_ttl=10)
+    # The miss is past its own TTL but not the longest one, so it is only hidden, not deleted
+    assert row_count(cache) == 2
+    cache.close()
+
+    clock.now += 60
+    cache = PersistentResultCache(path, ttl=100, negative_ttl=10)
+    assert row_count(cache) == 0
+    cache.close()
+
+
+def test_expired_rows_are_purged_while_writing(tmp_path, clock, monkeypatch):
+    monkeypatch.setattr(result_cache, "PURGE_INTERVAL_WRITES", 3)
+    cache = PersistentResultCache(str(tmp_path / "cache.sqlite3"), ttl=100, negative_ttl=100)
+    cache.put(ISBN, "Babil", hit("Babil"))
+    clock.now += 200
+    cache.put(ISBN, "D&R", hit("D&R"))
+    assert row_count(cache) == 2
+    cache.put(ISBN, "Kitapsec", hit("Kitapsec"))
+    assert row_count(cache) == 2
+    assert set(cache.get(ISBN)) == {"D&R", "Kitapsec"}
+    cache.close()
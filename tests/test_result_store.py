@@ -0,0 +1,38 @@
+import os
+
+from src.result_model import SearchResult
+from src.utils import result_store
+from src.utils.result_store import ResultStore
+
+
+def result(number):
+    isbn = f"978605{number:07d}"
+    if number % 3:
+        return SearchResult(isbn=isbn, found=True, site="Babil", title=f"Kitap {number}")
+    return SearchResult.not_found(isbn, "Bulunamadı")
+
+
+def test_rows_are_read_back_by_index_while_memory_stays_bounded(tmp_path, monkeypatch):
+    monkeypatch.setattr(result_store, "FLUSH_ROWS", 10)
+    monkeypatch.setattr(result_store, "CACHED_ROWS", 4)
+    store = ResultStore(str(tmp_path))
+    for number in range(95):
+        store.write_result(result(number))
+        assert len(store._pending) < 10
+
+    assert len(store) == 95
+    for index in (0, 42, 89, 94, 3, 1):
+        assert store.row(index)[0] == result(index).isbn
+        assert store.is_found(index) == bool(index % 3)
+    assert store.row(94)[1] == "Kitap 94"
+    assert len(store._cache) <= 4
+
+    store.close()
+    assert store.row(94)[1] == "Kitap 94"
+    store.clear()
+    assert len(store) == 0
+    store.write_result(result(1))
+    assert store.row(0)[1] == "Kitap 1"
+
+    store.discard()
+    assert not os.path.exists(store.path)
@@ -0,0 +1,22 @@
+from src.result_model import SearchResult
+from src.utils.result_writer import ResultSummary
+
+
+def found(site, elapsed, cached=False):
+    return SearchResult(isbn="9780306406157", found=True, site=site, elapsed=elapsed, cached=cached)
+
+
+def test_summary_counts_only_live_lookups_per_site():
+    lookups = {"Babil": 0}
+    summary = ResultSummary(lambda: dict(lookups))
+    lookups["Babil"] = 2
+    summary.add(found("Babil", 1.0))
+    summary.add(found("Babil", 3.0))
+    for _ in range(5):  # Catalog, repeated and resumed rows
+        summary.add(found("Babil", 9.0, cached=True))
+    summary.add(SearchResult.not_found("9789750719387", "Bulunamadı", elapsed=2.0))
+
+    assert (summary.total, summary.found, summary.cached, summary.live) == (8, 7, 5, 3)
+    assert summary.live_elapsed_total == 6.0
+    [row] = summary.site_rows()
+    assert row == ["Babil", 2, 1.0, 2, 1.0, 2.0, 1.0, 3.0]
@@ -0,0 +1,88 @@
+import json
+
+from src.services.site_ranking import SiteRanker
+
+SITES = ["Babil", "D&R", "Kitapsec"]
+ISBN = "9789750719387"
+
+
+def test_forwarding_ranker_leaves_saving_to_the_parent(tmp_path):
+    path = str(tmp_path / "site_stats.json")
+    worker = SiteRanker(SITES, path, explore_rate=0, forward=True)
+    parent = SiteRanker(SITES, path, explore_rate=0)
+    for _ in range(20):
+        worker.observe("Kitapsec", ISBN, True, False, 0.5)
+        worker.observe("Babil", ISBN, False, False, 0.5)
+    worker.close()
+    assert not (tmp_path / "site_stats.json").exists()
+    assert worker.rank(ISBN)[0] == "Kitapsec"
+
+    parent.merge(worker.drain())
+    assert worker.drain() == []
+    parent.close()
+    with open(path, encoding="utf-8") as f:
+        saved = json.load(f)
+    assert saved["sites"]["Kitapsec"]["overall"][1] > 0
+    assert SiteRanker(SITES, path, explore_rate=0).rank(ISBN)[0] == "Kitapsec"
+
+
+def train(ranker, site_name, isbn, found, error=False, elapsed=0.5, times=30):
+    for _ in range(times):
+        ranker.observe(site_name, isbn, found, error, elapsed)
+
+
+def test_unknown_sites_keep_registration_order():
+    ranker = SiteRanker(SITES, explore_rate=0)
+    assert ranker.rank(ISBN) == SITES
+    assert ranker.rank(ISBN, ["Kitapsec", "Yeni Site", "Babil"]) == ["Kitapsec", "Babil", "Yeni Site"]
+
+
+def test_faster_site_with_the_same_hit_rate_goes_first():
+    ranker = SiteRanker(SITES, explore_rate=0)
+    train(ranker, "Babil", ISBN, True, elapsed=3.0)
+    train(ranker, "D&R", ISBN, True, elapsed=0.5)
+    train(ranker, "Kitapsec", ISBN, True, elapsed=1.0)
+    assert ranker.rank(ISBN) == ["D&R", "Kitapsec", "Babil"]
+
+
+def test_error_prone_site_goes_last():
+    ranker = SiteRanker(SITES, explore_rate=0)
+    train(ranker, "Babil", ISBN, False, error=True, elapsed=0.1)
+    train(ranker, "D&R", ISBN, True)
+    train(ranker, "Kitapsec", ISBN, True)
+    assert ranker.rank(ISBN)[-1] == "Babil"
+
+
+def test_order_follows_the_isbn_prefix():
+    other_publisher = "9780306406157"
+    ranker = SiteRanker(SITES, explore_rate=0)
+    train(ranker, "Babil", ISBN, True)
+    train(ranker, "Babil", other_publisher, False)
+    train(ranker, "Kitapsec", ISBN, False)
+    train(ranker, "Kitapsec", other_publisher, True)
+    assert ranker.rank(ISBN)[0] == "Babil"
+    assert ranker.rank(other_publisher)[0] == "Kitapsec"
+
+
+def test_statistics_survive_a_save_and_load(tmp_path):
+    path = str(tmp_path / "site_stats.json")
+    ranker = SiteRanker(SITES, path, explore_rate=0)
+    train(ranker, "Kitapsec", ISBN, True, elapsed=0.2)
+    train(ranker, "Babil", ISBN, False)
+    ranker.close()
+
+    loaded = SiteRanker(SITES, path, explore_rate=0)
+    assert loaded.rank(ISBN) == ranker.rank(ISBN)
+    assert loaded.snapshot() == ranker.snapshot()
+
+
+def test_unreadable_statistics_are_ignored(tmp_path):
+    path = tmp_path / "site_stats.json"
+    path.write_text("{not json", encoding="utf-8")
+    assert SiteRanker(SITES, str(path), explore_rate=0).rank(ISBN) == SITES
+
+
+def test_explore_rate_keeps_registration_order():
+    ranker = SiteRanker(SITES, explore_rate=1.0)
+    train(ranker, "Kitapsec", ISBN, True, elapsed=0.1)
+    assert ranker.rank(ISBN) == SITES
@@ -0,0 +1,75 @@
+from src.scrapers.static_sites import BabilStaticScraper, DRStaticScraper, KitapsecStaticScraper
+
+ISBN = "9789750719387"
+
+NO_RESULTS = f"""<html><body>
+<h1>Arama Sonuçları</h1>
+<p>"{ISBN}" için sonuç bulunamadı</p>
+</body></html>"""
+
+KITAPSEC_PRODUCT = f"""<html><body><div class="Ks_UrunDetay">
+<h1>Kürk Mantolu Madonna</h1>
+<span class="yazar"><a href="/Yazar/1">Sabahattin Ali</a></span>
+<span class="yayinevi"><a href="/Yayinevi/1">YKY</a></span>
+<div>ISBN: {ISBN}</div>
+</div></body></html>"""
+
+KITAPSEC_RESULTS = f"""<html><body><h1>Arama Sonuçları: {ISBN}</h1>
+<div class="Ks_UrunListe"><div class="Ks_UrunSatir"><a href="/kitap/1">Kürk Mantolu Madonna</a></div></div>
+</body></html>"""
+
+DR_PRODUCT = f"""<html><body>
+<h1 class="prd-name">Kürk Mantolu Madonna</h1>
+<div>Barkod: {ISBN}</div>
+</body></html>"""
+
+
+class FakeFetcher:
+    """Serves ``{url: html}``; ``redirects`` maps a URL to the one the response came from."""
+
+    def __init__(self, pages, redirects=None):
+        self.pages = pages
+        self.redirects = redirects or {}
+        self.requested = []
+
+    def get_page(self, url):
+        self.requested.append(url)
+        final_url = self.redirects.get(url, url)
+        return final_url, self.pages[final_url]
+
+
+def test_no_results_page_repeating_the_isbn_is_not_a_hit():
+    for scraper_cls in (BabilStaticScraper, DRStaticScraper, KitapsecStaticScraper):
+        scraper = scraper_cls(FakeFetcher({}))
+        scraper.fetcher.pages[scraper.search_url(ISBN)] = NO_RESULTS
+        assert scraper.search(ISBN) is None
+
+
+def test_result_link_is_followed_from_a_search_page():
+    scraper = KitapsecStaticScraper(FakeFetcher({}))
+    search_url = scraper.search_url(ISBN)
+    product_url = scraper.base_url + "/kitap/1"
+    scraper.fetcher.pages.update({search_url: KITAPSEC_RESULTS, product_url: KITAPSEC_PRODUCT})
+
+    result = scraper.search(ISBN)
+    assert scraper.fetcher.requested == [search_url, product_url]
+    assert (result.title, result.author, result.publisher, result.url) == (
+        "Kürk Mantolu Madonna", "Sabahattin Ali", "YKY", product_url
+    )
+
+
+def test_search_page_with_a_product_marker_is_parsed_directly():
+    scraper = KitapsecStaticScraper(FakeFetcher({}))
+    scraper.fetcher.pages[scraper.search_url(ISBN)] = KITAPSEC_PRODUCT
+    assert scraper.search(ISBN).title == "Kürk Mantolu Madonna"
+    assert len(scraper.fetcher.requested) == 1
+
+
+def test_redirect_to_a_product_url_counts_as_the_product_page():
+    scraper = DRStaticScraper(FakeFetcher({}))
+    product_url = scraper.base_url + "/kitap/kurk-mantolu-madonna"
+    scraper.fetcher.pages[product_url] = DR_PRODUCT
+    scraper.fetcher.redirects[scraper.search_url(ISBN)] = product_url
+
+    result = scraper.search(ISBN)
+    assert result.found and result.url == product_url